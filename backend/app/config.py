@@ -39,6 +39,73 @@ class Settings(BaseSettings):
     SCHEDULER_ENABLED: bool = True
     DAILY_REFRESH_CRON: str = "30 0 * * *"  # 00:30 UTC daily
 
+    # Forecast intervals: sampled (Prophet default) | reduced | analytic | none
+    FORECAST_INTERVAL_MODE: str = "sampled"
+    FORECAST_UNCERTAINTY_SAMPLES: int = 100  # used by "reduced"
+
+    # Forecast model cache (tuned Prophet configs per ticker)
+    MODEL_CACHE_DIR: str = "./model_cache"
+    # Nightly hyperparameter search (CPU heavy; off by default, or run `python -m app.ml.tuning`)
+    FORECAST_TUNING_ENABLED: bool = False
+    FORECAST_TUNING_TICKERS: str = "^NSEI"
+
+    # Stability weight/threshold profiles (app/ml/stability_profiles.py): default | legacy |
+    # classic, plus any from STABILITY_PROFILES_FILE (JSON); selectable per request with ?profile=
+    STABILITY_PROFILE: str = "default"          # v2 /stability-score, refresh, scenarios
+    LEGACY_STABILITY_PROFILE: str = "legacy"    # services/stability_service (stored stability_score)
+    STABILITY_PROFILES_FILE: str = ""
+
+    # POST /stability-score/scenarios: largest grid (rows) evaluated per request
+    STABILITY_SCENARIO_MAX_ROWS: int = 200_000
+
+    # Index volatility (app/utils/volatility.py): rolling (sample std over the last
+    # VOLATILITY_WINDOW daily returns) | ewma (span = VOLATILITY_WINDOW)
+    VOLATILITY_MODE: str = "rolling"
+    VOLATILITY_WINDOW: int = 30
+
+    # Index liquidity (app/utils/liquidity.py): median volume and log-turnover z-score
+    # over the last LIQUIDITY_WINDOW sessions, stored in liquidity_daily
+    LIQUIDITY_WINDOW: int = 20
+    # Stored scores older than this many sessions (weekdays) read as neutral 50
+    LIQUIDITY_MAX_STALE_SESSIONS: int = 5
+
+    # Macro series (app/utils/macro.py): extra comma-separated *.json / *.csv files or
+    # directories on top of app/sample_data/macro_history.json and macro.json
+    MACRO_DATA_PATHS: str = ""
+
+    # Batch sentiment scoring (app/sentiment/batch.py): 0 workers = one per CPU;
+    # batches smaller than SENTIMENT_PARALLEL_MIN are scored in-process
+    SENTIMENT_BATCH_WORKERS: int = 0
+    SENTIMENT_PARALLEL_MIN: int = 2000
+    SENTIMENT_BATCH_CHUNK: int = 1000
+
+    # Sentiment scorer (app/sentiment/backends.py): vader | linear (hashing features +
+    # logistic regression trained with `python -m app.sentiment.linear_model`)
+    SENTIMENT_ANALYZER: str = "vader"
+    SENTIMENT_MODEL_PATH: str = ""
+
+    # Article recency weighting: step (24h/72h/1w buckets) | exponential (half-life decay)
+    SENTIMENT_RECENCY_MODE: str = "step"
+    SENTIMENT_RECENCY_HALF_LIFE_HOURS: float = 72.0
+
+    # Outlet credibility weights: JSON {"outlet": weight, ..., "default": 0.7} in priority
+    # order; empty = built-in SOURCE_WEIGHTS (app/sentiment/analyzer.py)
+    SOURCE_WEIGHTS_FILE: str = ""
+
+    # Near-duplicate headline clustering (MinHash/LSH): score one article per story
+    SENTIMENT_DEDUP_ENABLED: bool = True
+    SENTIMENT_DEDUP_THRESHOLD: float = 0.6  # token-set Jaccard
+    SENTIMENT_DEDUP_MAX_CLUSTERS: int = 5000  # most recent stories a run's index holds
+
+    # News ingestion pipeline (app/services/news_pipeline.py): comma-separated queries,
+    # per-stage worker threads, bounded queue size between stages, score/write batch size
+    NEWS_QUERIES: str = "India economy RBI inflation"
+    NEWS_MAX_PER_QUERY: int = 20
+    NEWS_PIPELINE_FETCH_WORKERS: int = 4
+    NEWS_PIPELINE_SCORE_WORKERS: int = 1
+    NEWS_PIPELINE_QUEUE_SIZE: int = 256
+    NEWS_PIPELINE_BATCH_SIZE: int = 200
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
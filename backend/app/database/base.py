@@ -2,7 +2,7 @@
 Database connection and session management.
 Migration-ready: use Alembic for production migrations.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
 
@@ -43,3 +43,49 @@ def init_db():
     """Create all tables. Call on startup or via migration."""
     from app.database import models  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    for table in (models.SentimentScore.__table__, models.SentimentArticle.__table__,
+                  models.ForecastHistory.__table__):
+        add_missing_columns(engine, table)
+    _backfill_sentiment_rollups()
+
+
+def dialect_insert(bind, table):
+    """INSERT for table with the dialect's on_conflict_do_nothing/do_update (SQLite, PostgreSQL)."""
+    name = bind.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"upsert not supported for dialect {name!r}")
+    return insert(table)
+
+
+def add_missing_columns(bind, table) -> list:
+    """
+    ALTER TABLE ... ADD COLUMN for nullable model columns the existing table lacks
+    (create_all never alters tables). Stand-in until Alembic migrations exist.
+    """
+    existing = {c["name"] for c in inspect(bind).get_columns(table.name)}
+    added = []
+    with bind.begin() as conn:
+        for col in table.columns:
+            if col.name in existing or not col.nullable:
+                continue
+            col_type = col.type.compile(dialect=bind.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}"))
+            added.append(col.name)
+    return added
+
+
+def _backfill_sentiment_rollups():
+    """Populate sentiment_rollups once for databases that predate the table."""
+    from app.database import crud, models
+    db = SessionLocal()
+    try:
+        if db.query(models.SentimentRollup.id).first() is None and (
+                db.query(models.SentimentScore.id).first() is not None
+                or db.query(models.SentimentArticle.id).first() is not None):
+            crud.rebuild_sentiment_rollups(db)
+    finally:
+        db.close()
@@ -1,17 +1,28 @@
 """
-CRUD operations for daily_market_data, sentiment_scores, stability_history, forecast_history.
+CRUD operations for daily_market_data, volatility_daily, liquidity_daily, sentiment_scores, sentiment_rollups, sentiment_articles,
+stability_history, forecast_history.
 """
-from datetime import date, datetime, timedelta
-from typing import List, Optional
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy import case, func, tuple_
 from sqlalchemy.orm import Session
 
 from app.database.models import (
     DailyMarketData,
     SentimentScore,
+    SentimentRollup,
+    SentimentArticle,
     StabilityHistory,
     ForecastHistory,
+    LiquidityDaily,
+    VolatilityDaily,
 )
+from app.database.base import dialect_insert
+from app.utils.cursor import decode_date_id_cursor, encode_cursor
+from app.utils.liquidity import RollingLiquidity, liquidity_window
+from app.utils.volatility import make_volatility, volatility_params
 
 
 # ---------- Daily Market Data ----------
@@ -63,6 +74,180 @@ def get_market_data_range(db: Session, start: date, end: date) -> List[DailyMark
     ).order_by(DailyMarketData.record_date).all()
 
 
+# ---------- Volatility ----------
+def _volatility_query(db: Session, ticker: str, mode: str, window: int):
+    return db.query(VolatilityDaily).filter(
+        VolatilityDaily.ticker == ticker,
+        VolatilityDaily.mode == mode,
+        VolatilityDaily.window_size == window,
+    )
+
+
+def _resume_volatility(db: Session, ticker: str, mode: str, window: int, before: Optional[date] = None):
+    """Engine state after the last stored close before `before` (latest if None)."""
+    q = _volatility_query(db, ticker, mode, window)
+    if before is not None:
+        q = q.filter(VolatilityDaily.record_date < before)
+    q = q.order_by(VolatilityDaily.record_date.desc())
+    engine = make_volatility(mode, window)
+    if mode == "ewma":
+        last = q.first()
+        if last:
+            engine.restore(last.close, last.n_returns or 0, last.ret_mean or 0.0, last.ret_var or 0.0)
+    else:
+        for row in reversed(q.limit(window + 1).all()):
+            engine.update(row.close)
+    return engine
+
+
+def update_volatility(
+    db: Session,
+    ticker: str,
+    bars: Iterable[Tuple[date, float]],
+    mode: Optional[str] = None,
+    window: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Fold (date, close) bars into ticker's stored volatility series; returns the latest
+    volatility_pct. Bars after the last stored date cost one O(1) update each. A bar that
+    changes a stored close (today's close re-fetched) or fills a gap rewinds the series
+    to that date and replays the stored closes after it.
+    """
+    mode, window = volatility_params(mode, window)
+    bars = {d: float(c) for d, c in bars if c is not None and c == c and c > 0}
+    if not bars:
+        row = get_volatility(db, ticker, mode=mode, window=window)
+        return row.volatility_pct if row else None
+    q = _volatility_query(db, ticker, mode, window)
+    stored = dict(q.with_entities(VolatilityDaily.record_date, VolatilityDaily.close)
+                  .filter(VolatilityDaily.record_date >= min(bars)))
+    last = max(stored) if stored else None
+    rewind = [d for d, c in bars.items()
+              if (d in stored and abs(stored[d] - c) > 1e-9 * c) or (d not in stored and last and d < last)]
+    if rewind:
+        start = min(rewind)
+        series = {d: c for d, c in stored.items() if d >= start}
+        series.update((d, c) for d, c in bars.items() if d >= start)
+        q.filter(VolatilityDaily.record_date >= start).delete(synchronize_session=False)
+        engine = _resume_volatility(db, ticker, mode, window, before=start)
+    else:
+        series = {d: c for d, c in bars.items() if d not in stored}
+        engine = _resume_volatility(db, ticker, mode, window)
+    for d in sorted(series):
+        vol = engine.update(series[d])
+        db.add(VolatilityDaily(
+            ticker=ticker, mode=mode, window_size=window, record_date=d, close=series[d],
+            volatility_pct=vol, n_returns=engine.n, ret_mean=engine.mean, ret_var=engine.var,
+        ))
+    db.commit()
+    return engine.value
+
+
+def get_volatility(
+    db: Session,
+    ticker: str,
+    as_of: Optional[date] = None,
+    mode: Optional[str] = None,
+    window: Optional[int] = None,
+) -> Optional[VolatilityDaily]:
+    """Latest stored volatility row on or before as_of."""
+    mode, window = volatility_params(mode, window)
+    q = _volatility_query(db, ticker, mode, window)
+    if as_of is not None:
+        q = q.filter(VolatilityDaily.record_date <= as_of)
+    return q.order_by(VolatilityDaily.record_date.desc()).first()
+
+
+def get_volatility_range(
+    db: Session,
+    ticker: str,
+    start: date,
+    end: date,
+    mode: Optional[str] = None,
+    window: Optional[int] = None,
+) -> List[VolatilityDaily]:
+    mode, window = volatility_params(mode, window)
+    return _volatility_query(db, ticker, mode, window).filter(
+        VolatilityDaily.record_date >= start,
+        VolatilityDaily.record_date <= end,
+    ).order_by(VolatilityDaily.record_date).all()
+
+
+# ---------- Liquidity ----------
+def _liquidity_query(db: Session, ticker: str, window: int):
+    return db.query(LiquidityDaily).filter(LiquidityDaily.ticker == ticker, LiquidityDaily.window_size == window)
+
+
+def _resume_liquidity(db: Session, ticker: str, window: int, before: Optional[date] = None) -> RollingLiquidity:
+    """Engine state after the last stored session before `before` (latest if None)."""
+    q = _liquidity_query(db, ticker, window)
+    if before is not None:
+        q = q.filter(LiquidityDaily.record_date < before)
+    engine = RollingLiquidity(window)
+    for row in reversed(q.order_by(LiquidityDaily.record_date.desc()).limit(window).all()):
+        engine.update(row.close, row.volume)
+    return engine
+
+
+def update_liquidity(
+    db: Session,
+    ticker: str,
+    bars: Iterable[Tuple[date, float, float]],
+    window: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Fold (date, close, volume) bars into ticker's stored liquidity series; returns the
+    latest liquidity_score. Bars without a positive close and volume are skipped. As with
+    update_volatility, new sessions cost one update each and a changed or gap-filling bar
+    rewinds the series to its date and replays the stored sessions after it.
+    """
+    window = liquidity_window(window)
+    bars = {d: (float(c), float(v)) for d, c, v in bars
+            if c is not None and v is not None and c == c and v == v and c > 0 and v > 0}
+    if not bars:
+        row = get_liquidity(db, ticker, window=window)
+        return row.liquidity_score if row else None
+    q = _liquidity_query(db, ticker, window)
+    stored = {d: (c, v) for d, c, v in q.with_entities(LiquidityDaily.record_date, LiquidityDaily.close,
+                                                       LiquidityDaily.volume)
+              .filter(LiquidityDaily.record_date >= min(bars))}
+    last = max(stored) if stored else None
+    rewind = [d for d, (c, v) in bars.items()
+              if (d in stored and (abs(stored[d][0] - c) > 1e-9 * c or abs(stored[d][1] - v) > 1e-9 * v))
+              or (d not in stored and last and d < last)]
+    if rewind:
+        start = min(rewind)
+        series = {d: cv for d, cv in stored.items() if d >= start}
+        series.update((d, cv) for d, cv in bars.items() if d >= start)
+        q.filter(LiquidityDaily.record_date >= start).delete(synchronize_session=False)
+        engine = _resume_liquidity(db, ticker, window, before=start)
+    else:
+        series = {d: cv for d, cv in bars.items() if d not in stored}
+        engine = _resume_liquidity(db, ticker, window)
+    for d in sorted(series):
+        close, volume = series[d]
+        engine.update(close, volume)
+        db.add(LiquidityDaily(
+            ticker=ticker, window_size=window, record_date=d, close=close, volume=volume,
+            median_volume=engine.median_volume, turnover_z=engine.turnover_z, liquidity_score=engine.score,
+        ))
+    db.commit()
+    return engine.score
+
+
+def get_liquidity(
+    db: Session,
+    ticker: str,
+    as_of: Optional[date] = None,
+    window: Optional[int] = None,
+) -> Optional[LiquidityDaily]:
+    """Latest stored liquidity row on or before as_of."""
+    q = _liquidity_query(db, ticker, liquidity_window(window))
+    if as_of is not None:
+        q = q.filter(LiquidityDaily.record_date <= as_of)
+    return q.order_by(LiquidityDaily.record_date.desc()).first()
+
+
 # ---------- Sentiment ----------
 def create_sentiment_score(
     db: Session,
@@ -73,6 +258,7 @@ def create_sentiment_score(
     negative_count: int = 0,
     total_articles: int = 0,
     raw_aggregate: Optional[dict] = None,
+    analyzer_version: Optional[str] = None,
 ) -> SentimentScore:
     row = SentimentScore(
         record_date=record_date,
@@ -82,8 +268,10 @@ def create_sentiment_score(
         negative_count=negative_count,
         total_articles=total_articles,
         raw_aggregate=raw_aggregate,
+        analyzer_version=analyzer_version,
     )
     db.add(row)
+    _fold_into_rollups(db, row)
     db.commit()
     db.refresh(row)
     return row
@@ -108,6 +296,261 @@ def get_sentiment_range(
     return q.order_by(SentimentScore.record_date.desc()).all()
 
 
+# ---------- Sentiment rollups ----------
+ROLLUP_GRAINS = ("day", "week", "month")
+
+
+def period_start(d: date, grain: str) -> date:
+    """First day of the day / ISO week / month containing d."""
+    if grain == "week":
+        return d - timedelta(days=d.weekday())
+    if grain == "month":
+        return d.replace(day=1)
+    return d
+
+
+def _score_weight(total_articles: Optional[int]) -> float:
+    # Refreshes that saw more articles count for more; empty ones still count once
+    return float(max(1, total_articles or 0))
+
+
+_ROLLUP_SUMS = ("weighted_sum", "weight_total", "score_count",
+                "positive_count", "neutral_count", "negative_count", "total_articles")
+
+
+def _upsert_rollup(db: Session, grain: str, start: date, values: Dict) -> None:
+    """
+    Add values (any of _ROLLUP_SUMS, min_score, max_score) to one rollup row,
+    creating it if needed – INSERT ... ON CONFLICT (grain, period_start) DO UPDATE,
+    so concurrent refreshes writing a period's first row do not collide.
+    """
+    t = SentimentRollup.__table__
+    row = dict.fromkeys(_ROLLUP_SUMS, 0)
+    row.update(values, grain=grain, period_start=start)
+    stmt = dialect_insert(db.get_bind(), t).values(**row)
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["grain", "period_start"],
+        set_=dict(
+            {col: t.c[col] + new[col] for col in _ROLLUP_SUMS},
+            # NULL on either side keeps the other
+            min_score=case((t.c.min_score <= new.min_score, t.c.min_score), else_=func.coalesce(new.min_score, t.c.min_score)),
+            max_score=case((t.c.max_score >= new.max_score, t.c.max_score), else_=func.coalesce(new.max_score, t.c.max_score)),
+            updated_at=datetime.utcnow(),
+        ),
+    )
+    db.execute(stmt)
+
+
+def _fold_into_rollups(db: Session, row: SentimentScore) -> None:
+    """Add one sentiment_scores row's score to its day/week/month rollups (same transaction)."""
+    w = _score_weight(row.total_articles)
+    for grain in ROLLUP_GRAINS:
+        _upsert_rollup(db, grain, period_start(row.record_date, grain), {
+            "weighted_sum": row.score * w,
+            "weight_total": w,
+            "score_count": 1,
+            "min_score": row.score,
+            "max_score": row.score,
+        })
+
+
+def _label_counts(pairs: Iterable[Tuple[date, str, int]]) -> Dict[Tuple[str, date], Dict[str, int]]:
+    """(record_date, label, n) -> {(grain, period_start): label and total counts}."""
+    acc: Dict[Tuple[str, date], Dict[str, int]] = {}
+    for d, label, n in pairs:
+        for grain in ROLLUP_GRAINS:
+            counts = acc.setdefault((grain, period_start(d, grain)), dict.fromkeys(
+                ("positive_count", "neutral_count", "negative_count", "total_articles"), 0))
+            if f"{label}_count" in counts:
+                counts[f"{label}_count"] += n
+            counts["total_articles"] += n
+    return acc
+
+
+def _fold_articles_into_rollups(db: Session, articles: Iterable[Dict]) -> None:
+    """Count newly stored sentiment_articles rows into the rollups of their published day."""
+    for (grain, start), counts in _label_counts((a["record_date"], a["label"], 1) for a in articles).items():
+        _upsert_rollup(db, grain, start, counts)
+
+
+def rebuild_sentiment_rollups(db: Session, commit: bool = True) -> int:
+    """
+    Recompute all rollups (backfill / repair): scores from sentiment_scores, article
+    counts from sentiment_articles. Returns rollup rows written; commit=False leaves
+    them to the caller's transaction.
+    """
+    db.query(SentimentRollup).delete(synchronize_session=False)
+    acc = {}
+
+    def rollup(grain: str, start: date) -> SentimentRollup:
+        r = acc.get((grain, start))
+        if r is None:
+            r = acc[(grain, start)] = SentimentRollup(
+                grain=grain, period_start=start,
+                weighted_sum=0.0, weight_total=0.0, score_count=0,
+                positive_count=0, neutral_count=0, negative_count=0, total_articles=0,
+            )
+        return r
+
+    for row in db.query(SentimentScore).order_by(SentimentScore.record_date, SentimentScore.id).yield_per(1000):
+        w = _score_weight(row.total_articles)
+        for grain in ROLLUP_GRAINS:
+            r = rollup(grain, period_start(row.record_date, grain))
+            r.weighted_sum += row.score * w
+            r.weight_total += w
+            r.score_count += 1
+            r.min_score = row.score if r.min_score is None else min(r.min_score, row.score)
+            r.max_score = row.score if r.max_score is None else max(r.max_score, row.score)
+    per_day = db.query(SentimentArticle.record_date, SentimentArticle.label, func.count(SentimentArticle.id)).group_by(
+        SentimentArticle.record_date, SentimentArticle.label)
+    for (grain, start), counts in _label_counts(per_day).items():
+        r = rollup(grain, start)
+        for col, n in counts.items():
+            setattr(r, col, getattr(r, col) + n)
+    db.add_all(acc.values())
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return len(acc)
+
+
+def get_sentiment_rollups(db: Session, grain: str, start: date, end: date) -> List[SentimentRollup]:
+    """Rollup rows of one grain whose period starts within [period_start(start), end], oldest first."""
+    return db.query(SentimentRollup).filter(
+        SentimentRollup.grain == grain,
+        SentimentRollup.period_start >= period_start(start, grain),
+        SentimentRollup.period_start <= end,
+    ).order_by(SentimentRollup.period_start).all()
+
+
+# ---------- Sentiment articles ----------
+def article_key(link: Optional[str], title: str, source: Optional[str]) -> str:
+    basis = link if link and link != "#" else f"{title}|{source or ''}"
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+def _published_at(ts: Optional[float]) -> Optional[datetime]:
+    if ts is None or ts != ts:  # missing / NaN
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+
+
+def create_sentiment_articles(db: Session, articles: Iterable[Dict], analyzer_version: Optional[str] = None) -> int:
+    """
+    Store scored pipeline articles ({title, source, link, published_ts, sentiment})
+    in one commit, skipping ones already stored – including ones a concurrent refresh
+    stores first (INSERT ... ON CONFLICT (article_key) DO NOTHING). Returns the number inserted.
+    """
+    rows = {}
+    today = datetime.now(timezone.utc).date()
+    for a in articles:
+        key = article_key(a.get("link"), a["title"], a.get("source"))
+        if key in rows:
+            continue
+        s = a["sentiment"]
+        published = _published_at(a.get("published_ts"))
+        rows[key] = {
+            "article_key": key,
+            "title": a["title"],
+            "source": a.get("source"),
+            "link": a.get("link"),
+            "published_at": published,
+            "record_date": published.date() if published else today,  # UTC, like published_at
+            "compound": s["compound"],
+            "positive": s.get("positive"),
+            "neutral": s.get("neutral"),
+            "negative": s.get("negative"),
+            "label": s["label"],
+            "weight": s.get("weight"),
+            "analyzer_version": analyzer_version,
+        }
+    if not rows:
+        return 0
+    stmt = (
+        dialect_insert(db.get_bind(), SentimentArticle.__table__)
+        .on_conflict_do_nothing(index_elements=["article_key"])
+        .returning(SentimentArticle.__table__.c.article_key)
+    )
+    inserted = {key for (key,) in db.execute(stmt, list(rows.values())).all()}
+    _fold_articles_into_rollups(db, (rows[key] for key in inserted))
+    db.commit()
+    return len(inserted)
+
+
+def _sentiment_articles_query(db: Session, query, sentiment_filter: Optional[str], start: Optional[date], end: Optional[date]):
+    if sentiment_filter:
+        query = query.filter(SentimentArticle.label == sentiment_filter)
+    if start:
+        query = query.filter(SentimentArticle.record_date >= start)
+    if end:
+        query = query.filter(SentimentArticle.record_date <= end)
+    return query
+
+
+def get_sentiment_articles_page(
+    db: Session,
+    sentiment_filter: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[SentimentArticle], Optional[str]]:
+    """Newest first, keyset-paginated on (record_date, id). Raises ValueError on a malformed cursor."""
+    q = _sentiment_articles_query(db, db.query(SentimentArticle), sentiment_filter, start, end)
+    if cursor:
+        q = q.filter(tuple_(SentimentArticle.record_date, SentimentArticle.id) < decode_date_id_cursor(cursor))
+    rows = q.order_by(SentimentArticle.record_date.desc(), SentimentArticle.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1].record_date, rows[-1].id])
+
+
+def get_sentiment_articles_aggregate(
+    db: Session,
+    sentiment_filter: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    ingested_on: Optional[date] = None,
+) -> Dict:
+    """
+    SentimentService.get_aggregate_weighted over all matching stored articles, computed
+    in SQL. ingested_on restricts to articles stored on that (UTC) day. Each stored
+    story is weighted by its ingest-time source × recency weight only: a cluster's size
+    is not final when its representative is stored, so the live aggregate's
+    × (1 + ln size) factor is not applied and the two can differ for the same articles.
+    """
+    w = func.coalesce(SentimentArticle.weight, 1.0)
+    q = _sentiment_articles_query(db, db.query(
+        func.sum(SentimentArticle.compound * w),
+        func.sum(w),
+        func.count(SentimentArticle.id),
+        func.sum(case((SentimentArticle.label == "positive", 1), else_=0)),
+        func.sum(case((SentimentArticle.label == "neutral", 1), else_=0)),
+        func.sum(case((SentimentArticle.label == "negative", 1), else_=0)),
+    ), sentiment_filter, start, end)
+    if ingested_on:
+        day = datetime.combine(ingested_on, datetime.min.time())
+        q = q.filter(SentimentArticle.created_at >= day, SentimentArticle.created_at < day + timedelta(days=1))
+    weighted_sum, total_w, total, pos, neu, neg = q.one()
+    avg = (weighted_sum or 0.0) / (total_w or 1)
+    return {
+        "avg_compound": round(avg, 3),
+        "positive_count": int(pos or 0),
+        "neutral_count": int(neu or 0),
+        "negative_count": int(neg or 0),
+        "overall_label": "positive" if avg >= 0.05 else ("negative" if avg <= -0.05 else "neutral"),
+        "total_articles": int(total or 0),
+        "duplicates_collapsed": 0,
+    }
+
+
+def has_sentiment_articles(db: Session) -> bool:
+    return db.query(SentimentArticle.id).first() is not None
+
+
 # ---------- Stability ----------
 def create_stability_history(
     db: Session,
@@ -150,9 +593,16 @@ def create_forecast_history(
     downtrend_probability: float,
     confidence_level: str,
     model_metrics: Optional[dict] = None,
+    market_date: Optional[date] = None,
+    model_version: Optional[str] = None,
+    summary: Optional[dict] = None,
+    trend_distribution: Optional[dict] = None,
+    volatility_pct: Optional[float] = None,
 ) -> ForecastHistory:
     row = ForecastHistory(
         forecast_date=forecast_date,
+        market_date=market_date,
+        model_version=model_version,
         target_dates=target_dates,
         predictions=predictions,
         current_value=current_value,
@@ -160,6 +610,9 @@ def create_forecast_history(
         downtrend_probability=downtrend_probability,
         confidence_level=confidence_level,
         model_metrics=model_metrics,
+        summary=summary,
+        trend_distribution=trend_distribution,
+        volatility_pct=volatility_pct,
     )
     db.add(row)
     db.commit()
@@ -1,6 +1,7 @@
 """
 SQLAlchemy ORM models for persistence and historical analysis.
-Tables: daily_market_data, sentiment_scores, stability_history, forecast_history.
+Tables: daily_market_data, volatility_daily, liquidity_daily, sentiment_scores, sentiment_rollups, sentiment_articles,
+stability_history, forecast_history, rescore_checkpoints.
 """
 from datetime import date, datetime
 from sqlalchemy import Column, Integer, Float, String, Date, DateTime, Text, JSON, Index
@@ -26,6 +27,55 @@ class DailyMarketData(Base):
     __table_args__ = (Index("ix_daily_market_record_date", "record_date", unique=True),)
 
 
+class VolatilityDaily(Base):
+    """
+    Daily index volatility per (ticker, mode, window), maintained incrementally by
+    crud.update_volatility; n_returns/ret_mean/ret_var are the engine state after
+    the close (app/utils/volatility.py), so an ewma series resumes from one row.
+    """
+    __tablename__ = "volatility_daily"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String(16), nullable=False)
+    mode = Column(String(8), nullable=False)       # rolling | ewma
+    window_size = Column(Integer, nullable=False)
+    record_date = Column(Date, nullable=False)
+    close = Column(Float, nullable=False)
+    volatility_pct = Column(Float, nullable=True)  # daily % std; None during warm-up
+    n_returns = Column(Integer, default=0)
+    ret_mean = Column(Float, nullable=True)
+    ret_var = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_volatility_daily_key_date", "ticker", "mode", "window_size", "record_date", unique=True),
+    )
+
+
+class LiquidityDaily(Base):
+    """
+    Daily index liquidity per (ticker, window), maintained incrementally by
+    crud.update_liquidity (app/utils/liquidity.py); one row per session with a
+    traded volume.
+    """
+    __tablename__ = "liquidity_daily"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String(16), nullable=False)
+    window_size = Column(Integer, nullable=False)
+    record_date = Column(Date, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+    median_volume = Column(Float, nullable=True)
+    turnover_z = Column(Float, nullable=True)        # log turnover vs window; None during warm-up
+    liquidity_score = Column(Float, nullable=True)   # 0–100 from turnover_z
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_liquidity_daily_key_date", "ticker", "window_size", "record_date", unique=True),
+    )
+
+
 class SentimentScore(Base):
     """Stored sentiment scores for history and filtering."""
     __tablename__ = "sentiment_scores"
@@ -38,9 +88,67 @@ class SentimentScore(Base):
     negative_count = Column(Integer, default=0)
     total_articles = Column(Integer, default=0)
     raw_aggregate = Column(JSON, nullable=True)
+    analyzer_version = Column(String(64), nullable=True)  # backends.scoring_version() when scored
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class SentimentRollup(Base):
+    """
+    Materialized sentiment rollup per (grain, period_start); grain is
+    day | week (ISO, Monday start) | month. Scores come from sentiment_scores
+    (crud.create_sentiment_score; each weighted by its refresh's article count),
+    article and label counts from distinct sentiment_articles rows by published
+    day (crud.create_sentiment_articles), so re-seen headlines count once.
+    """
+    __tablename__ = "sentiment_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    grain = Column(String(8), nullable=False)
+    period_start = Column(Date, nullable=False)
+    weighted_sum = Column(Float, default=0.0)   # sum(score * weight)
+    weight_total = Column(Float, default=0.0)
+    score_count = Column(Integer, default=0)    # sentiment_scores rows folded in
+    min_score = Column(Float, nullable=True)
+    max_score = Column(Float, nullable=True)
+    positive_count = Column(Integer, default=0)
+    neutral_count = Column(Integer, default=0)
+    negative_count = Column(Integer, default=0)
+    total_articles = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (Index("ix_sentiment_rollups_grain_period", "grain", "period_start", unique=True),)
+
+
+class SentimentArticle(Base):
+    """
+    Scored headline stored at ingest (one row per story; near-duplicates are
+    collapsed before scoring). Backs the filtered /sentiment queries.
+    """
+    __tablename__ = "sentiment_articles"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_key = Column(String(40), nullable=False)  # sha1 of link (or title|source): ingest is idempotent
+    title = Column(Text, nullable=False)
+    source = Column(String(255), nullable=True)
+    link = Column(Text, nullable=True)
+    published_at = Column(DateTime, nullable=True)   # UTC
+    record_date = Column(Date, nullable=False)       # UTC date published (ingest date if unknown)
+    compound = Column(Float, nullable=False)
+    positive = Column(Float, nullable=True)
+    neutral = Column(Float, nullable=True)
+    negative = Column(Float, nullable=True)
+    label = Column(String(16), nullable=False)
+    weight = Column(Float, nullable=True)            # source credibility × recency at ingest
+    analyzer_version = Column(String(64), nullable=True)  # backends.scoring_version() when scored
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_sentiment_articles_key", "article_key", unique=True),
+        Index("ix_sentiment_articles_date_id", "record_date", "id"),
+        Index("ix_sentiment_articles_label_date_id", "label", "record_date", "id"),
+    )
+
+
 class StabilityHistory(Base):
     """Historical stability scores for trend analysis."""
     __tablename__ = "stability_history"
@@ -56,16 +164,36 @@ class StabilityHistory(Base):
 
 
 class ForecastHistory(Base):
-    """Stored forecast runs for backtesting and audit."""
+    """Stored forecast runs for backtesting, audit and serving /forecast without a model in memory."""
     __tablename__ = "forecast_history"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     forecast_date = Column(Date, nullable=False, index=True)  # date of run
+    market_date = Column(Date, nullable=True)      # last market bar the model saw
+    model_version = Column(String(64), nullable=True)
     target_dates = Column(JSON, nullable=True)   # list of forecast dates
-    predictions = Column(JSON, nullable=True)    # list of {date, predicted, upper, lower}
+    predictions = Column(JSON, nullable=True)    # {dates, predicted, upper, lower, confidence} arrays (older rows: points)
     current_value = Column(Float, nullable=True)
     uptrend_probability = Column(Float, nullable=True)
     downtrend_probability = Column(Float, nullable=True)
     confidence_level = Column(String(32), nullable=True)
     model_metrics = Column(JSON, nullable=True)    # mae, rmse, r2
-    created_at = Column(DateTime, default=datetime.utcnow)
+    summary = Column(JSON, nullable=True)
+    trend_distribution = Column(JSON, nullable=True)  # drawdown_probability, quantile_bands
+    volatility_pct = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class RescoreCheckpoint(Base):
+    """Progress of a rescoring job (app/sentiment/rescore.py) so an interrupted run resumes."""
+    __tablename__ = "rescore_checkpoints"
+
+    job = Column(String(64), primary_key=True)       # table being rescored
+    version = Column(String(64), nullable=False)     # scoring version being applied
+    last_id = Column(Integer, default=0)             # rows with id <= last_id are done
+    rows_rescored = Column(Integer, default=0)
+    dates = Column(JSON, nullable=True)              # ISO dates whose aggregates need rebuilding
+    deltas = Column(JSON, nullable=True)             # {ISO date: {name: sum}} reported by the job's score_rows
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -50,6 +50,10 @@ async def lifespan(app: FastAPI):
                 finally:
                     db.close()
             scheduler.add_job(job, "cron", hour=0, minute=30)
+            if settings.FORECAST_TUNING_ENABLED:
+                from app.ml.tuning import run_tuning_job
+                scheduler.add_job(run_tuning_job, "cron", hour=22, minute=0)
+                logger.info("Nightly forecast tuning scheduled (22:00 UTC)")
             scheduler.start()
             logger.info("Daily refresh scheduler started (00:30 UTC)")
         except Exception as e:
@@ -88,7 +92,9 @@ def root():
             "GET /forecast",
             "GET /model-metrics",
             "GET /sentiment",
+            "GET /sentiment/history?grain=day|week|month",
             "GET /stability-score",
+            "POST /stability-score/scenarios",
             "POST /refresh-data",
             "GET /health",
         ],
@@ -1,4 +1,4 @@
-from .forecast import ForecastService, get_model_metrics
+from .forecast import ForecastService, get_model_metrics, warm_start_params
 from .stability import StabilityScoreService
 
-__all__ = ["ForecastService", "get_model_metrics", "StabilityScoreService"]
+__all__ = ["ForecastService", "get_model_metrics", "warm_start_params", "StabilityScoreService"]
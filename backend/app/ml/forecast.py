@@ -1,12 +1,17 @@
 """
 Time Series Forecasting – Facebook Prophet with train/test split and evaluation metrics.
 Returns MAE, RMSE, R² via /model-metrics and probabilistic trend (uptrend/downtrend probability).
+Refits warm-start Stan optimisation from the previous fit's parameters.
 """
 import pandas as pd
 import numpy as np
 import warnings
 from typing import Tuple, Dict, Optional, List
 
+from app.config import settings
+from .trend_probability import TrendProbabilityEngine, log_return_residuals
+from .tuning import DEFAULT_PROPHET_CONFIG, config_key, resolve_config
+
 warnings.filterwarnings("ignore")
 
 # Optional Prophet; fallback to simple model if missing
@@ -20,6 +25,68 @@ except ImportError:
 # Train/test split ratio (e.g. last 20% for test)
 TEST_RATIO = 0.2
 
+# /forecast?horizon= choices; one MAX_HORIZON predict per model version serves them all
+FORECAST_HORIZONS = (1, 7, 30, 90)
+MAX_HORIZON = max(FORECAST_HORIZONS)
+DEFAULT_HORIZON = 7
+
+# Interval modes for predict (settings.FORECAST_INTERVAL_MODE):
+#   sampled  – Prophet default: simulate uncertainty_samples trajectories per call
+#   reduced  – same, with FORECAST_UNCERTAINTY_SAMPLES trajectories
+#   analytic – no simulation; yhat ± z·σ, σ = fitted residual std (sigma_obs)
+#   none     – no simulation; bounds = yhat, confidence still derived from σ
+INTERVAL_MODES = ("sampled", "reduced", "analytic", "none")
+INTERVAL_Z = 1.2816  # two-sided 80%, Prophet's default interval_width
+
+
+def interval_prophet_kwargs(mode: Optional[str] = None) -> Dict:
+    """Prophet constructor kwargs for an interval mode."""
+    mode = mode or settings.FORECAST_INTERVAL_MODE
+    if mode == "reduced":
+        return {"uncertainty_samples": settings.FORECAST_UNCERTAINTY_SAMPLES}
+    if mode in ("analytic", "none"):
+        return {"uncertainty_samples": 0}
+    return {}
+
+
+def residual_sigma(model) -> float:
+    """Fitted observation-noise σ (residual std) in price units – free, no predict needed."""
+    try:
+        return float(np.ravel(model.params["sigma_obs"])[0]) * float(model.y_scale)
+    except Exception:
+        return 0.0
+
+
+def fill_intervals(out: pd.DataFrame, mode: Optional[str] = None, sigma: float = 0.0) -> pd.DataFrame:
+    """Ensure yhat_upper, yhat_lower and confidence are present whatever the interval mode."""
+    mode = mode or settings.FORECAST_INTERVAL_MODE
+    if mode in ("analytic", "none") or "yhat_upper" not in out:
+        half = INTERVAL_Z * (sigma or 0.0)
+        if mode == "none":
+            out["yhat_upper"] = out["yhat"]
+            out["yhat_lower"] = out["yhat"]
+        else:
+            out["yhat_upper"] = out["yhat"] + half
+            out["yhat_lower"] = out["yhat"] - half
+        width = 2 * half
+    else:
+        width = out["yhat_upper"] - out["yhat_lower"]
+    out["confidence"] = (1 - width / (out["yhat"].abs() + 1e-6)).clip(0, 1)
+    return out
+
+
+def warm_start_params(model) -> Dict:
+    """
+    Fitted Stan parameters of a Prophet model, shaped for ``Prophet.fit(df, init=...)``.
+    One extra bar barely moves the optimum, so the next fit converges in a few iterations.
+    """
+    res = {}
+    for pname in ("k", "m", "sigma_obs"):
+        res[pname] = float(model.params[pname][0][0])
+    for pname in ("delta", "beta"):
+        res[pname] = model.params[pname][0]
+    return res
+
 
 class ForecastService:
     """
@@ -27,14 +94,26 @@ class ForecastService:
     - Train/test split
     - MAE, RMSE, R²
     - Probabilistic output (uptrend/downtrend probability)
+    - Warm-started refits (previous fit's parameters as Stan initial values)
+    - Prophet settings from the cached hyperparameter search (app.ml.tuning)
     """
-    def __init__(self):
+    def __init__(self, warm_start: bool = True, ticker: str = "^NSEI", interval_mode: Optional[str] = None):
         self.model = None
+        self.ticker = ticker
+        self.interval_mode = interval_mode or settings.FORECAST_INTERVAL_MODE
+        self.config: Dict = dict(DEFAULT_PROPHET_CONFIG)
+        self.warm_start = warm_start
+        self._warm_params: Optional[Dict] = None
         self.is_trained = False
         self.use_mock = False
         self.last_close = 0.0
         self.last_training_date = None
         self.metrics: Optional[Dict] = None  # mae, rmse, r2_score
+        self.trend_engine = TrendProbabilityEngine()
+        self._residuals = np.zeros(0)  # de-meaned log returns for Monte-Carlo bootstrap
+        self._n_obs = 0
+        self.residual_sigma = 0.0
+        self._prediction_cache: Optional[Tuple[Tuple, pd.DataFrame]] = None  # ((version, periods), df)
 
     def prepare_data(self, historical_data: pd.DataFrame) -> pd.DataFrame:
         if historical_data is None or historical_data.empty:
@@ -49,9 +128,33 @@ class ForecastService:
         if not prophet_df.empty:
             self.last_close = float(prophet_df["y"].iloc[-1])
             self.last_training_date = prophet_df["ds"].max()
+            self._residuals = log_return_residuals(prophet_df["y"].values)
+        self._n_obs = len(prophet_df)
         return prophet_df
 
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifies the fitted model (kind, last training bar, history length). None until trained."""
+        if not self.is_trained:
+            return None
+        kind = "fallback" if self.use_mock else "prophet"
+        last = pd.Timestamp(self.last_training_date).strftime("%Y%m%d") if self.last_training_date is not None else "na"
+        return f"{kind}-{config_key(self.config)}-{last}-n{self._n_obs}"
+
+    def needs_training(self, historical_data: pd.DataFrame) -> bool:
+        """True until trained, or when historical_data has a bar after the last one trained on."""
+        if not self.is_trained or self.last_training_date is None:
+            return True
+        if historical_data is None or historical_data.empty:
+            return False
+        return pd.Timestamp(historical_data.index[-1]).date() > pd.Timestamp(self.last_training_date).date()
+
+    def _resolve_config(self) -> Dict:
+        """Best config from the offline search for this ticker, else the defaults. Never searches."""
+        return resolve_config(self.ticker)
+
     def train_model(self, historical_data: pd.DataFrame) -> Tuple[bool, str]:
+        self._prediction_cache = None
         try:
             prophet_df = self.prepare_data(historical_data)
             if len(prophet_df) < 30:
@@ -72,13 +175,20 @@ class ForecastService:
             train_df = prophet_df.iloc[:-test_size]
             test_dates = prophet_df["ds"].iloc[-test_size:].values
 
-            self.model = Prophet(
-                daily_seasonality=True,
-                weekly_seasonality=True,
-                yearly_seasonality=False,
-                changepoint_prior_scale=0.05,
-            )
-            self.model.fit(train_df)
+            config = self._resolve_config()
+            if config != self.config:
+                # Different model structure/priors: previous optimum is not a useful init
+                self._warm_params = None
+                self.config = config
+            self.model = Prophet(**self.config, **interval_prophet_kwargs(self.interval_mode))
+            init = self._warm_params if self.warm_start else None
+            if init is not None:
+                # Prophet falls back to its default init for any param whose shape changed
+                self.model.fit(train_df, init=init)
+            else:
+                self.model.fit(train_df)
+            self._warm_params = warm_start_params(self.model)
+            self.residual_sigma = residual_sigma(self.model)
 
             # Evaluate on test period
             future = pd.DataFrame({"ds": test_dates})
@@ -108,11 +218,23 @@ class ForecastService:
             return True, f"Fallback mode: {e}"
 
     def forecast(self, days: int = 7) -> pd.DataFrame:
+        """
+        Next `days` trading days after the last market bar, sliced from one MAX_HORIZON
+        prediction cached per model version – shorter horizons add no model calls.
+        """
         if not self.is_trained:
             raise ValueError("Model not trained")
+        periods = max(days, MAX_HORIZON)
+        key = (self.model_version, periods)
+        if self._prediction_cache is None or self._prediction_cache[0] != key:
+            self._prediction_cache = (key, self._predict(periods))
+        return self._prediction_cache[1].iloc[:days].copy()
+
+    def _predict(self, days: int) -> pd.DataFrame:
+        start = self.last_training_date or pd.Timestamp.now()
+        # Trading days (Mon–Fri): weekend rows have no training data and seasonality extrapolates wildly there
+        dates = pd.bdate_range(start=start, periods=days + 1)[1:]
         if self.use_mock:
-            start = self.last_training_date or pd.Timestamp.now()
-            dates = pd.date_range(start=start, periods=days + 1)[1:]
             base = self.last_close
             vals, up, lo = [], [], []
             cur = base
@@ -128,37 +250,60 @@ class ForecastService:
                 "yhat_lower": lo,
                 "confidence": [0.75] * days,
             })
-        future = self.model.make_future_dataframe(periods=days)
-        pred = self.model.predict(future)
-        out = pred.tail(days).copy()
-        unc = out["yhat_upper"] - out["yhat_lower"]
-        out["confidence"] = (1 - unc / (out["yhat"].abs() + 1e-6)).clip(0, 1)
-        return out
+        # Future rows only, from the last observed bar (the model itself is fit on the train split)
+        out = self.model.predict(pd.DataFrame({"ds": dates}))
+        return fill_intervals(out, self.interval_mode, self.residual_sigma)
 
     def get_forecast_summary(self, forecast_df: pd.DataFrame) -> dict:
-        return {
-            "trend": "upward" if forecast_df["yhat"].iloc[-1] > forecast_df["yhat"].iloc[0] else "downward",
-            "avg_predicted_value": float(forecast_df["yhat"].mean()),
-            "min_predicted": float(forecast_df["yhat_lower"].min()),
-            "max_predicted": float(forecast_df["yhat_upper"].max()),
-            "avg_confidence": float(forecast_df["confidence"].mean()),
-            "volatility": float((forecast_df["yhat_upper"] - forecast_df["yhat_lower"]).mean()),
-        }
+        n = len(forecast_df)
+        return self.get_forecast_summaries(forecast_df, (n,))[n]
+
+    def get_forecast_summaries(self, forecast_df: pd.DataFrame, horizons=FORECAST_HORIZONS) -> Dict[int, dict]:
+        """Summary per horizon from running aggregates over the columns – one vectorized pass."""
+        yhat = forecast_df["yhat"].to_numpy(dtype=float)
+        upper = forecast_df["yhat_upper"].to_numpy(dtype=float)
+        lower = forecast_df["yhat_lower"].to_numpy(dtype=float)
+        conf = forecast_df["confidence"].to_numpy(dtype=float)
+        n = np.arange(1, len(yhat) + 1)
+        avg_pred = np.cumsum(yhat) / n
+        run_min = np.minimum.accumulate(lower)
+        run_max = np.maximum.accumulate(upper)
+        avg_conf = np.cumsum(conf) / n
+        avg_width = np.cumsum(upper - lower) / n
+        out = {}
+        for h in horizons:
+            if not 1 <= h <= len(yhat):
+                continue
+            i = h - 1
+            out[h] = {
+                "trend": "upward" if yhat[i] > yhat[0] else "downward",
+                "avg_predicted_value": float(avg_pred[i]),
+                "min_predicted": float(run_min[i]),
+                "max_predicted": float(run_max[i]),
+                "avg_confidence": float(avg_conf[i]),
+                "volatility": float(avg_width[i]),
+            }
+        return out
+
+    def get_trend_distribution(self, forecast_df: pd.DataFrame) -> Dict:
+        """
+        Monte-Carlo trend distribution: uptrend/downtrend probability, quantile bands,
+        drawdown probability from bootstrapped residual paths around yhat.
+        """
+        yhat = forecast_df["yhat"].values
+        start = self.last_close or float(yhat[0])
+        return self.trend_engine.simulate(start, yhat, self._residuals)
+
+    def get_trend_distributions(self, forecast_df: pd.DataFrame, horizons=FORECAST_HORIZONS) -> Dict[int, Dict]:
+        """Trend distribution per horizon, all read from one simulation over the longest horizon."""
+        yhat = forecast_df["yhat"].values
+        start = self.last_close or float(yhat[0])
+        return self.trend_engine.simulate_horizons(start, yhat, self._residuals, horizons)
 
     def get_uptrend_downtrend_probability(self, forecast_df: pd.DataFrame) -> Tuple[float, float]:
         """Probabilistic output: uptrend_probability, downtrend_probability (0-100)."""
-        first_val = float(forecast_df["yhat"].iloc[0])
-        last_val = float(forecast_df["yhat"].iloc[-1])
-        avg_conf = float(forecast_df["confidence"].mean())
-        if last_val > first_val:
-            uptrend = 50 + (last_val - first_val) / (first_val + 1e-6) * 500
-            uptrend = min(95, max(5, uptrend))
-        else:
-            uptrend = 50 + (last_val - first_val) / (first_val + 1e-6) * 500
-            uptrend = min(95, max(5, uptrend))
-        uptrend = round(uptrend * (0.7 + 0.3 * avg_conf), 1)
-        downtrend = round(100 - uptrend, 1)
-        return uptrend, downtrend
+        dist = self.get_trend_distribution(forecast_df)
+        return dist["uptrend_probability"], dist["downtrend_probability"]
 
     def get_confidence_level(self) -> str:
         if not self.metrics:
@@ -1,7 +1,7 @@
 """
 Multi-Factor Economic Stability Index (0–100).
 
-Formula (academically justified, explainable):
+Formula (academically justified, explainable), "default" weight profile:
 
   Stability Score =
     (0.30 × Market Momentum Score) +
@@ -11,8 +11,20 @@ Formula (academically justified, explainable):
     (0.10 × Liquidity Score)
 
 All factors normalized 0–100. Risk level and explanation derived from components.
+Weights and category thresholds come from a named profile
+(app/ml/stability_profiles.py), chosen per service or per call and resolved
+to FACTORS (economic_indicators reads as inflation; other factors are rejected).
+calculate() scores one set of inputs; calculate_batch() scores many (scenario grids)
+with array math and leaves explanations to explain_batch().
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.ml.stability_profiles import CATEGORIES, RISK_LEVELS, StabilityProfile, get_profile
+
+# Column order for calculate_batch components / weights
+FACTORS = ("market_momentum", "sentiment", "volatility_inverse", "inflation", "liquidity")
 
 
 class StabilityScoreService:
@@ -20,18 +32,12 @@ class StabilityScoreService:
     Multi-factor stability index with transparency and academic justification.
     """
 
-    # Weights (sum = 1.0)
-    W_MARKET_MOMENTUM = 0.30   # Trend strength and direction
-    W_SENTIMENT = 0.25         # News/social sentiment
-    W_VOLATILITY_INVERSE = 0.20  # Lower volatility = higher stability
-    W_INFLATION = 0.15         # Inflation within target band
-    W_LIQUIDITY = 0.10         # Market depth / liquidity proxy
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = profile  # None: settings.STABILITY_PROFILE at call time
 
-    STABLE_THRESHOLD = 71
-    MODERATE_THRESHOLD = 41
-
-    def __init__(self):
-        pass
+    def get_profile(self, profile: Optional[str] = None) -> StabilityProfile:
+        """Named profile over FACTORS; ValueError if unknown or weighting another factor."""
+        return get_profile(profile or self.profile).for_factors(FACTORS)
 
     def _clamp(self, x: float) -> float:
         return max(0.0, min(100.0, x))
@@ -43,26 +49,22 @@ class StabilityScoreService:
         volatility_inverse_score: float,
         inflation_score: float,
         liquidity_score: float,
+        profile: Optional[str] = None,
     ) -> Dict:
         """
-        All inputs should be 0–100. Returns stability_score, category, risk_level, explanation, components.
+        All inputs should be 0–100. Returns stability_score, category, risk_level, explanation,
+        components, breakdown and the profile used.
         """
+        p = self.get_profile(profile)
         m = self._clamp(market_momentum_score)
         s = self._clamp(sentiment_score)
         v = self._clamp(volatility_inverse_score)
         i = self._clamp(inflation_score)
         lq = self._clamp(liquidity_score)
 
-        stability_score = round(
-            m * self.W_MARKET_MOMENTUM
-            + s * self.W_SENTIMENT
-            + v * self.W_VOLATILITY_INVERSE
-            + i * self.W_INFLATION
-            + lq * self.W_LIQUIDITY,
-            2,
-        )
-        category = self._category(stability_score)
-        risk_level = self._risk_level(stability_score)
+        stability_score, level = p.evaluate(dict(zip(FACTORS, (m, s, v, i, lq))))
+        category = CATEGORIES[level]
+        risk_level = RISK_LEVELS[level]
         explanation = self._explanation(m, s, v, i, lq, category)
 
         return {
@@ -78,27 +80,37 @@ class StabilityScoreService:
                 "liquidity": round(lq, 2),
             },
             "breakdown": {
-                "market_contribution": round(m * self.W_MARKET_MOMENTUM, 2),
-                "sentiment_contribution": round(s * self.W_SENTIMENT, 2),
-                "volatility_contribution": round(v * self.W_VOLATILITY_INVERSE, 2),
-                "inflation_contribution": round(i * self.W_INFLATION, 2),
-                "liquidity_contribution": round(lq * self.W_LIQUIDITY, 2),
+                "market_contribution": round(m * p.weight("market_momentum"), 2),
+                "sentiment_contribution": round(s * p.weight("sentiment"), 2),
+                "volatility_contribution": round(v * p.weight("volatility_inverse"), 2),
+                "inflation_contribution": round(i * p.weight("inflation"), 2),
+                "liquidity_contribution": round(lq * p.weight("liquidity"), 2),
             },
+            "profile": p.name,
         }
 
-    def _category(self, score: float) -> str:
-        if score >= self.STABLE_THRESHOLD:
-            return "Stable"
-        if score >= self.MODERATE_THRESHOLD:
-            return "Moderate"
-        return "Unstable"
-
-    def _risk_level(self, score: float) -> str:
-        if score >= self.STABLE_THRESHOLD:
-            return "Low"
-        if score >= self.MODERATE_THRESHOLD:
-            return "Medium"
-        return "High"
+    def weight_vector(self, profile: Optional[str] = None) -> np.ndarray:
+        return self.get_profile(profile).vector(FACTORS)
+
+    def calculate_batch(
+        self,
+        components: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        profile: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        calculate() over rows: components is (n, 5) in FACTORS order; weights (5,) or
+        (n, 5) replace the profile's. Returns stability_score, clamped components and
+        level (0 Unstable/High, 1 Moderate/Medium, 2 Stable/Low).
+        """
+        p = self.get_profile(profile)
+        c = np.clip(np.asarray(components, dtype=float), 0.0, 100.0)
+        score = p.score_batch(c, FACTORS, weights)
+        return {"stability_score": score, "components": c, "level": p.level(score)}
+
+    def explain_batch(self, components: np.ndarray, level: np.ndarray) -> List[str]:
+        return [self._explanation(m, s, v, i, lq, CATEGORIES[k])
+                for (m, s, v, i, lq), k in zip(np.asarray(components).tolist(), level.tolist())]
 
     def _explanation(
         self,
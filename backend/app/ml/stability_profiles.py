@@ -0,0 +1,200 @@
+"""
+Named weight/threshold profiles for the stability index, shared by every scorer.
+
+  default  v2 multi-factor index (app/ml/stability.py): 0.30 market momentum,
+           0.25 sentiment, 0.20 volatility inverse, 0.15 inflation, 0.10 liquidity;
+           Stable >= 71, Moderate >= 41
+  legacy   services/stability_service: 0.4 market, 0.3 sentiment, 0.2 inflation
+           proxy, 0.1 volatility; Stable >= 70, Moderate >= 40
+  classic  ml_models/stability_score: 0.4 market trend, 0.3 sentiment,
+           0.3 economic indicators; Stable >= 71, Moderate >= 41 (the v2 and
+           legacy scorers read economic_indicators as their inflation input)
+
+settings.STABILITY_PROFILES_FILE adds or overrides profiles – a JSON object
+{"name": {"weights": {"market_momentum": 0.3, ...}, "thresholds": {"moderate": 41, "stable": 71}}}
+– and is reloaded when it changes. Each profile is compiled once into a weight
+vector (in its own factor order) and an ascending threshold table, so a score
+is one weighted sum and its level one searchsorted. Inputs are 0–100. Scorers
+take a profile through for_factors(), which renames FACTOR_ALIASES and rejects
+(ValueError) a profile weighting any factor the scorer does not supply, rather
+than scoring it as a constant; evaluate() on an unresolved profile still counts a
+missing factor as neutral 50.
+"""
+import json
+import os
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+CATEGORIES = ("Unstable", "Moderate", "Stable")
+RISK_LEVELS = ("High", "Medium", "Low")
+FACTOR_NEUTRAL = 50.0
+
+# Profile factor -> the scorer input standing in for it (for_factors)
+FACTOR_ALIASES = {"economic_indicators": "inflation"}
+
+BUILTIN_PROFILES: Dict[str, Dict] = {
+    "default": {
+        "weights": {"market_momentum": 0.30, "sentiment": 0.25, "volatility_inverse": 0.20,
+                    "inflation": 0.15, "liquidity": 0.10},
+        "thresholds": {"moderate": 41, "stable": 71},
+    },
+    "legacy": {
+        "weights": {"market_momentum": 0.4, "sentiment": 0.3, "inflation": 0.2, "volatility_inverse": 0.1},
+        "thresholds": {"moderate": 40, "stable": 70},
+    },
+    "classic": {
+        "weights": {"market_momentum": 0.40, "sentiment": 0.30, "economic_indicators": 0.30},
+        "thresholds": {"moderate": 41, "stable": 71},
+    },
+}
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    # Python round() per element: np.round rounds ties differently from the scalar path
+    return np.array([round(x, 2) for x in values.tolist()], dtype=float)
+
+
+class StabilityProfile:
+    def __init__(self, name: str, weights: Mapping[str, float], thresholds: Mapping[str, float]):
+        self.name = name
+        self.factors: Tuple[str, ...] = tuple(weights)
+        self.weights = np.array([float(weights[f]) for f in self.factors])
+        if not self.factors or (self.weights < 0).any() or self.weights.sum() <= 0:
+            raise ValueError(f"profile {name!r}: weights must be non-negative with a positive total")
+        self.thresholds = np.array([float(thresholds["moderate"]), float(thresholds["stable"])])
+        if self.thresholds[0] > self.thresholds[1]:
+            raise ValueError(f"profile {name!r}: moderate threshold above stable")
+        self._weights = self.weights.tolist()
+        self._thresholds = self.thresholds.tolist()
+        self._resolved: Dict[Tuple, "StabilityProfile"] = {}
+
+    def for_factors(self, factors: Sequence[str],
+                    aliases: Optional[Mapping[str, str]] = FACTOR_ALIASES) -> "StabilityProfile":
+        """
+        This profile over a scorer's factors: factors named in aliases are renamed (weights
+        that meet are added). ValueError if the profile weights a factor not in factors.
+        """
+        aliases = aliases or {}
+        key = (tuple(factors), tuple(sorted(aliases.items())))
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            weights: Dict[str, float] = {}
+            for f, w in zip(self.factors, self._weights):
+                f = aliases.get(f, f)
+                weights[f] = weights.get(f, 0.0) + w
+            unknown = [f for f in weights if f not in factors]
+            if unknown:
+                raise ValueError(f"stability profile {self.name!r} weights {unknown}, "
+                                 f"which this score does not use (factors: {list(factors)})")
+            if tuple(weights) == self.factors:
+                resolved = self
+            else:
+                resolved = StabilityProfile(self.name, weights, dict(zip(("moderate", "stable"), self._thresholds)))
+            self._resolved[key] = resolved
+        return resolved
+
+    def weight(self, factor: str) -> float:
+        return float(self.weights[self.factors.index(factor)]) if factor in self.factors else 0.0
+
+    def vector(self, factors: Sequence[str]) -> np.ndarray:
+        """Weights aligned to the caller's factor order (0 for factors the profile does not use)."""
+        return np.array([self.weight(f) for f in factors])
+
+    # ---------- Scalar ----------
+    def evaluate(self, components: Mapping[str, float]) -> Tuple[float, int]:
+        """(score rounded to 2 dp, level 0 Unstable / 1 Moderate / 2 Stable)."""
+        raw = 0.0
+        for f, w in zip(self.factors, self._weights):
+            raw = raw + components.get(f, FACTOR_NEUTRAL) * w
+        score = round(raw, 2)
+        return score, bisect_right(self._thresholds, score)
+
+    # ---------- Batch ----------
+    def score_batch(self, components: np.ndarray, factors: Sequence[str],
+                    weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Scores for (n, len(factors)) components. weights, if given, are (n, len(factors))
+        or (len(factors),) in the caller's order and replace the profile's.
+        """
+        c = np.asarray(components, dtype=float)
+        if weights is None:
+            cols = [c[:, factors.index(f)] if f in factors else np.full(len(c), FACTOR_NEUTRAL)
+                    for f in self.factors]
+            w = [np.full(len(c), x) for x in self._weights]
+        else:
+            w = np.broadcast_to(np.asarray(weights, dtype=float), c.shape)
+            cols, w = list(c.T), list(w.T)
+        # Column-by-column accumulation: the same operations, in the same order, as evaluate()
+        raw = np.zeros(len(c))
+        for col, wc in zip(cols, w):
+            raw = raw + col * wc
+        return _round2(raw)
+
+    def level(self, scores: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.thresholds, scores, side="right")
+
+
+_profiles: Optional[Dict[str, StabilityProfile]] = None
+_profiles_key: Optional[Tuple] = None
+_profiles_lock = threading.Lock()
+
+
+def _file_key() -> Tuple:
+    path = settings.STABILITY_PROFILES_FILE
+    if not path:
+        return ("", None)
+    try:
+        return (path, os.stat(path).st_mtime)
+    except OSError:
+        return (path, None)
+
+
+def _compile_profiles(key: Tuple) -> Dict[str, StabilityProfile]:
+    specs = dict(BUILTIN_PROFILES)
+    path, mtime = key
+    if path and mtime is None:
+        logger.warning("Stability profile file %s not found; using built-in profiles", path)
+    elif path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                specs.update(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Unreadable stability profile file %s: %s", path, e)
+    profiles = {}
+    for name, spec in specs.items():
+        try:
+            thresholds = spec.get("thresholds") or BUILTIN_PROFILES["default"]["thresholds"]
+            profiles[name] = StabilityProfile(name, spec["weights"], thresholds)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping stability profile %r: %s", name, e)
+    return profiles
+
+
+def _current() -> Dict[str, StabilityProfile]:
+    global _profiles, _profiles_key
+    key = _file_key()
+    with _profiles_lock:
+        if _profiles is None or key != _profiles_key:
+            _profiles, _profiles_key = _compile_profiles(key), key
+        return _profiles
+
+
+def get_profile(name: Optional[str] = None) -> StabilityProfile:
+    """Compiled profile by name (default settings.STABILITY_PROFILE); ValueError if unknown."""
+    name = name or settings.STABILITY_PROFILE or "default"
+    profiles = _current()
+    if name not in profiles:
+        raise ValueError(f"unknown stability profile {name!r}; available: {sorted(profiles)}")
+    return profiles[name]
+
+
+def list_profiles() -> List[str]:
+    return sorted(_current())
@@ -0,0 +1,161 @@
+"""
+Monte-Carlo trend probability engine.
+
+Draws thousands of forecast paths in one vectorized numpy operation – either a
+bootstrap of historical log-return residuals around the Prophet trajectory, or
+the model's own predictive samples – and reduces them to:
+  - uptrend probability  P(price at horizon > current price)
+  - quantile bands per forecast day
+  - probability of drawdown  P(peak-to-trough fall >= threshold within horizon)
+
+Latency budget: 10k paths × 30 days must stay under ~50 ms (see
+benchmarks/bench_trend_probability.py), scaled linearly for longer horizons. If a run exceeds the budget the engine
+halves the path count for subsequent runs, never below MIN_PATHS; runs well
+under budget (< GROW_FRACTION of it) double it back, up to the configured count.
+Without residuals there is no spread to resample, so the result is the neutral
+50/50 distribution around the forecast path.
+"""
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_PATHS = 10_000
+MIN_PATHS = 1_000
+DEFAULT_BUDGET_MS = 50.0
+BUDGET_HORIZON = 30   # DEFAULT_BUDGET_MS is for this many days; longer runs scale it
+GROW_FRACTION = 0.33  # doubling the paths must still fit the budget with room to spare
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DRAWDOWN_THRESHOLD = 0.05  # 5% peak-to-trough
+
+
+def log_return_residuals(closes: Sequence[float]) -> np.ndarray:
+    """De-meaned daily log returns – the bootstrap pool (drift comes from the forecast)."""
+    y = np.asarray(closes, dtype=float)
+    y = y[np.isfinite(y) & (y > 0)]
+    if len(y) < 3:
+        return np.zeros(0)
+    r = np.diff(np.log(y))
+    return r - r.mean()
+
+
+class TrendProbabilityEngine:
+    """
+    Vectorized path simulator + reducer. One instance per forecaster;
+    the RNG and adaptive path count are kept across calls.
+    """
+
+    def __init__(
+        self,
+        n_paths: int = DEFAULT_PATHS,
+        budget_ms: float = DEFAULT_BUDGET_MS,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        drawdown_threshold: float = DRAWDOWN_THRESHOLD,
+        seed: Optional[int] = None,
+    ):
+        self.n_paths = n_paths
+        self.max_paths = n_paths
+        self.budget_ms = budget_ms
+        self.quantiles = tuple(quantiles)
+        self.drawdown_threshold = drawdown_threshold
+        self.rng = np.random.default_rng(seed)
+        self.last_elapsed_ms: Optional[float] = None
+
+    def bootstrap_paths(self, start_value: float, yhat: Sequence[float], residuals: np.ndarray) -> np.ndarray:
+        """
+        (n_paths, horizon) price paths: the forecast's average log-growth per step
+        plus resampled residual shocks, compounded from start_value.
+        Drift is the first-to-last yhat slope, so neither the model's level offset
+        from the last close nor single-day seasonal swings read as market moves.
+        """
+        yhat = np.asarray(yhat, dtype=float)
+        horizon = len(yhat)
+        if horizon > 1:
+            drift = np.log(max(yhat[-1], 1e-6) / max(yhat[0], 1e-6)) / (horizon - 1)
+        else:
+            drift = 0.0
+        if len(residuals) == 0:
+            shocks = np.zeros((self.n_paths, horizon))
+        else:
+            idx = self.rng.integers(0, len(residuals), size=(self.n_paths, horizon))
+            shocks = residuals[idx]
+        log_paths = np.log(start_value) + np.cumsum(drift + shocks, axis=1)
+        return np.exp(log_paths)
+
+    def summarize(self, paths: np.ndarray, start_value: float) -> Dict:
+        """Reduce (n_paths, horizon) paths to probabilities and quantile bands."""
+        end = paths[:, -1]
+        uptrend = float(np.mean(end > start_value))
+        bands = np.quantile(paths, self.quantiles, axis=0)
+        peak = np.maximum.accumulate(np.maximum(paths, start_value), axis=1)
+        max_drawdown = np.max(1.0 - paths / peak, axis=1)
+        return {
+            "uptrend_probability": round(uptrend * 100, 1),
+            "downtrend_probability": round((1 - uptrend) * 100, 1),
+            "drawdown_probability": round(float(np.mean(max_drawdown >= self.drawdown_threshold)) * 100, 1),
+            "drawdown_threshold": self.drawdown_threshold,
+            "expected_return_pct": round(float(np.mean(end / start_value - 1) * 100), 3),
+            "quantile_bands": {
+                f"p{int(round(q * 100))}": np.round(bands[i], 2).tolist()
+                for i, q in enumerate(self.quantiles)
+            },
+            "n_paths": int(paths.shape[0]),
+        }
+
+    def neutral(self, start_value: float, yhat: Sequence[float]) -> Dict:
+        """No-information result: 50/50 trend, bands collapsed onto the forecast path."""
+        path = self.bootstrap_paths(start_value, yhat, np.zeros(0))[:1]
+        out = self.summarize(path, start_value)
+        out.update({
+            "uptrend_probability": 50.0,
+            "downtrend_probability": 50.0,
+            "drawdown_probability": None,
+            "n_paths": 0,
+            "method": "neutral",
+        })
+        return out
+
+    def simulate(self, start_value: float, yhat: Sequence[float], residuals: np.ndarray) -> Dict:
+        """Bootstrap paths and summarize, adapting n_paths to the latency budget."""
+        if len(residuals) == 0:
+            return self.neutral(start_value, yhat)
+        t0 = time.perf_counter()
+        out = self.summarize(self.bootstrap_paths(start_value, yhat, residuals), start_value)
+        self._track_budget(t0)
+        out["method"] = "bootstrap"
+        return out
+
+    def simulate_horizons(self, start_value: float, yhat: Sequence[float], residuals: np.ndarray,
+                          horizons: Sequence[int]) -> Dict[int, Dict]:
+        """
+        One bootstrap over the longest horizon, summarized per horizon from the same paths
+        (paths[:, :h]), so the horizons' probabilities come from one consistent simulation.
+        """
+        yhat = np.asarray(yhat, dtype=float)
+        horizons = [min(h, len(yhat)) for h in horizons]
+        if len(residuals) == 0:
+            return {h: self.neutral(start_value, yhat[:h]) for h in horizons}
+        t0 = time.perf_counter()
+        paths = self.bootstrap_paths(start_value, yhat[:max(horizons)], residuals)
+        out = {h: dict(self.summarize(paths[:, :h], start_value), method="bootstrap") for h in horizons}
+        self._track_budget(t0, scale=max(1.0, max(horizons) / BUDGET_HORIZON))
+        return out
+
+    def from_samples(self, start_value: float, samples: np.ndarray) -> Dict:
+        """
+        Summarize model predictive samples, e.g. ``Prophet.predictive_samples(future)["yhat"]``
+        which is (horizon, n_samples).
+        """
+        t0 = time.perf_counter()
+        out = self.summarize(np.asarray(samples, dtype=float).T, start_value)
+        self._track_budget(t0)
+        out["method"] = "predictive_samples"
+        return out
+
+    def _track_budget(self, t0: float, scale: float = 1.0) -> None:
+        self.last_elapsed_ms = (time.perf_counter() - t0) * 1000
+        budget = self.budget_ms * scale
+        if self.last_elapsed_ms > budget and self.n_paths > MIN_PATHS:
+            self.n_paths = max(MIN_PATHS, self.n_paths // 2)
+        elif self.last_elapsed_ms < budget * GROW_FRACTION and self.n_paths < self.max_paths:
+            self.n_paths = min(self.max_paths, self.n_paths * 2)
@@ -0,0 +1,252 @@
+"""
+Prophet hyperparameter search – offline / nightly job, never on a request.
+
+Grid-searches Prophet settings over rolling-origin time-series CV folds in a
+process pool and stores the winning config per ticker (with the data
+fingerprint) as JSON under settings.MODEL_CACHE_DIR. ForecastService loads the
+cached best config at train time and never searches itself.
+
+CLI (from backend root):
+    python -m app.ml.tuning --ticker ^NSEI --period 2y --workers 4
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Settings used before any search has run (previously hard-coded in ForecastService)
+DEFAULT_PROPHET_CONFIG = {
+    "daily_seasonality": True,
+    "weekly_seasonality": True,
+    "yearly_seasonality": False,
+    "changepoint_prior_scale": 0.05,
+}
+
+# Prophet's own defaults for grid keys DEFAULT_PROPHET_CONFIG leaves unset
+PROPHET_DEFAULTS = {
+    "seasonality_prior_scale": 10.0,
+    "seasonality_mode": "additive",
+}
+
+PARAM_GRID = {
+    "changepoint_prior_scale": [0.001, 0.01, 0.05, 0.1, 0.5],
+    "seasonality_prior_scale": [0.1, 1.0, 10.0],
+    "seasonality_mode": ["additive", "multiplicative"],
+    "daily_seasonality": [True, False],
+    "weekly_seasonality": [True, False],
+}
+
+CV_FOLDS = 3
+CV_HORIZON = 7  # bars per fold, matches the /forecast horizon
+
+# In-memory cache of loaded configs: path -> (mtime, record)
+_loaded: Dict[str, Tuple[float, Dict]] = {}
+
+
+def config_key(config: Dict) -> str:
+    """Short stable hash of a Prophet config (part of ForecastService.model_version)."""
+    raw = json.dumps(config, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:8]
+
+
+def data_fingerprint(prophet_df: pd.DataFrame) -> str:
+    """Hash of the (ds, y) training series; identical data -> identical fingerprint."""
+    h = hashlib.sha256()
+    h.update(pd.to_datetime(prophet_df["ds"]).values.astype("datetime64[ns]").astype(np.int64).tobytes())
+    h.update(prophet_df["y"].to_numpy(dtype=float).tobytes())
+    return h.hexdigest()[:16]
+
+
+def normalize_config(config: Dict) -> Dict:
+    """config with Prophet's defaults filled in, so equivalent configs compare equal."""
+    return {**PROPHET_DEFAULTS, **config}
+
+
+def grid_configs(grid: Optional[Dict] = None) -> List[Dict]:
+    grid = grid or PARAM_GRID
+    keys = sorted(grid)
+    configs = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        cfg = dict(DEFAULT_PROPHET_CONFIG)
+        cfg.update(zip(keys, values))
+        configs.append(cfg)
+    return configs
+
+
+def _config_path(ticker: str) -> Path:
+    safe = "".join(c if c.isalnum() else "_" for c in ticker).strip("_") or "default"
+    return Path(settings.MODEL_CACHE_DIR) / f"prophet_{safe}.json"
+
+
+def load_best_config(ticker: str) -> Optional[Dict]:
+    """Cached search result for ticker ({config, score, fingerprint, ...}) or None."""
+    path = _config_path(ticker)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    hit = _loaded.get(str(path))
+    if hit and hit[0] == mtime:
+        return hit[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Unreadable tuning cache %s: %s", path, e)
+        return None
+    _loaded[str(path)] = (mtime, record)
+    return record
+
+
+def resolve_config(ticker: str) -> Dict:
+    """Best config from the offline search for ticker, else the defaults. Never searches."""
+    best = load_best_config(ticker)
+    return dict(best["config"]) if best and best.get("config") else dict(DEFAULT_PROPHET_CONFIG)
+
+
+def save_best_config(ticker: str, record: Dict) -> Path:
+    path = _config_path(ticker)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp, path)  # atomic: training never sees a half-written file
+    return path
+
+
+# ---------- Worker side ----------
+_worker_df: Optional[pd.DataFrame] = None
+
+
+def _init_worker(prophet_df: pd.DataFrame) -> None:
+    global _worker_df
+    import logging
+    logging.getLogger("cmdstanpy").disabled = True
+    _worker_df = prophet_df
+
+
+def _cv_folds(n: int, folds: int, horizon: int) -> List[Tuple[int, int]]:
+    """(cutoff, end) index pairs for rolling-origin evaluation on the last folds*horizon bars."""
+    return [(n - horizon * (folds - k), n - horizon * (folds - k - 1)) for k in range(folds)]
+
+
+def evaluate_config(config: Dict, prophet_df: Optional[pd.DataFrame] = None,
+                    folds: int = CV_FOLDS, horizon: int = CV_HORIZON) -> Tuple[Dict, float]:
+    """Mean RMSE of config over rolling-origin folds (inf if any fit fails)."""
+    from prophet import Prophet
+    df = prophet_df if prophet_df is not None else _worker_df
+    errors = []
+    try:
+        for cutoff, end in _cv_folds(len(df), folds, horizon):
+            model = Prophet(**config)
+            model.fit(df.iloc[:cutoff])
+            pred = model.predict(df[["ds"]].iloc[cutoff:end])
+            y_true = df["y"].iloc[cutoff:end].values
+            errors.append(float(np.sqrt(np.mean((y_true - pred["yhat"].values) ** 2))))
+    except Exception:
+        return config, float("inf")
+    return config, float(np.mean(errors))
+
+
+# ---------- Driver ----------
+def search(
+    ticker: str,
+    prophet_df: pd.DataFrame,
+    workers: Optional[int] = None,
+    grid: Optional[Dict] = None,
+    force: bool = False,
+) -> Dict:
+    """
+    Run the grid search across a process pool and store the winner.
+    Skips the search when the cached result was computed on identical data (unless force).
+    """
+    fingerprint = data_fingerprint(prophet_df)
+    cached = load_best_config(ticker)
+    if cached and cached.get("fingerprint") == fingerprint and not force:
+        logger.info("Tuning skipped for %s: data unchanged (%s)", ticker, fingerprint)
+        return cached
+
+    min_len = 30 + CV_FOLDS * CV_HORIZON
+    if len(prophet_df) < min_len:
+        raise ValueError(f"Need at least {min_len} rows to tune, got {len(prophet_df)}")
+
+    configs = grid_configs(grid)
+    started = datetime.utcnow()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prophet_df,)) as pool:
+        results = list(pool.map(evaluate_config, configs, chunksize=max(1, len(configs) // 32)))
+
+    best_config, best_score = min(results, key=lambda r: r[1])
+    if not math.isfinite(best_score):
+        # Nothing to store: a saved fingerprint would make later runs skip the search
+        raise ValueError(f"Tuning failed for {ticker}: every config's fit failed")
+    default = normalize_config(DEFAULT_PROPHET_CONFIG)
+    baseline = next((score for cfg, score in results if normalize_config(cfg) == default), None)
+    if baseline is None:
+        baseline = evaluate_config(DEFAULT_PROPHET_CONFIG, prophet_df)[1]
+    record = {
+        "ticker": ticker,
+        "config": best_config,
+        "config_key": config_key(best_config),
+        "metric": "rmse",
+        "score": round(best_score, 4),
+        "baseline_score": round(baseline, 4) if math.isfinite(baseline) else None,
+        "fingerprint": fingerprint,
+        "n_obs": len(prophet_df),
+        "folds": CV_FOLDS,
+        "horizon": CV_HORIZON,
+        "grid_size": len(configs),
+        "searched_at": started.isoformat(),
+        "duration_sec": round((datetime.utcnow() - started).total_seconds(), 1),
+    }
+    path = save_best_config(ticker, record)
+    logger.info("Best Prophet config for %s (rmse %.2f vs default %s) -> %s",
+                ticker, best_score, record["baseline_score"], path)
+    return record
+
+
+def run_tuning_job(tickers: Optional[List[str]] = None, period: str = "2y",
+                   workers: Optional[int] = None, force: bool = False) -> List[Dict]:
+    """Nightly entry point: fetch history for each ticker and search (scheduler / CLI)."""
+    from services.data_fetcher import DataFetcher
+    from app.ml.forecast import ForecastService
+
+    fetcher = DataFetcher()
+    out = []
+    for ticker in tickers or settings.FORECAST_TUNING_TICKERS.split(","):
+        ticker = ticker.strip()
+        try:
+            hist = fetcher.get_historical_dataframe(ticker, period=period)
+            prophet_df = ForecastService(ticker=ticker).prepare_data(hist)
+            out.append(search(ticker, prophet_df, workers=workers, force=force))
+        except Exception as e:
+            logger.warning("Tuning failed for %s: %s", ticker, e)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Prophet hyperparameter search (offline).")
+    parser.add_argument("--ticker", action="append", help="Ticker(s); default FORECAST_TUNING_TICKERS")
+    parser.add_argument("--period", default="2y")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Search even if data is unchanged")
+    args = parser.parse_args(argv)
+    for record in run_tuning_job(args.ticker, args.period, args.workers, args.force):
+        print(json.dumps(record, indent=2))
+
+
+if __name__ == "__main__":
+    main()
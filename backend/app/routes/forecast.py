@@ -1,31 +1,52 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
 from app.services import data_router
 from app.services import DataFetcher
-from app.ml.forecast import ForecastService, get_model_metrics
+from app.ml.forecast import ForecastService, get_model_metrics, DEFAULT_HORIZON, FORECAST_HORIZONS
 from app.schemas.forecast import ForecastResponse, ModelMetricsResponse
+from app.utils.forecast_payload import FORECAST_FORMATS, points_to_columns
 
 router = APIRouter()
 _data_fetcher = DataFetcher() if DataFetcher else None
 forecaster = ForecastService()
 
 @router.get("/forecast", response_model=ForecastResponse)
-def get_forecast():
+def get_forecast(
+    horizon: int = Query(DEFAULT_HORIZON, description="Days ahead: 1 | 7 | 30 | 90"),
+    format: str = Query("points", description="points | columnar (parallel arrays for charts)"),
+    db: Session = Depends(get_db),
+):
+    if horizon not in FORECAST_HORIZONS:
+        raise HTTPException(status_code=400, detail=f"horizon must be one of {list(FORECAST_HORIZONS)}")
+    if format not in FORECAST_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(FORECAST_FORMATS)}")
     try:
         payload = data_router.get_forecast(
             data_fetcher=_data_fetcher,
             forecaster=forecaster,
+            db=db,
+            horizon=horizon,
+            columnar=format == "columnar",
         )
+        columnar = format == "columnar"
         return ForecastResponse(
             status=payload.get("status", "success"),
-            forecast=payload["forecast"],
+            forecast=[] if columnar else payload["forecast"],
+            # Sample payloads only carry points
+            columns=(payload.get("columns") or points_to_columns(payload["forecast"])) if columnar else None,
             summary=payload.get("summary"),
             forecast_score=payload.get("forecast_score"),
             current_value=payload.get("current_value"),
             model=payload.get("model", "Facebook Prophet"),
             note=payload.get("note"),
+            horizon=payload.get("horizon", horizon),
             uptrend_probability=payload.get("uptrend_probability"),
             downtrend_probability=payload.get("downtrend_probability"),
+            drawdown_probability=payload.get("drawdown_probability"),
+            quantile_bands=payload.get("quantile_bands"),
             confidence_level=payload.get("confidence_level"),
+            model_version=payload.get("model_version"),
             data_source=payload.get("data_source"),
             demo_mode=payload.get("demo_mode"),
             sample_data_date=payload.get("sample_data_date"),
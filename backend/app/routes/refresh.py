@@ -4,11 +4,14 @@ from sqlalchemy.orm import Session
 from app.schemas.common import RefreshResponse
 from app.database import get_db
 from app.database import crud
-from app.services import DataFetcher
+from app.services import DataFetcher, data_router
+from app.services.news_pipeline import run_news_sentiment
 from app.sentiment import SentimentService
+from app.sentiment.backends import scoring_version
 from app.ml.stability import StabilityScoreService
 from app.ml.forecast import ForecastService
-from app.utils.stability_helpers import inflation_score_0_100, liquidity_score_0_100
+from app.utils.macro import macro_value
+from app.utils.stability_helpers import inflation_score_0_100
 from app.utils.stability_cache import update_stability_cache, get_stability_cache
 
 router = APIRouter()
@@ -20,6 +23,7 @@ forecaster = ForecastService()
 def do_refresh(db: Session) -> dict:
     """Core refresh logic (call from route or scheduler)."""
     market_stored = sentiment_stored = stability_stored = False
+    pipeline_stats = None
     today = date.today()
 
     try:
@@ -41,10 +45,9 @@ def do_refresh(db: Session) -> dict:
         pass
 
     try:
-        headlines = data_fetcher.fetch_news_headlines("India economy RBI inflation", max_results=20)
-        if headlines:
-            results = sentiment_svc.analyze_batch_weighted(headlines)
-            agg = sentiment_svc.get_aggregate_weighted(results, headlines)
+        # Streams fetch -> dedup -> score -> weight into a running aggregate + sentiment_articles
+        agg, pipeline_stats = run_news_sentiment(data_fetcher, db=db)
+        if agg["total_articles"]:
             score = sentiment_svc.normalize_score(agg)
             crud.create_sentiment_score(
                 db, today, score,
@@ -53,6 +56,7 @@ def do_refresh(db: Session) -> dict:
                 negative_count=agg.get("negative_count", 0),
                 total_articles=agg.get("total_articles", 0),
                 raw_aggregate=agg,
+                analyzer_version=scoring_version(),
             )
             sentiment_stored = True
             update_stability_cache(50.0, score, None)
@@ -62,20 +66,18 @@ def do_refresh(db: Session) -> dict:
     try:
         nifty_df = data_fetcher.get_historical_dataframe("^NSEI", "3mo")
         if not nifty_df.empty and len(nifty_df) >= 30:
-            if not forecaster.is_trained:
-                forecaster.train_model(nifty_df)
-            forecast_df = forecaster.forecast(days=7)
-            up_prob, down_prob = forecaster.get_uptrend_downtrend_probability(forecast_df)
-            current_val = float(nifty_df["Close"].iloc[-1])
-            vol = nifty_df["Close"].pct_change().std() * 100 if len(nifty_df) > 1 else None
-            update_stability_cache(up_prob, 50.0, vol)
+            # Daily refit; warm-started from yesterday's parameters after the first run
+            forecaster.train_model(nifty_df)
+            # Persists the run to forecast_history, folds closes/volumes into volatility_daily and
+            # liquidity_daily, and updates the stability cache
+            data_router.build_live_forecast(forecaster, nifty_df, db=db)
         cache = get_stability_cache()
         res = stability_svc.calculate(
             market_momentum_score=cache.get("forecast_score") or 50,
             sentiment_score=cache.get("sentiment_score") or 50,
             volatility_inverse_score=cache.get("volatility") or 50,
-            inflation_score=inflation_score_0_100(None),
-            liquidity_score=liquidity_score_0_100(None),
+            inflation_score=inflation_score_0_100(macro_value("inflation", today)),
+            liquidity_score=data_router.current_liquidity_score(db, today),
         )
         crud.create_stability_history(
             db, today,
@@ -95,6 +97,7 @@ def do_refresh(db: Session) -> dict:
         "market_stored": market_stored,
         "sentiment_stored": sentiment_stored,
         "stability_stored": stability_stored,
+        "sentiment_pipeline": pipeline_stats,
     }
 
 
@@ -1,20 +1,86 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 from typing import Optional
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from app.database import crud, get_db
 from app.services import data_router
 from app.sentiment import SentimentService
-from app.schemas.sentiment import SentimentResponse, SentimentArticle
+from app.schemas.sentiment import (
+    SentimentResponse,
+    SentimentArticle,
+    SentimentHistoryPoint,
+    SentimentHistoryResponse,
+)
 from app.utils.stability_cache import update_stability_cache
 
 router = APIRouter()
 sentiment_svc = SentimentService()
 
+def _stored_sentiment(
+    db: Session,
+    sentiment: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    limit: int,
+    cursor: Optional[str],
+) -> SentimentResponse:
+    """
+    Filtered sentiment from sentiment_articles (index lookups, full history). The
+    aggregate scans the whole filtered range, so only the first page (no cursor)
+    carries it; later pages return articles only.
+    """
+    try:
+        rows, next_cursor = crud.get_sentiment_articles_page(db, sentiment, date_from, date_to, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    aggregate = None if cursor else crud.get_sentiment_articles_aggregate(db, sentiment, date_from, date_to)
+    articles = [
+        SentimentArticle(
+            title=r.title,
+            source=r.source or "Unknown",
+            link=r.link or "#",
+            sentiment={
+                "compound": r.compound,
+                "positive": r.positive,
+                "neutral": r.neutral,
+                "negative": r.negative,
+                "label": r.label,
+                "weight": r.weight,
+            },
+            published=r.published_at.isoformat() if r.published_at else None,
+            weight=r.weight,
+        )
+        for r in rows
+    ]
+    return SentimentResponse(
+        sentiment_score=None if aggregate is None else sentiment_svc.normalize_score(aggregate),
+        aggregate=aggregate,
+        articles=articles,
+        analyzer=sentiment_svc.analyzer_name,
+        filters_applied={
+            "sentiment": sentiment,
+            "date_from": str(date_from) if date_from else None,
+            "date_to": str(date_to) if date_to else None,
+        },
+        data_source="database",
+        demo_mode=False,
+        next_cursor=next_cursor,
+    )
+
+
 @router.get("/sentiment", response_model=SentimentResponse)
 def get_sentiment(
     sentiment: Optional[str] = Query(None, description="Filter: positive | negative | neutral"),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
+    limit: int = Query(20, ge=1, le=200, description="Page size for stored (filtered) results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
 ):
+    # Filtered / paged requests read the stored article history; the plain
+    # request (and a fresh install with nothing stored yet) scores live headlines.
+    if (sentiment or date_from or date_to or cursor) and crud.has_sentiment_articles(db):
+        return _stored_sentiment(db, sentiment, date_from, date_to, limit, cursor)
     try:
         df = datetime.combine(date_from, datetime.min.time()) if date_from else None
         dt_end = datetime.combine(date_to, datetime.max.time()) if date_to else None
@@ -42,3 +108,35 @@ def get_sentiment(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sentiment/history", response_model=SentimentHistoryResponse)
+def get_sentiment_history(
+    grain: str = Query("day", description="day | week | month"),
+    date_from: Optional[date] = Query(None, description="Default: one year before date_to"),
+    date_to: Optional[date] = Query(None, description="Default: today"),
+    db: Session = Depends(get_db),
+):
+    """Sentiment trend from the precomputed sentiment_rollups (one row per period)."""
+    if grain not in crud.ROLLUP_GRAINS:
+        raise HTTPException(status_code=400, detail=f"grain must be one of {list(crud.ROLLUP_GRAINS)}")
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=365)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    rows = crud.get_sentiment_rollups(db, grain, date_from, date_to)
+    points = [
+        SentimentHistoryPoint(
+            period_start=r.period_start,
+            score=round(r.weighted_sum / r.weight_total, 2) if r.weight_total else None,
+            min_score=r.min_score,
+            max_score=r.max_score,
+            positive_count=r.positive_count or 0,
+            neutral_count=r.neutral_count or 0,
+            negative_count=r.negative_count or 0,
+            total_articles=r.total_articles or 0,
+            refreshes=r.score_count or 0,
+        )
+        for r in rows
+    ]
+    return SentimentHistoryResponse(grain=grain, date_from=date_from, date_to=date_to, points=points)
@@ -1,23 +1,37 @@
-from fastapi import APIRouter, Query
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
+from app.config import settings
 from app.services import data_router
+from app.services.scenario_service import evaluate_scenarios
 from app.ml.stability import StabilityScoreService
 from app.utils.stability_cache import get_stability_cache
-from app.schemas.stability import StabilityResponse, StabilityComponents
+from app.schemas.stability import StabilityResponse, StabilityComponents, ScenarioRequest, ScenarioResponse
 
 router = APIRouter()
 stability_svc = StabilityScoreService()
 
+def _check_profile(profile: Optional[str]) -> None:
+    if profile:
+        try:
+            stability_svc.get_profile(profile)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/stability-score", response_model=StabilityResponse)
 def get_stability_score(
     inflation_rate: Optional[float] = Query(None),
     repo_rate: Optional[float] = Query(None),
+    profile: Optional[str] = Query(None, description="Weight profile (default settings.STABILITY_PROFILE)"),
 ):
+    _check_profile(profile)
     payload = data_router.get_stability(
         stability_svc=stability_svc,
         cache_getter=get_stability_cache,
         inflation_rate=inflation_rate,
         repo_rate=repo_rate,
+        profile=profile,
     )
     return StabilityResponse(
         status=payload.get("status", "success"),
@@ -27,9 +41,28 @@ def get_stability_score(
         explanation=payload["explanation"],
         components=StabilityComponents(**payload["components"]),
         breakdown=payload.get("breakdown"),
+        profile=payload.get("profile"),
         timestamp=payload["timestamp"],
         disclaimer=payload.get("disclaimer"),
         data_source=payload.get("data_source"),
         demo_mode=payload.get("demo_mode"),
         sample_data_date=payload.get("sample_data_date"),
     )
+
+
+@router.post("/stability-score/scenarios", response_model=ScenarioResponse)
+def evaluate_stability_scenarios(req: ScenarioRequest):
+    """Score a grid of what-if scenarios in one vectorized pass; columnar output."""
+    _check_profile(req.profile)
+    baseline = data_router.live_stability_inputs(get_stability_cache)
+    if req.baseline is not None:
+        baseline.update(req.baseline.model_dump(exclude_none=True))
+    axes = {name: getattr(req, name) for name in
+            ("market_momentum", "sentiment_shock", "volatility_inverse", "inflation_rate", "liquidity")}
+    axes["weights"] = None if req.weights is None else [w.model_dump() for w in req.weights]
+    try:
+        result = evaluate_scenarios(baseline, axes, stability_svc, explain=req.explain,
+                                    max_rows=settings.STABILITY_SCENARIO_MAX_ROWS, profile=req.profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ScenarioResponse(timestamp=datetime.utcnow().isoformat(), **result)
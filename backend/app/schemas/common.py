@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class HealthResponse(BaseModel):
@@ -15,3 +15,4 @@ class RefreshResponse(BaseModel):
     market_stored: bool = False
     sentiment_stored: bool = False
     stability_stored: bool = False
+    sentiment_pipeline: Optional[Dict[str, Any]] = None  # per-stage throughput counters
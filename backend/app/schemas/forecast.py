@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ForecastPoint(BaseModel):
@@ -18,9 +18,14 @@ class ForecastResponse(BaseModel):
     current_value: Optional[float] = None
     model: str = "Facebook Prophet"
     note: Optional[str] = None
+    horizon: Optional[int] = None
     uptrend_probability: Optional[float] = None
     downtrend_probability: Optional[float] = None
+    drawdown_probability: Optional[float] = None
+    quantile_bands: Optional[Dict[str, List[float]]] = None
+    columns: Optional[Dict[str, list]] = None  # format=columnar: dates/predicted/upper/lower/confidence
     confidence_level: Optional[str] = None
+    model_version: Optional[str] = None
     data_source: Optional[str] = None
     demo_mode: Optional[bool] = None
     sample_data_date: Optional[str] = None
@@ -14,14 +14,15 @@ class SentimentArticle(BaseModel):
 
 class SentimentResponse(BaseModel):
     status: str = "success"
-    sentiment_score: float
-    aggregate: dict
+    sentiment_score: Optional[float] = None  # None on stored-article pages after the first
+    aggregate: Optional[dict] = None
     articles: List[SentimentArticle]
     analyzer: str = "VADER"
     filters_applied: Optional[dict] = None
     data_source: Optional[str] = None
     demo_mode: Optional[bool] = None
     sample_data_date: Optional[str] = None
+    next_cursor: Optional[str] = None  # stored-article results only
 
     class Config:
         extra = "allow"
@@ -31,3 +32,23 @@ class SentimentFilterParams(BaseModel):
     sentiment: Optional[str] = None   # positive | negative | neutral
     date_from: Optional[date] = None
     date_to: Optional[date] = None
+
+
+class SentimentHistoryPoint(BaseModel):
+    period_start: date
+    score: Optional[float] = None     # article-weighted mean of 0-100 scores (None: no refresh)
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    positive_count: int = 0           # distinct stored articles published in the period
+    neutral_count: int = 0
+    negative_count: int = 0
+    total_articles: int = 0
+    refreshes: int = 0                # sentiment_scores rows behind score
+
+
+class SentimentHistoryResponse(BaseModel):
+    status: str = "success"
+    grain: str
+    date_from: date
+    date_to: date
+    points: List[SentimentHistoryPoint]
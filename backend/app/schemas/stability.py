@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class StabilityComponents(BaseModel):
@@ -18,9 +18,46 @@ class StabilityResponse(BaseModel):
     explanation: str
     components: StabilityComponents
     breakdown: Optional[dict] = None
+    profile: Optional[str] = None     # weight profile used
     timestamp: str
     disclaimer: Optional[str] = None
     data_source: Optional[str] = None
     demo_mode: Optional[bool] = None
-    sample_data_date: Optional[str] = None    class Config:
-        extra = "allow"
\ No newline at end of file
+    sample_data_date: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+
+class ScenarioWeights(BaseModel):
+    """One alternative weighting; omitted factors keep the profile's weight, then the set is rescaled to sum 1."""
+    market_momentum: Optional[float] = None
+    sentiment: Optional[float] = None
+    volatility_inverse: Optional[float] = None
+    inflation: Optional[float] = None
+    liquidity: Optional[float] = None
+
+
+class ScenarioRequest(BaseModel):
+    """Grid axes (Cartesian product, in this field order); factors without an axis keep the baseline."""
+    baseline: Optional[StabilityComponents] = None      # overrides of the live 0–100 inputs
+    market_momentum: Optional[List[float]] = None       # 0–100
+    sentiment_shock: Optional[List[float]] = None       # points added to baseline sentiment
+    volatility_inverse: Optional[List[float]] = None    # 0–100
+    inflation_rate: Optional[List[float]] = None        # %, mapped like /stability-score
+    liquidity: Optional[List[float]] = None             # 0–100
+    weights: Optional[List[ScenarioWeights]] = None
+    profile: Optional[str] = None                       # thresholds + default weights (settings.STABILITY_PROFILE)
+    explain: bool = False
+
+
+class ScenarioResponse(BaseModel):
+    status: str = "success"
+    count: int
+    shape: Dict[str, int]
+    baseline: StabilityComponents
+    profile: str
+    weights: Optional[List[Dict[str, float]]] = None
+    columns: Dict[str, List[Any]]
+    summary: dict
+    timestamp: str
@@ -1,15 +1,17 @@
 """
-Sentiment analysis with VADER + source credibility and recency weights.
+Sentiment analysis (VADER by default, see backends.py) + source credibility and recency weights.
 Supports filtering: positive / negative / neutral, date range.
 """
-import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Optional
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-except ImportError:
-    SentimentIntensityAnalyzer = None
+import numpy as np
+
+from app.config import settings
+from app.sentiment.backends import get_backend
+from app.sentiment.dedup import cluster_headlines, cluster_weight
+from app.sentiment.source_matcher import get_source_matcher
+from app.sentiment.timestamps import ensure_timestamps, range_mask, recency_weights, to_epoch
 
 # Source credibility weights (0–1). Higher = more trusted.
 SOURCE_WEIGHTS = {
@@ -27,61 +29,33 @@ SOURCE_WEIGHTS = {
 
 
 def _source_weight(source: str) -> float:
-    s = (source or "").lower()
-    for key, w in SOURCE_WEIGHTS.items():
-        if key in s:
-            return w
-    return 0.7
+    """First-listed outlet contained in source wins (compiled matcher, cached per source)."""
+    return get_source_matcher(SOURCE_WEIGHTS).weight(source or "")
 
 
 def _recency_weight(published: Optional[str]) -> float:
-    """Weight by recency: last 24h = 1.0, older decays."""
-    if not published:
-        return 0.8
-    try:
-        # Parse ISO or common RSS format
-        if "T" in published:
-            dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
-        else:
-            from dateutil import parser
-            dt = parser.parse(published)
-    except Exception:
-        return 0.8
-    age_hours = (datetime.utcnow() - dt.replace(tzinfo=None)).total_seconds() / 3600
-    if age_hours <= 24:
-        return 1.0
-    if age_hours <= 72:
-        return 0.9
-    if age_hours <= 168:  # 1 week
-        return 0.7
-    return 0.5
+    """Weight by recency for a single article (see timestamps.recency_weights)."""
+    return float(recency_weights(np.array([to_epoch(published)]))[0])
 
 
 class SentimentService:
-    def __init__(self):
-        self.analyzer = SentimentIntensityAnalyzer() if SentimentIntensityAnalyzer else None
+    @property
+    def analyzer_name(self) -> str:
+        """Name of the configured scoring backend (settings.SENTIMENT_ANALYZER)."""
+        return get_backend().name
 
     def clean_text(self, text: str) -> str:
-        if not text:
-            return ""
-        text = re.sub(r"http\S+|www\S+", "", text)
-        text = re.sub(r"[^\w\s]", "", text)
-        return " ".join(text.split()).strip()
+        from app.sentiment.batch import clean_text
+        return clean_text(text)
 
     def analyze_single(self, text: str) -> Dict:
-        cleaned = self.clean_text(text)
-        if not self.analyzer or not cleaned:
-            return {"compound": 0.0, "positive": 0.0, "neutral": 1.0, "negative": 0.0, "label": "neutral"}
-        scores = self.analyzer.polarity_scores(cleaned)
-        c = scores["compound"]
-        label = "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
-        return {
-            "compound": round(c, 3),
-            "positive": round(scores["pos"], 3),
-            "neutral": round(scores["neu"], 3),
-            "negative": round(scores["neg"], 3),
-            "label": label,
-        }
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        """analyze_single over many texts in one backend call (VADER: large inputs use a process pool)."""
+        # Imported here so `python -m app.sentiment.batch` does not load batch twice
+        from app.sentiment.batch import clean_text, format_scores
+        return [format_scores(s) for s in get_backend().score([clean_text(t) for t in texts])]
 
     def analyze_batch_weighted(
         self,
@@ -89,16 +63,40 @@ class SentimentService:
         title_key: str = "title",
         source_key: str = "source",
         published_key: str = "published",
+        dedup: Optional[bool] = None,
     ) -> List[Dict]:
-        """Each article: {title, source, published?, ...}. Returns list of sentiment dicts with weight."""
+        """
+        Each article: {title, source, published?, published_ts?, ...}. Returns list of
+        sentiment dicts with weight. Timestamps are parsed at most once per article.
+
+        With dedup (default settings.SENTIMENT_DEDUP_ENABLED) near-duplicate headlines
+        are clustered and only the first of each cluster is scored; it carries
+        cluster_size and weight × (1 + ln size), the others copy its sentiment with
+        duplicate_of=<index of representative> and weight 0.
+        """
+        titles = [a.get(title_key, "") for a in articles]
+        sources = [a.get(source_key, "") for a in articles]
+        w_rec = recency_weights(ensure_timestamps(articles, published_key))
+        if dedup is None:
+            dedup = settings.SENTIMENT_DEDUP_ENABLED
+        if not dedup or len(articles) < 2:
+            scored = self.analyze_batch(titles)
+            for src, sent, w in zip(sources, scored, w_rec):
+                sent["weight"] = round(_source_weight(src) * float(w), 3)
+            return scored
+
+        labels, reps = cluster_headlines(titles, sources, threshold=settings.SENTIMENT_DEDUP_THRESHOLD)
+        rep_scores = self.analyze_batch([titles[i] for i in reps])
+        sizes = np.bincount(labels, minlength=len(reps))
         results = []
-        for a in articles:
-            title = a.get(title_key, "")
-            sent = self.analyze_single(title)
-            w_src = _source_weight(a.get(source_key, ""))
-            w_rec = _recency_weight(a.get(published_key))
-            weight = w_src * w_rec
-            sent["weight"] = round(weight, 3)
+        for i, cid in enumerate(labels):
+            sent = dict(rep_scores[cid])
+            if reps[cid] == i:
+                sent["cluster_size"] = int(sizes[cid])
+                sent["weight"] = round(_source_weight(sources[i]) * float(w_rec[i]) * cluster_weight(sizes[cid]), 3)
+            else:
+                sent["duplicate_of"] = reps[cid]
+                sent["weight"] = 0.0
             results.append(sent)
         return results
 
@@ -111,12 +109,15 @@ class SentimentService:
                 "negative_count": 0,
                 "overall_label": "neutral",
                 "total_articles": 0,
+                "duplicates_collapsed": 0,
             }
-        weights = [r.get("weight", 1.0) for r in results]
-        compounds = [r["compound"] for r in results]
+        # Near-duplicates (duplicate_of set) are represented by their cluster's first article
+        unique = [r for r in results if "duplicate_of" not in r]
+        weights = [r.get("weight", 1.0) for r in unique]
+        compounds = [r["compound"] for r in unique]
         total_w = sum(weights) or 1
         avg_compound = sum(c * w for c, w in zip(compounds, weights)) / total_w
-        labels = [r["label"] for r in results]
+        labels = [r["label"] for r in unique]
         if avg_compound >= 0.05:
             overall_label = "positive"
         elif avg_compound <= -0.05:
@@ -129,7 +130,8 @@ class SentimentService:
             "neutral_count": labels.count("neutral"),
             "negative_count": labels.count("negative"),
             "overall_label": overall_label,
-            "total_articles": len(results),
+            "total_articles": len(unique),
+            "duplicates_collapsed": len(results) - len(unique),
         }
 
     def normalize_score(self, aggregate: Dict) -> float:
@@ -138,6 +140,19 @@ class SentimentService:
         score = (c + 1) / 2 * 100
         return round(min(100, max(0, score)), 2)
 
+    def filter_by_date(
+        self,
+        articles: List[Dict],
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        published_key: str = "published",
+    ) -> List[Dict]:
+        """Articles published within [date_from, date_to] (unknown dates pass); apply before scoring."""
+        if not (date_from or date_to):
+            return articles
+        keep = np.flatnonzero(range_mask(ensure_timestamps(articles, published_key), date_from, date_to))
+        return [articles[i] for i in keep]
+
     def filter_articles(
         self,
         articles: List[Dict],
@@ -146,27 +161,48 @@ class SentimentService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
     ) -> tuple:
-        """Filter (articles, results) by sentiment (positive/negative/neutral) and date range."""
-        out_arts = []
-        out_res = []
-        for i, (a, r) in enumerate(zip(articles, sentiment_results)):
-            if sentiment_filter and r.get("label") != sentiment_filter:
-                continue
-            pub = a.get("published")
-            if date_from or date_to:
-                try:
-                    if "T" in str(pub):
-                        dt = datetime.fromisoformat(str(pub).replace("Z", "+00:00"))
-                    else:
-                        from dateutil import parser
-                        dt = parser.parse(str(pub))
-                    dt = dt.replace(tzinfo=None)
-                    if date_from and dt < date_from:
-                        continue
-                    if date_to and dt > date_to:
-                        continue
-                except Exception:
-                    pass
-            out_arts.append(a)
-            out_res.append(r)
-        return out_arts, out_res
+        """
+        Filter (articles, results) by sentiment (positive/negative/neutral) and date range.
+        Near-duplicate clusters are re-indexed to the filtered list (see _reindex_clusters).
+        """
+        mask = np.ones(len(articles), dtype=bool)
+        if sentiment_filter:
+            mask &= np.array([r.get("label") == sentiment_filter for r in sentiment_results], dtype=bool)
+        if date_from or date_to:
+            mask &= range_mask(ensure_timestamps(articles), date_from, date_to)
+        keep = np.flatnonzero(mask)
+        return [articles[i] for i in keep], _reindex_clusters(sentiment_results, keep)
+
+
+def _reindex_clusters(results: List[Dict], keep) -> List[Dict]:
+    """
+    Clustered results (analyze_batch_weighted) at the kept indices, with duplicate_of
+    pointing into the filtered list. Each cluster's representative (its original one
+    if kept, else its first kept member) carries the kept cluster_size, with the
+    cluster factor of the original representative's weight rescaled to it.
+    """
+    keep = [int(i) for i in keep]
+    new_pos = {old: new for new, old in enumerate(keep)}
+    out = [results[i] for i in keep]
+    clusters: Dict[int, List[int]] = {}
+    for new, old in enumerate(keep):
+        r = results[old]
+        rep = r.get("duplicate_of", old if "cluster_size" in r else None)
+        if rep is not None:
+            clusters.setdefault(rep, []).append(new)
+    for old_rep, members in clusters.items():
+        rep_new = new_pos.get(old_rep, members[0])
+        original = results[old_rep]
+        size = len(members)
+        for new in members:
+            sent = dict(out[new])
+            if new == rep_new:
+                sent.pop("duplicate_of", None)
+                sent["weight"] = round(
+                    original.get("weight", 0.0) / cluster_weight(original["cluster_size"]) * cluster_weight(size), 3)
+                sent["cluster_size"] = size
+            else:
+                sent["duplicate_of"] = rep_new
+                sent["weight"] = 0.0
+            out[new] = sent
+    return out
@@ -0,0 +1,107 @@
+"""
+Pluggable sentiment scorers.
+
+Every backend scores a batch of cleaned texts and returns, per text,
+(compound, pos, neu, neg) or None for empty text – the tuple format of
+batch.polarity_scores – so callers format, label and weight results the same
+way whichever model produced them.
+
+  vader   VADER lexicon, process-parallel for large batches (default)
+  linear  hashing features + logistic regression (app/sentiment/linear_model.py),
+          loaded from settings.SENTIMENT_MODEL_PATH
+
+get_backend() returns the configured backend, built once; the linear model is
+reloaded when its file changes and falls back to VADER if it cannot be loaded.
+scoring_version() tags stored scores so a rescoring job can find stale rows.
+"""
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.log import get_logger
+
+# (compound, pos, neu, neg) or None for empty text – same as batch.Scores
+Scores = Optional[Tuple[float, float, float, float]]
+
+logger = get_logger(__name__)
+
+ANALYZERS = ("vader", "linear")
+
+
+class SentimentBackend(ABC):
+    """Interface: name (shown in API payloads), version (stored with scores), score()."""
+
+    name = "base"
+    version = "base"
+
+    @abstractmethod
+    def score(self, texts: Sequence[str]) -> List[Scores]:
+        """Scores per text, in order (None for empty text)."""
+
+
+class VaderBackend(SentimentBackend):
+    name = "VADER"
+    version = "vader"
+
+    def score(self, texts: Sequence[str]) -> List[Scores]:
+        from app.sentiment.batch import polarity_scores  # lazy: keeps `python -m app.sentiment.batch` clean
+        return polarity_scores(texts, clean=False)
+
+
+_backend: Optional[SentimentBackend] = None
+_backend_key: Optional[Tuple] = None
+_backend_lock = threading.Lock()
+
+
+def _key(name: str) -> Tuple:
+    if name != "linear":
+        return (name,)
+    path = settings.SENTIMENT_MODEL_PATH
+    try:
+        return (name, path, os.stat(path).st_mtime)
+    except OSError:
+        return (name, path, None)
+
+
+def get_backend(name: Optional[str] = None) -> SentimentBackend:
+    """Shared backend for name (default settings.SENTIMENT_ANALYZER)."""
+    global _backend, _backend_key
+    name = (name or settings.SENTIMENT_ANALYZER or "vader").lower()
+    key = _key(name)
+    with _backend_lock:
+        if _backend is not None and key == _backend_key:
+            return _backend
+        backend: SentimentBackend = VaderBackend()
+        if name == "linear":
+            try:
+                from app.sentiment.linear_model import LinearSentimentModel
+                backend = LinearSentimentModel.load(settings.SENTIMENT_MODEL_PATH)
+                logger.info("Loaded sentiment model %s (%s)", settings.SENTIMENT_MODEL_PATH, backend.version)
+            except Exception as e:
+                logger.warning("Sentiment model %r unavailable, using VADER: %s", settings.SENTIMENT_MODEL_PATH, e)
+        elif name not in ANALYZERS:
+            logger.warning("Unknown SENTIMENT_ANALYZER %r, using VADER", name)
+        _backend, _backend_key = backend, key
+        return backend
+
+
+def scoring_version(weighted: bool = True) -> str:
+    """
+    Version of everything that determines a stored score: the backend version and,
+    if weighted, a hash of the source-weight table and recency settings.
+    """
+    version = get_backend().version
+    if not weighted:
+        return version
+    from app.sentiment.analyzer import SOURCE_WEIGHTS
+    from app.sentiment.source_matcher import get_source_matcher
+    matcher = get_source_matcher(SOURCE_WEIGHTS)
+    raw = json.dumps([
+        list(zip(matcher.names, matcher.weights)), matcher.default,
+        settings.SENTIMENT_RECENCY_MODE, settings.SENTIMENT_RECENCY_HALF_LIFE_HOURS,
+    ])
+    return f"{version}+w{hashlib.sha1(raw.encode()).hexdigest()[:8]}"
@@ -0,0 +1,254 @@
+"""
+Process-parallel VADER scoring for large headline sets.
+
+Small batches (under settings.SENTIMENT_PARALLEL_MIN) are scored in the calling
+process. Larger ones are split into chunks and scored across a shared process
+pool; each worker builds one SentimentIntensityAnalyzer in its initializer.
+Results always come back in input order.
+
+CLI (from backend root) – streams records in, scored records out:
+    python -m app.sentiment.batch headlines.csv -o scored.jsonl --text-column title --workers 8
+    cat archive.jsonl | python -m app.sentiment.batch - --format jsonl > scored.jsonl
+"""
+import argparse
+import atexit
+import csv
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.log import get_logger
+
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
+
+logger = get_logger(__name__)
+
+# (compound, pos, neu, neg) or None for empty / unscorable text
+Scores = Optional[Tuple[float, float, float, float]]
+
+_URL_RE = re.compile(r"http\S+|www\S+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def clean_text(text: str) -> str:
+    """Strip URLs and punctuation, collapse whitespace (same as SentimentService.clean_text)."""
+    if not text:
+        return ""
+    text = _URL_RE.sub("", text)
+    text = _PUNCT_RE.sub("", text)
+    return " ".join(text.split()).strip()
+
+
+def format_scores(scores: Scores) -> Dict:
+    """v2 sentiment dict: compound/positive/neutral/negative rounded to 3 dp + label."""
+    if scores is None:
+        return {"compound": 0.0, "positive": 0.0, "neutral": 1.0, "negative": 0.0, "label": "neutral"}
+    c, pos, neu, neg = scores
+    label = "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
+    return {
+        "compound": round(c, 3),
+        "positive": round(pos, 3),
+        "neutral": round(neu, 3),
+        "negative": round(neg, 3),
+        "label": label,
+    }
+
+
+# ---------- Worker side ----------
+_analyzer = None
+
+
+def _init_worker() -> None:
+    global _analyzer
+    _analyzer = SentimentIntensityAnalyzer()
+
+
+def _score_chunk(texts: Sequence[str], clean: bool = True) -> List[Scores]:
+    if _analyzer is None:
+        _init_worker()
+    out: List[Scores] = []
+    for text in texts:
+        if clean:
+            text = clean_text(text)
+        if not text:
+            out.append(None)
+            continue
+        s = _analyzer.polarity_scores(text)
+        out.append((s["compound"], s["pos"], s["neu"], s["neg"]))
+    return out
+
+
+def _score_chunk_clean(texts: Sequence[str]) -> List[Scores]:
+    return _score_chunk(texts, clean=True)
+
+
+def _score_chunk_raw(texts: Sequence[str]) -> List[Scores]:
+    return _score_chunk(texts, clean=False)
+
+
+# ---------- Shared pool ----------
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    workers = workers if workers is not None else settings.SENTIMENT_BATCH_WORKERS
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool reused across calls (worker start-up and analyzer load are paid once)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _pool_workers = workers
+        return _pool
+
+
+@atexit.register
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def polarity_scores(
+    texts: Sequence[str],
+    clean: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_parallel: Optional[int] = None,
+) -> List[Scores]:
+    """
+    VADER (compound, pos, neu, neg) per text, in input order; None where the
+    (cleaned) text is empty. Falls back to in-process scoring for small inputs,
+    a single worker, or when the pool cannot be used.
+    """
+    if SentimentIntensityAnalyzer is None:
+        return [None] * len(texts)
+    texts = list(texts)
+    workers = _resolve_workers(workers)
+    min_parallel = settings.SENTIMENT_PARALLEL_MIN if min_parallel is None else min_parallel
+    if workers <= 1 or len(texts) < max(min_parallel, 2):
+        return _score_chunk(texts, clean=clean)
+    chunk_size = chunk_size or max(1, min(settings.SENTIMENT_BATCH_CHUNK, -(-len(texts) // workers)))
+    fn = _score_chunk_clean if clean else _score_chunk_raw
+    try:
+        out: List[Scores] = []
+        for part in _get_pool(workers).map(fn, _chunks(texts, chunk_size)):
+            out.extend(part)
+        return out
+    except Exception as e:  # broken pool, pickling, fork limits...
+        logger.warning("Parallel sentiment scoring failed, scoring in-process: %s", e)
+        shutdown_pool()
+        return _score_chunk(texts, clean=clean)
+
+
+def analyze_texts(texts: Sequence[str], **kwargs) -> List[Dict]:
+    """Cleaned + scored v2 sentiment dicts (see format_scores), in input order."""
+    return [format_scores(s) for s in polarity_scores(texts, clean=True, **kwargs)]
+
+
+# ---------- Streaming CLI ----------
+def _read_records(stream, fmt: str) -> Iterator[Dict]:
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _blocks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    block: List[Dict] = []
+    for r in records:
+        block.append(r)
+        if len(block) >= size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def score_stream(
+    records: Iterable[Dict],
+    text_column: str = "headline",
+    workers: Optional[int] = None,
+    block_size: int = 20_000,
+) -> Iterator[Dict]:
+    """
+    Score an iterable of records lazily, block by block (memory stays bounded by
+    block_size). Yields each record with compound/positive/neutral/negative/label added.
+    """
+    for block in _blocks(records, block_size):
+        scores = polarity_scores([str(r.get(text_column) or "") for r in block], workers=workers,
+                                 min_parallel=0)
+        for r, s in zip(block, scores):
+            out = dict(r)
+            out.update(format_scores(s))
+            yield out
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Batch VADER scoring of headline archives.")
+    parser.add_argument("input", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.csv or .jsonl), default stdout JSONL")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Output format (default: from extension)")
+    parser.add_argument("--text-column", default="headline")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--block-size", type=int, default=20_000, help="Records held in memory at once")
+    args = parser.parse_args(argv)
+
+    in_fmt = _detect_format(args.input, args.format)
+    out_fmt = _detect_format(args.output, args.output_format)
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    n = 0
+    try:
+        writer = None
+        for rec in score_stream(_read_records(src, in_fmt), args.text_column, args.workers, args.block_size):
+            if out_fmt == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(dst, fieldnames=list(rec), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(rec)
+            else:
+                dst.write(json.dumps(rec, default=str) + "\n")
+            n += 1
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    logger.info("Scored %d records", n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Near-duplicate headline clustering: MinHash signatures + LSH banding.
+
+Syndicated stories ("Sensex jumps 500 pts as banks rally - Mint" /
+"Sensex jumps 500 points as banks rally - Economic Times") land in the same
+cluster so they are scored once and weighted by cluster size instead of
+counted many times. Each headline is compared only with the clusters that share
+an LSH band bucket, so insertion cost does not grow with the number of
+clusters; candidates are confirmed by exact token-set Jaccard.
+
+With NUM_PERM=64 split into BANDS=16 bands of 4 rows, a pair with Jaccard 0.7
+becomes a candidate with probability ~0.99, a pair at 0.3 with ~0.12.
+
+With max_clusters the index keeps only the most recently created clusters: the
+oldest is dropped from its buckets (and reported to on_evict with its final
+size), so a long feed runs in bounded memory and a story only merges with
+clusters still held.
+"""
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.6  # token-set Jaccard to join a cluster
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240601)  # fixed: signatures comparable across runs
+_A = _rng.integers(1, (1 << 31) - 1, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, (1 << 31) - 1, NUM_PERM, dtype=np.uint64)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and as at by for from in is of on or the to with".split())
+
+
+def cluster_weight(size: int) -> float:
+    """Aggregate weight multiplier for a story reported `size` times: 1 + ln(size)."""
+    return 1.0 + math.log(max(1, size))
+
+
+def headline_tokens(text: str, source: Optional[str] = None) -> FrozenSet[str]:
+    """Lowercase word set without stopwords and without a trailing ' - <source>' suffix."""
+    text = (text or "").lower()
+    if source:
+        suffix = " - " + source.lower()
+        if text.endswith(suffix):
+            text = text[: -len(suffix)]
+    elif " - " in text:
+        text = text.rsplit(" - ", 1)[0]
+    return frozenset(t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little") & 0x7FFFFFFF
+
+
+def minhash(tokens: FrozenSet[str]) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of a token set (all perms in one numpy op)."""
+    if not tokens:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    x = np.fromiter((_token_hash(t) for t in tokens), dtype=np.uint64, count=len(tokens))
+    return ((np.outer(x, _A) + _B) % _PRIME).min(axis=0)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental clusterer. add() returns (cluster_id, is_new); the first headline
+    of a cluster is its representative. Cluster ids count up from 0; sizes maps
+    the ids still held to their size.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        bands: int = BANDS,
+        max_clusters: Optional[int] = None,
+        on_evict: Optional[Callable[[int, int], None]] = None,
+    ):
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide NUM_PERM ({NUM_PERM})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.max_clusters = max_clusters
+        self.on_evict = on_evict
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._live: "OrderedDict[int, Tuple[FrozenSet[str], List[bytes]]]" = OrderedDict()  # rep tokens, band keys
+        self.sizes: Dict[int, int] = {}
+        self.clusters = 0   # created so far, evicted ones included
+        self.added = 0      # headlines added so far
+
+    def __len__(self) -> int:
+        return self.clusters
+
+    @property
+    def duplicates(self) -> int:
+        return self.added - self.clusters
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _evict_oldest(self) -> None:
+        cid, (_tokens, keys) = self._live.popitem(last=False)
+        for band, key in enumerate(keys):
+            bucket = self._buckets[band][key]
+            bucket.remove(cid)
+            if not bucket:
+                del self._buckets[band][key]
+        size = self.sizes.pop(cid)
+        if self.on_evict is not None:
+            self.on_evict(cid, size)
+
+    def add(self, text: str, source: Optional[str] = None) -> Tuple[int, bool]:
+        tokens = headline_tokens(text, source)
+        keys = self._band_keys(minhash(tokens))
+        self.added += 1
+        seen = set()
+        for band, key in enumerate(keys):
+            for cid in self._buckets[band].get(key, ()):
+                if cid in seen:
+                    continue
+                seen.add(cid)
+                if jaccard(tokens, self._live[cid][0]) >= self.threshold:
+                    self.sizes[cid] += 1
+                    return cid, False
+        cid = self.clusters
+        self.clusters += 1
+        self._live[cid] = (tokens, keys)
+        self.sizes[cid] = 1
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(cid)
+        if self.max_clusters is not None and len(self._live) > self.max_clusters:
+            self._evict_oldest()
+        return cid, True
+
+
+def cluster_headlines(
+    texts: Sequence[str],
+    sources: Optional[Sequence[str]] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[List[int], List[int]]:
+    """
+    (cluster id per text, representative index per cluster). The representative
+    is the first occurrence of each cluster.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    labels, reps = [], []
+    for i, text in enumerate(texts):
+        cid, is_new = index.add(text, sources[i] if sources else None)
+        labels.append(cid)
+        if is_new:
+            reps.append(i)
+    return labels, reps
@@ -0,0 +1,166 @@
+"""
+Finance-tuned linear sentiment model: hashed word uni/bigrams + logistic regression.
+
+The feature map is a stateless HashingVectorizer, so a saved model is just the
+coefficient matrix plus vectorizer parameters. Scoring a batch is one sparse
+transform and one sparse × dense product (n × 2^18 @ 2^18 × 3) followed by a
+softmax; results are memoized per distinct headline, so re-scored or repeated
+headlines skip feature extraction entirely. compound = P(positive) − P(negative).
+
+Train from a labelled CSV/JSONL (labels positive | neutral | negative, or -1/0/1):
+    python -m app.sentiment.linear_model labelled.csv -o models/sentiment_linear.joblib
+then set SENTIMENT_ANALYZER=linear and SENTIMENT_MODEL_PATH to the output file.
+"""
+import argparse
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.sentiment.backends import Scores, SentimentBackend
+from app.sentiment.batch import _detect_format, _read_records, clean_text
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+CLASSES = ("negative", "neutral", "positive")
+_LABEL_ALIASES = {"-1": "negative", "0": "neutral", "1": "positive", "neg": "negative", "pos": "positive"}
+VECTORIZER_PARAMS = {
+    "n_features": 2 ** 18,
+    "ngram_range": (1, 2),
+    "alternate_sign": False,
+    "norm": "l2",
+    "lowercase": True,
+}
+CACHE_SIZE = 100_000
+
+
+def _vectorizer(params: Dict):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(**params)
+
+
+class LinearSentimentModel(SentimentBackend):
+    name = "linear"
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, classes: Sequence[str],
+                 vectorizer_params: Optional[Dict] = None, version: Optional[str] = None,
+                 cache_size: int = CACHE_SIZE):
+        self.vectorizer_params = dict(vectorizer_params or VECTORIZER_PARAMS)
+        self.vectorizer = _vectorizer(self.vectorizer_params)
+        # Columns reordered to (negative, neutral, positive); absent classes get -inf logits
+        cols = {c: i for i, c in enumerate(classes)}
+        n = coef.shape[1]
+        self.coef_t = np.zeros((n, 3), dtype=np.float32)
+        self.intercept = np.full(3, -np.inf)
+        if len(classes) == 2 and coef.shape[0] == 1:  # sklearn binary: one row for classes[1]
+            coef = np.vstack([-coef / 2, coef / 2])
+            intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+        for j, c in enumerate(CLASSES):
+            if c in cols:
+                self.coef_t[:, j] = coef[cols[c]]
+                self.intercept[j] = intercept[cols[c]]
+        self.version = version or "linear-" + hashlib.sha1(self.coef_t.tobytes()).hexdigest()[:10]
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Scores]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------- Persistence ----------
+    @classmethod
+    def load(cls, path: str) -> "LinearSentimentModel":
+        import joblib
+        data = joblib.load(path)
+        return cls(np.asarray(data["coef"]), np.asarray(data["intercept"]), list(data["classes"]),
+                   data.get("vectorizer_params"), data.get("version"))
+
+    def save(self, path: str) -> None:
+        import joblib
+        joblib.dump({
+            "coef": self.coef_t.T,
+            "intercept": self.intercept,
+            "classes": list(CLASSES),
+            "vectorizer_params": self.vectorizer_params,
+            "version": self.version,
+        }, path, compress=3)
+
+    # ---------- Scoring ----------
+    def _predict(self, texts: List[str]) -> np.ndarray:
+        """(n, 3) class probabilities in CLASSES order."""
+        logits = np.asarray(self.vectorizer.transform(texts) @ self.coef_t) + self.intercept
+        logits -= logits.max(axis=1, keepdims=True)
+        p = np.exp(logits)
+        return p / p.sum(axis=1, keepdims=True)
+
+    def score(self, texts: Sequence[str]) -> List[Scores]:
+        out: List[Scores] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, t in enumerate(texts):
+                if not t:
+                    continue
+                hit = self._cache.get(t)
+                if hit is not None:
+                    self._cache.move_to_end(t)
+                    out[i] = hit
+                else:
+                    missing.setdefault(t, []).append(i)
+        if missing:
+            uniq = list(missing)
+            p = self._predict(uniq)
+            compound = p[:, 2] - p[:, 0]
+            rows = [(float(c), float(pos), float(neu), float(neg))
+                    for c, (neg, neu, pos) in zip(compound, p)]
+            with self._lock:
+                for t, s in zip(uniq, rows):
+                    for i in missing[t]:
+                        out[i] = s
+                    self._cache[t] = s
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return out
+
+
+def normalize_label(label) -> Optional[str]:
+    s = str(label).strip().lower()
+    s = _LABEL_ALIASES.get(s, s)
+    return s if s in CLASSES else None
+
+
+def train(texts: Sequence[str], labels: Sequence, C: float = 4.0, max_iter: int = 1000) -> LinearSentimentModel:
+    """Fit logistic regression on hashed features of cleaned texts."""
+    from sklearn.linear_model import LogisticRegression
+    pairs = [(clean_text(t), normalize_label(y)) for t, y in zip(texts, labels)]
+    pairs = [(t, y) for t, y in pairs if t and y]
+    if len({y for _, y in pairs}) < 2:
+        raise ValueError("need at least two sentiment classes to train")
+    X = _vectorizer(VECTORIZER_PARAMS).transform([t for t, _ in pairs])
+    clf = LogisticRegression(C=C, max_iter=max_iter)
+    clf.fit(X, [y for _, y in pairs])
+    version = "linear-" + datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    logger.info("Trained sentiment model on %d texts (%s)", len(pairs), version)
+    return LinearSentimentModel(clf.coef_, clf.intercept_, list(clf.classes_), VECTORIZER_PARAMS, version)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the linear sentiment model from labelled headlines.")
+    parser.add_argument("input", help="CSV or JSONL with text and label columns")
+    parser.add_argument("-o", "--output", required=True, help="Model file (.joblib)")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--text-column", default="headline")
+    parser.add_argument("--label-column", default="label")
+    parser.add_argument("--C", type=float, default=4.0, help="Inverse regularization strength")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r", encoding="utf-8", newline="") as f:
+        records = list(_read_records(f, _detect_format(args.input, args.format)))
+    model = train([str(r.get(args.text_column) or "") for r in records],
+                  [r.get(args.label_column) for r in records], C=args.C)
+    model.save(args.output)
+    logger.info("Saved %s to %s", model.version, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Versioned, resumable rescoring of stored sentiment.
+
+When the analyzer, SOURCE_WEIGHTS (or SOURCE_WEIGHTS_FILE) or the recency
+settings change, stored scores no longer match new ones. Each scored row carries
+analyzer_version (backends.scoring_version()); this job walks a table in primary
+key order, rescores rows whose version differs – one chunk at a time, through
+the backend's batch path (VADER spreads large chunks over a process pool) –
+writes them back with one executemany UPDATE per chunk and commits, so the API
+only ever waits on a short per-chunk transaction. Progress is checkpointed in
+rescore_checkpoints; a rerun continues after the last committed chunk, and a
+version change restarts from the beginning. Once every chunk is done the
+derived aggregates of the touched dates are updated; score_rows may also report
+per-date sums (old vs new scores) that are checkpointed alongside and handed to
+finalize, so aggregates can be adjusted by the change instead of recomputed.
+
+v2 (this module): sentiment_articles -> sentiment_scores (per ingest day),
+sentiment_rollups, stability_history (adjusted by the change, see
+_rebuild_v2_aggregates). The legacy tables are handled by services/rescore_service.py
+using the same rescore_table loop.
+
+CLI (from backend root):
+    python -m app.sentiment.rescore --chunk-size 5000
+    python -m app.sentiment.rescore --restart
+"""
+import argparse
+import calendar
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.models import (
+    RescoreCheckpoint,
+    SentimentArticle,
+    SentimentScore,
+    StabilityHistory,
+)
+from app.sentiment.backends import get_backend, scoring_version
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# rows (tuples of the requested columns) -> (update mappings incl. id, touched dates);
+# touched may be a {date: {name: number}} dict whose sums are accumulated across chunks
+ScoreRows = Callable[[Sequence], Tuple[List[Dict], Iterable[date]]]
+# (session, touched dates, accumulated per-date sums)
+Finalize = Callable[[Session, List[date], Dict[date, Dict[str, float]]], None]
+
+
+def _checkpoint(db: Session, job: str, version: str, restart: bool) -> RescoreCheckpoint:
+    from app.database.base import add_missing_columns
+    RescoreCheckpoint.__table__.create(bind=db.get_bind(), checkfirst=True)
+    add_missing_columns(db.get_bind(), RescoreCheckpoint.__table__)
+    cp = db.get(RescoreCheckpoint, job)
+    if cp is None:
+        cp = RescoreCheckpoint(job=job, version=version)
+        db.add(cp)
+    if restart or cp.version != version:
+        cp.version, cp.last_id, cp.rows_rescored, cp.dates, cp.deltas = version, 0, 0, [], {}
+        cp.started_at, cp.finished_at = datetime.utcnow(), None
+    db.commit()
+    return cp
+
+
+def rescore_table(
+    db: Session,
+    model,
+    columns: Sequence,
+    job: str,
+    version: str,
+    score_rows: ScoreRows,
+    finalize: Optional[Finalize] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> Dict:
+    """
+    Rescore model rows (columns must start with model.id and include
+    model.analyzer_version) whose analyzer_version != version. Returns run stats;
+    finished is False when max_chunks stopped the run early. finalize's uncommitted
+    writes are committed together with the finished mark (and cleared deltas); a
+    finalize that commits itself must be safe to repeat.
+    """
+    t0 = time.perf_counter()
+    cp = _checkpoint(db, job, version, restart)
+    if cp.finished_at is not None:
+        return {"job": job, "version": version, "finished": True, "rows_rescored": 0, "chunks": 0,
+                "already_current": True, "elapsed_sec": 0.0}
+    dates = set(cp.dates or [])
+    deltas = {d: dict(sums) for d, sums in (cp.deltas or {}).items()}
+    chunks = rescored = 0
+    while True:
+        if max_chunks is not None and chunks >= max_chunks:
+            return {"job": job, "version": version, "finished": False, "rows_rescored": rescored,
+                    "chunks": chunks, "last_id": cp.last_id, "elapsed_sec": round(time.perf_counter() - t0, 3)}
+        rows = db.query(*columns).filter(model.id > cp.last_id).order_by(model.id).limit(chunk_size).all()
+        db.rollback()  # end the read transaction before scoring
+        if not rows:
+            break
+        stale = [r for r in rows if r.analyzer_version != version]
+        if stale:
+            updates, touched = score_rows(stale)
+            for u in updates:
+                u["analyzer_version"] = version
+            db.bulk_update_mappings(model, updates)
+            dates.update(d.isoformat() for d in touched)
+            if isinstance(touched, dict):
+                for d, sums in touched.items():
+                    acc = deltas.setdefault(d.isoformat(), {})
+                    for k, v in sums.items():
+                        acc[k] = acc.get(k, 0) + v
+        cp.last_id = rows[-1].id
+        cp.rows_rescored = (cp.rows_rescored or 0) + len(stale)
+        cp.dates = sorted(dates)
+        cp.deltas = {d: dict(sums) for d, sums in deltas.items()}
+        db.commit()  # rows + checkpoint land together
+        chunks += 1
+        rescored += len(stale)
+        logger.info("Rescore %s: %d rows up to id %d", job, cp.rows_rescored, cp.last_id)
+
+    if finalize:
+        finalize(db, [date.fromisoformat(d) for d in sorted(dates)],
+                 {date.fromisoformat(d): sums for d, sums in deltas.items()})
+    cp.finished_at, cp.deltas = datetime.utcnow(), None
+    db.commit()  # aggregates + finished mark land together
+    return {"job": job, "version": version, "finished": True, "rows_rescored": rescored, "chunks": chunks,
+            "dates_rebuilt": len(dates), "elapsed_sec": round(time.perf_counter() - t0, 3)}
+
+
+# ---------- v2: sentiment_articles ----------
+def _epoch(dt: Optional[datetime]) -> float:
+    return float("nan") if dt is None else float(calendar.timegm(dt.timetuple()))
+
+
+LABELS = ("positive", "neutral", "negative")
+SUM_KEYS = ("n", "old_cw", "old_w", "new_cw", "new_w")
+
+
+def _score_articles(rows: Sequence) -> Tuple[List[Dict], Dict[date, Dict[str, float]]]:
+    """
+    Updates for rows plus, per ingest day, sums over the articles whose score changed:
+    n, old/new sum(compound * weight) and sum(weight), and the change in each label count.
+    """
+    from app.sentiment.analyzer import _source_weight
+    from app.sentiment.batch import clean_text, format_scores
+    from app.sentiment.timestamps import recency_weights
+
+    scores = get_backend().score([clean_text(r.title) for r in rows])
+    published = np.array([_epoch(r.published_at) for r in rows])
+    ingested = np.array([_epoch(r.created_at) for r in rows])
+    # Recency as it was at ingest time: age = ingested - published
+    w_rec = recency_weights(published - ingested, now=0.0)
+    updates = []
+    changes: Dict[date, Dict[str, float]] = {}
+    for r, s, w in zip(rows, scores, w_rec):
+        sent = format_scores(s)
+        weight = round(_source_weight(r.source) * float(w), 3)
+        updates.append({
+            "id": r.id,
+            "compound": sent["compound"],
+            "positive": sent["positive"],
+            "neutral": sent["neutral"],
+            "negative": sent["negative"],
+            "label": sent["label"],
+            "weight": weight,
+        })
+        old_w = 1.0 if r.weight is None else r.weight
+        if r.created_at is None or (sent["compound"], sent["label"], weight) == (r.compound, r.label, old_w):
+            continue
+        c = changes.setdefault(r.created_at.date(), dict.fromkeys(SUM_KEYS + LABELS, 0.0))
+        c["n"] += 1
+        c["old_cw"] += r.compound * old_w
+        c["old_w"] += old_w
+        c["new_cw"] += sent["compound"] * weight
+        c["new_w"] += weight
+        c[r.label] -= 1
+        c[sent["label"]] += 1
+    return updates, changes
+
+
+def _rebuild_v2_aggregates(db: Session, dates: List[date], deltas: Dict[date, Dict[str, float]]) -> None:
+    """
+    Adjust the stored sentiment_scores rows of each touched ingest day by the change in
+    that day's rescored articles, then rollups and stability history. A row's cluster
+    weights and the runs that saw each article are not stored, so rows are not rebuilt
+    from sentiment_articles: avg_compound moves by the change in the rescored articles'
+    weighted mean and label counts by their label changes, both scaled by the share of
+    the row's stories those articles make up. Only rows still carrying an older
+    analyzer_version are adjusted (refreshes since the version change were scored with
+    the new analyzer), and stability history only on days with an adjusted row. Nothing
+    is committed here: rescore_table commits it with the finished mark, so a rerun after
+    a crash neither loses nor repeats the shift.
+    """
+    from app.database import crud
+    from app.ml.stability import StabilityScoreService
+    from app.sentiment import SentimentService
+
+    svc, stability = SentimentService(), StabilityScoreService()
+    version = scoring_version()
+    shifts: Dict[date, float] = {}  # mean sentiment score change per day
+    for d in dates:
+        c = deltas.get(d)
+        if not c or not c.get("n") or not c.get("old_w") or not c.get("new_w"):
+            continue
+        mean_change = c["new_cw"] / c["new_w"] - c["old_cw"] / c["old_w"]
+        if abs(mean_change) < 1e-9 and not any(c.get(label) for label in LABELS):
+            continue
+        changes = []
+        stale = SentimentScore.analyzer_version.is_(None) | (SentimentScore.analyzer_version != version)
+        for row in db.query(SentimentScore).filter(SentimentScore.record_date == d, stale):
+            agg = dict(row.raw_aggregate or {})
+            share = min(1.0, c["n"] / row.total_articles) if row.total_articles else 1.0
+            avg = agg.get("avg_compound", row.score / 50 - 1) + mean_change * share
+            avg = max(-1.0, min(1.0, avg))
+            counts = {label: max(0, int(round((getattr(row, f"{label}_count") or 0) + c.get(label, 0) * share)))
+                      for label in LABELS}
+            agg.update(
+                avg_compound=round(avg, 3),
+                overall_label="positive" if avg >= 0.05 else ("negative" if avg <= -0.05 else "neutral"),
+                rescored_from=row.score,
+                **{f"{label}_count": n for label, n in counts.items()},
+            )
+            score = svc.normalize_score(agg)
+            changes.append(score - row.score)
+            row.raw_aggregate = agg
+            row.score = score
+            row.positive_count = counts["positive"]
+            row.neutral_count = counts["neutral"]
+            row.negative_count = counts["negative"]
+            row.analyzer_version = version
+        if changes:
+            shifts[d] = sum(changes) / len(changes)
+    if not shifts:
+        return
+    db.flush()
+    crud.rebuild_sentiment_rollups(db, commit=False)
+
+    for row in db.query(StabilityHistory).filter(StabilityHistory.record_date.in_(list(shifts))):
+        c = dict(row.components or {})
+        res = stability.calculate(
+            market_momentum_score=c.get("market_momentum", 50),
+            sentiment_score=max(0.0, min(100.0, c.get("sentiment", 50) + shifts[row.record_date])),
+            volatility_inverse_score=c.get("volatility_inverse", 50),
+            inflation_score=c.get("inflation", 50),
+            liquidity_score=c.get("liquidity", 50),
+        )
+        row.stability_score = res["stability_score"]
+        row.category = res["category"]
+        row.risk_level = res["risk_level"]
+        row.explanation = res["explanation"]
+        row.components = res["components"]
+
+
+def rescore_sentiment_articles(
+    db: Session,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> Dict:
+    return rescore_table(
+        db, SentimentArticle,
+        [SentimentArticle.id, SentimentArticle.title, SentimentArticle.source, SentimentArticle.published_at,
+         SentimentArticle.created_at, SentimentArticle.compound, SentimentArticle.label, SentimentArticle.weight,
+         SentimentArticle.analyzer_version],
+        job="sentiment_articles",
+        version=scoring_version(),
+        score_rows=_score_articles,
+        finalize=_rebuild_v2_aggregates,
+        chunk_size=chunk_size,
+        restart=restart,
+        max_chunks=max_chunks,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rescore stored v2 sentiment with the current analyzer and weights.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first row")
+    parser.add_argument("--max-chunks", type=int, default=None, help="Stop after N chunks (resume later)")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal, init_db
+    init_db()
+    db = SessionLocal()
+    try:
+        stats = rescore_sentiment_articles(db, args.chunk_size, args.restart, args.max_chunks)
+    finally:
+        db.close()
+    logger.info("Rescore finished: %s", stats)
+
+
+if __name__ == "__main__":
+    main()
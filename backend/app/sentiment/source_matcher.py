@@ -0,0 +1,142 @@
+"""
+Source-credibility lookup for large outlet lists.
+
+All outlet names are compiled once into an Aho-Corasick automaton, so a lookup
+scans the source string once – O(len(source) + matches) – however many outlets
+are configured. Semantics match the original loop over SOURCE_WEIGHTS: the
+outlet listed first among those contained in the (lowercased) source wins,
+otherwise the default weight. Results are memoized per source string.
+
+Outlets come from settings.SOURCE_WEIGHTS_FILE when set – a JSON object
+{"outlet": weight, ...} (order = priority, optional "default" key) or a list of
+[outlet, weight] pairs – else from the built-in SOURCE_WEIGHTS. The file is
+reloaded when its mtime changes.
+"""
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SOURCE_WEIGHT = 0.7
+CACHE_SIZE = 4096
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher; patterns are identified by their index."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        for idx, pattern in enumerate(patterns):
+            if pattern:
+                self._insert(pattern, idx)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, idx: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append(idx)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                if node:  # depth-1 nodes keep fail = root
+                    f = self.fail[node]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[int]:
+        """Indexes of every pattern occurring in text (with repeats)."""
+        node = 0
+        for ch in text:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            yield from self.out[node]
+
+
+class SourceWeightMatcher:
+    """Compiled outlet -> weight table with first-listed-match semantics."""
+
+    def __init__(self, weights: Sequence[Tuple[str, float]], default: float = DEFAULT_SOURCE_WEIGHT):
+        self.names = [name.lower() for name, _ in weights]
+        self.weights = [float(w) for _, w in weights]
+        self.default = default
+        self.automaton = AhoCorasick(self.names)
+        self.weight = lru_cache(maxsize=CACHE_SIZE)(self._weight)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, source: str) -> Optional[int]:
+        """Priority (list position) of the best outlet contained in source, or None."""
+        return min(self.automaton.iter_matches((source or "").lower()), default=None)
+
+    def _weight(self, source: str) -> float:
+        idx = self.match(source)
+        return self.default if idx is None else self.weights[idx]
+
+
+def parse_source_weights(data) -> Tuple[List[Tuple[str, float]], float]:
+    """(ordered [(outlet, weight)], default) from a decoded JSON source-weight file."""
+    default = DEFAULT_SOURCE_WEIGHT
+    if isinstance(data, dict):
+        items = list(data.items())
+    else:
+        items = [tuple(pair) for pair in data]
+    pairs = []
+    for name, w in items:
+        if str(name).lower() == "default":
+            default = float(w)
+        else:
+            pairs.append((str(name), float(w)))
+    return pairs, default
+
+
+_matcher: Optional[SourceWeightMatcher] = None
+_matcher_key: Optional[Tuple[str, float]] = None
+
+
+def get_source_matcher(builtin: Optional[Dict[str, float]] = None) -> SourceWeightMatcher:
+    """Shared matcher for settings.SOURCE_WEIGHTS_FILE (rebuilt when the file changes) or builtin."""
+    global _matcher, _matcher_key
+    path = settings.SOURCE_WEIGHTS_FILE
+    key = ("", 0.0)
+    if path:
+        try:
+            key = (path, os.stat(path).st_mtime)
+        except OSError:
+            pass
+    if _matcher is not None and key == _matcher_key:
+        return _matcher
+    pairs, default = list((builtin or {}).items()), DEFAULT_SOURCE_WEIGHT
+    if path and not key[0]:
+        logger.warning("Source weight file %s not found; using built-in weights", path)
+    if key[0]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                pairs, default = parse_source_weights(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Unreadable source weight file %s: %s", path, e)
+    _matcher, _matcher_key = SourceWeightMatcher(pairs, default), key
+    return _matcher
@@ -4,12 +4,15 @@ Adds data_source, demo_mode, sample_data_date to every response.
 When FORCE_SAMPLE_DATA: try live with short timeout; use sample if live fails.
 """
 import threading
+from datetime import date, timedelta
 from typing import Any, Dict, List, Optional
 
 from app.config import settings
 from app.utils.log import get_logger
 import app.services.live_data_service as live_data_service
 import app.services.sample_data_service as sample_data_service
+from app.ml.forecast import DEFAULT_HORIZON, FORECAST_HORIZONS, MAX_HORIZON
+from app.utils.forecast_payload import columns_to_points, forecast_columns, points_to_columns, slice_columns
 
 logger = get_logger(__name__)
 
@@ -104,7 +107,7 @@ def get_news_then_sentiment(
                         for i in range(len(results))
                     ]
                     return {"status": "success", "sentiment_score": round(score, 2), "aggregate": aggregate,
-                            "articles": articles, "analyzer": "VADER", "filters_applied": None}
+                            "articles": articles, "analyzer": getattr(sentiment_analyzer, "analyzer_name", "VADER"), "filters_applied": None}
             except Exception:
                 return None
         def run():
@@ -121,17 +124,20 @@ def get_news_then_sentiment(
     try:
         headlines = live_data_service.fetch_live_news(query=query, max_results=max_results)
         if sentiment_analyzer and headlines:
+            # Date range before clustering, so no kept story loses its cluster representative;
+            # with nothing in range the aggregate covers all headlines and no articles are listed
+            in_range = sentiment_analyzer.filter_by_date(headlines, date_from, date_to)
+            scored = in_range or headlines
             results = sentiment_analyzer.analyze_batch_weighted(
-                headlines, title_key="title", source_key="source", published_key="published"
+                scored, title_key="title", source_key="source", published_key="published"
             )
-            aggregate = sentiment_analyzer.get_aggregate_weighted(results, headlines)
+            aggregate = sentiment_analyzer.get_aggregate_weighted(results, scored)
             score = sentiment_analyzer.normalize_score(aggregate)
-            if sentiment_filter or date_from or date_to:
+            headlines, results = (scored, results) if in_range else ([], [])
+            if sentiment_filter and headlines:
+                # Duplicates share their representative's label, so clusters are kept or dropped whole
                 headlines, results = sentiment_analyzer.filter_articles(
-                    headlines, results,
-                    sentiment_filter=sentiment_filter,
-                    date_from=date_from,
-                    date_to=date_to,
+                    headlines, results, sentiment_filter=sentiment_filter,
                 )
                 if headlines:
                     aggregate = sentiment_analyzer.get_aggregate_weighted(results, headlines)
@@ -152,7 +158,7 @@ def get_news_then_sentiment(
                 "sentiment_score": round(score, 2),
                 "aggregate": aggregate,
                 "articles": articles,
-                "analyzer": "VADER",
+                "analyzer": getattr(sentiment_analyzer, "analyzer_name", "VADER"),
                 "filters_applied": {"sentiment": sentiment_filter, "date_from": str(date_from) if date_from else None, "date_to": str(date_to) if date_to else None},
             }
             return _enrich(payload, "live", False)
@@ -164,13 +170,45 @@ def get_news_then_sentiment(
     return _enrich(payload, "offline_sample", getattr(settings, "DEMO_MODE_WHEN_OFFLINE", True))
 
 
+def live_stability_inputs(cache_getter, inflation_rate: Optional[float] = None, db=None) -> Dict[str, float]:
+    """
+    Current 0–100 factor inputs: cached forecast/sentiment/volatility while fresh, else
+    neutral 50; liquidity is today's stored score (current_liquidity_score), else 50; inflation
+    is inflation_rate, else the latest CPI inflation in the macro store.
+    """
+    from datetime import datetime
+    from app.utils.macro import macro_value
+    from app.utils.stability_helpers import inflation_score_0_100
+    if inflation_rate is None:
+        inflation_rate = macro_value("inflation")
+    cache = cache_getter()
+    cache_ok = (
+        cache.get("ts") is not None
+        and (datetime.utcnow() - cache["ts"]).total_seconds() < getattr(settings, "STABILITY_CACHE_TTL", 300)
+    )
+    if cache_ok and cache.get("forecast_score") is not None and cache.get("sentiment_score") is not None:
+        market_momentum = cache["forecast_score"]
+        sentiment_score = cache["sentiment_score"]
+        volatility_inverse = cache.get("volatility") or 50.0
+    else:
+        market_momentum = sentiment_score = volatility_inverse = 50.0
+    return {
+        "market_momentum": market_momentum,
+        "sentiment": sentiment_score,
+        "volatility_inverse": volatility_inverse,
+        "inflation": inflation_score_0_100(inflation_rate),
+        "liquidity": current_liquidity_score(db),
+    }
+
+
 def get_stability(
     stability_svc=None,
     cache_getter=None,
     inflation_rate: Optional[float] = None,
     repo_rate: Optional[float] = None,
+    profile: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Try live stability (cache + service); on failure return sample."""
+    """Try live stability (cache + service) under weight profile `profile`; on failure return sample."""
     force_sample = getattr(settings, "FORCE_SAMPLE_DATA", False)
     if force_sample and stability_svc and cache_getter:
         result = [None]
@@ -185,14 +223,16 @@ def get_stability(
                 else:
                     market_momentum = sentiment_score = 50.0
                 volatility_inverse = cache.get("volatility") or 50.0
-                from app.utils.stability_helpers import inflation_score_0_100, liquidity_score_0_100
-                infl = inflation_score_0_100(inflation_rate)
-                liq = liquidity_score_0_100(None)
+                from app.utils.macro import macro_value
+                from app.utils.stability_helpers import inflation_score_0_100
+                infl = inflation_score_0_100(inflation_rate if inflation_rate is not None else macro_value("inflation"))
+                liq = current_liquidity_score()
                 r = stability_svc.calculate(market_momentum_score=market_momentum, sentiment_score=sentiment_score,
-                    volatility_inverse_score=volatility_inverse, inflation_score=infl, liquidity_score=liq)
+                    volatility_inverse_score=volatility_inverse, inflation_score=infl, liquidity_score=liq,
+                    profile=profile)
                 return {"status": "success", "stability_score": r["stability_score"], "category": r["category"],
                     "risk_level": r["risk_level"], "explanation": r["explanation"], "components": r["components"],
-                    "breakdown": r.get("breakdown"), "timestamp": now.isoformat(),
+                    "breakdown": r.get("breakdown"), "profile": r.get("profile"), "timestamp": now.isoformat(),
                     "disclaimer": "Educational project. Not financial advice."}
             except Exception:
                 return None
@@ -210,26 +250,14 @@ def get_stability(
         if stability_svc and cache_getter:
             from datetime import datetime
             now = datetime.utcnow()
-            cache = cache_getter()
-            cache_ok = (
-                cache.get("ts") is not None
-                and (now - cache["ts"]).total_seconds() < getattr(settings, "STABILITY_CACHE_TTL", 300)
-            )
-            if cache_ok and cache.get("forecast_score") is not None and cache.get("sentiment_score") is not None:
-                market_momentum = cache["forecast_score"]
-                sentiment_score = cache["sentiment_score"]
-                volatility_inverse = cache.get("volatility") or 50.0
-            else:
-                market_momentum = sentiment_score = volatility_inverse = 50.0
-            from app.utils.stability_helpers import inflation_score_0_100, liquidity_score_0_100
-            inflation = inflation_score_0_100(inflation_rate)
-            liquidity = liquidity_score_0_100(None)
+            inputs = live_stability_inputs(cache_getter, inflation_rate)
             result = stability_svc.calculate(
-                market_momentum_score=market_momentum,
-                sentiment_score=sentiment_score,
-                volatility_inverse_score=volatility_inverse,
-                inflation_score=inflation,
-                liquidity_score=liquidity,
+                market_momentum_score=inputs["market_momentum"],
+                sentiment_score=inputs["sentiment"],
+                volatility_inverse_score=inputs["volatility_inverse"],
+                inflation_score=inputs["inflation"],
+                liquidity_score=inputs["liquidity"],
+                profile=profile,
             )
             payload = {
                 "status": "success",
@@ -239,6 +267,7 @@ def get_stability(
                 "explanation": result["explanation"],
                 "components": result["components"],
                 "breakdown": result.get("breakdown"),
+                "profile": result.get("profile"),
                 "timestamp": now.isoformat(),
                 "disclaimer": "Educational project. Not financial advice.",
             }
@@ -251,57 +280,231 @@ def get_stability(
     return _enrich(payload, "offline_sample", getattr(settings, "DEMO_MODE_WHEN_OFFLINE", True))
 
 
+def _last_market_date(today: date) -> date:
+    """Most recent completed weekday session before today (exchange holidays not modelled)."""
+    d = today - timedelta(days=1)
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return d
+
+
+def _index_date(ts) -> date:
+    """Calendar date of a DataFrame index label (Timestamp, datetime or date)."""
+    return ts.date() if hasattr(ts, "date") else date.today()
+
+
+def _forecast_is_fresh(row, today: date, horizon: int) -> bool:
+    """
+    A stored run is fresh if it ran today or already covers the last completed session,
+    and holds the requested horizon.
+    """
+    if row is None or not row.predictions or len(_stored_columns(row)["dates"]) < horizon:
+        return False
+    if str(horizon) not in (row.summary or {}) or str(horizon) not in (row.trend_distribution or {}):
+        return False
+    if row.forecast_date == today:
+        return True
+    return row.market_date is not None and row.market_date >= _last_market_date(today)
+
+
+def _stored_columns(row) -> Dict[str, list]:
+    """ForecastHistory.predictions as parallel arrays (rows written before the columnar form hold points)."""
+    p = row.predictions
+    return p if isinstance(p, dict) else points_to_columns(p)
+
+
+def _horizon_payload(bundle: Dict[str, Any], horizon: int, columnar: bool = False) -> Dict[str, Any]:
+    """
+    ForecastResponse-shaped payload for one horizon, sliced from a max-horizon bundle
+    whose "columns" are parallel arrays; point dicts are only built when not columnar.
+    """
+    key = str(horizon)
+    trend = bundle["trend_distribution"][key]
+    up_prob, down_prob = trend["uptrend_probability"], trend["downtrend_probability"]
+    columns = slice_columns(bundle["columns"], horizon)
+    return {
+        "status": "success",
+        "forecast": [] if columnar else columns_to_points(columns),
+        "columns": columns,
+        "summary": bundle["summary"][key],
+        "forecast_score": round((up_prob / 100.0) * 100, 2),
+        "current_value": bundle["current_value"],
+        "model": "Facebook Prophet",
+        "note": "Forecast represents market trend, not exact values.",
+        "horizon": horizon,
+        "uptrend_probability": up_prob,
+        "downtrend_probability": down_prob,
+        "drawdown_probability": trend.get("drawdown_probability"),
+        "quantile_bands": trend.get("quantile_bands"),
+        "confidence_level": bundle["confidence_level"],
+        "model_version": bundle["model_version"],
+    }
+
+
+def _forecast_from_history(row, horizon: int, columnar: bool = False) -> Dict[str, Any]:
+    """ForecastResponse-shaped payload from a ForecastHistory row."""
+    bundle = {
+        "columns": _stored_columns(row),
+        "summary": row.summary,
+        "trend_distribution": row.trend_distribution,
+        "current_value": row.current_value,
+        "confidence_level": row.confidence_level,
+        "model_version": row.model_version,
+    }
+    return _horizon_payload(bundle, horizon, columnar)
+
+
+def _nifty_volatility(nifty_df, db=None) -> Optional[float]:
+    """Latest NIFTY volatility: folded into volatility_daily when db is given, else computed from the frame."""
+    from app.utils.volatility import volatility_series
+    if db is not None:
+        try:
+            from app.database import crud
+            bars = [(_index_date(ts), c) for ts, c in nifty_df["Close"].items()]
+            return crud.update_volatility(db, "^NSEI", bars)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Volatility not persisted: %s", e)
+    series = volatility_series(nifty_df["Close"].dropna())
+    return series[-1] if series else None
+
+
+def _nifty_liquidity(nifty_df, db) -> Optional[float]:
+    """Fold the frame's NIFTY (close, volume) sessions into liquidity_daily; latest score."""
+    if "Volume" not in nifty_df:
+        return None
+    try:
+        from app.database import crud
+        bars = [(_index_date(ts), c, v) for ts, c, v in zip(nifty_df.index, nifty_df["Close"], nifty_df["Volume"])]
+        return crud.update_liquidity(db, "^NSEI", bars)
+    except Exception as e:
+        db.rollback()
+        logger.warning("Liquidity not persisted: %s", e)
+        return None
+
+
+def current_liquidity_score(db=None, as_of: Optional[date] = None) -> float:
+    """
+    NIFTY liquidity score (0–100) stored in liquidity_daily on or before as_of (default
+    today); neutral 50 if none is stored or the last one is more than
+    LIQUIDITY_MAX_STALE_SESSIONS sessions older than as_of.
+    """
+    from app.database import SessionLocal, crud
+    from app.utils.liquidity import sessions_between
+    as_of = as_of or date.today()
+    session = db or SessionLocal()
+    try:
+        row = crud.get_liquidity(session, "^NSEI", as_of=as_of)
+        if row is not None and row.liquidity_score is not None:
+            if sessions_between(row.record_date, as_of) <= settings.LIQUIDITY_MAX_STALE_SESSIONS:
+                return row.liquidity_score
+            logger.info("Liquidity from %s is stale for %s; using neutral", row.record_date, as_of)
+    except Exception as e:
+        logger.warning("Liquidity not read: %s", e)
+    finally:
+        if db is None:
+            session.close()
+    return 50.0
+
+
+def build_live_forecast(forecaster, nifty_df, db=None, horizon: int = DEFAULT_HORIZON,
+                        columnar: bool = False) -> Dict[str, Any]:
+    """
+    Forecast payload for `horizon` from a trained forecaster. One MAX_HORIZON
+    prediction yields every horizon's points, summary and trend distribution;
+    updates the stability cache (7-day view) and, when db is given, persists the
+    run to ForecastHistory, the closes to volatility_daily and the volumes to
+    liquidity_daily.
+    """
+    from app.utils.stability_cache import update_stability_cache
+    forecast_df = forecaster.forecast(days=MAX_HORIZON)
+    summaries = forecaster.get_forecast_summaries(forecast_df, FORECAST_HORIZONS)
+    current_value = float(nifty_df["Close"].iloc[-1])
+    columns = forecast_columns(forecast_df)
+    trends = forecaster.get_trend_distributions(forecast_df, FORECAST_HORIZONS)
+    conf_level = forecaster.get_confidence_level()
+    vol = _nifty_volatility(nifty_df, db)
+    if db is not None:
+        _nifty_liquidity(nifty_df, db)
+    update_stability_cache(trends[DEFAULT_HORIZON]["uptrend_probability"], 50.0, vol)
+    bundle = {
+        "columns": columns,
+        "summary": {str(h): v for h, v in summaries.items()},
+        "trend_distribution": {
+            str(h): {k: t[k] for k in ("uptrend_probability", "downtrend_probability",
+                                         "drawdown_probability", "quantile_bands")}
+            for h, t in trends.items()
+        },
+        "current_value": round(current_value, 2),
+        "confidence_level": conf_level,
+        "model_version": forecaster.model_version,
+    }
+    if db is not None:
+        try:
+            from app.database import crud
+            default = trends[DEFAULT_HORIZON]
+            crud.create_forecast_history(
+                db,
+                forecast_date=date.today(),
+                target_dates=columns["dates"],
+                predictions=columns,
+                current_value=bundle["current_value"],
+                uptrend_probability=default["uptrend_probability"],
+                downtrend_probability=default["downtrend_probability"],
+                confidence_level=conf_level,
+                model_metrics=forecaster.metrics,
+                market_date=_index_date(nifty_df.index[-1]),
+                model_version=forecaster.model_version,
+                summary=bundle["summary"],
+                trend_distribution=bundle["trend_distribution"],
+                volatility_pct=float(vol) if vol is not None else None,
+            )
+        except Exception as e:
+            db.rollback()
+            logger.warning("Forecast run not persisted: %s", e)
+    return _horizon_payload(bundle, horizon, columnar)
+
+
 def get_forecast(
     data_fetcher=None,
     forecaster=None,
+    db=None,
+    horizon: int = DEFAULT_HORIZON,
+    columnar: bool = False,
 ) -> Dict[str, Any]:
-    """Try live forecast (historical + Prophet); on failure return sample."""
+    """
+    Latest ForecastHistory row when fresh for the current market date; else live
+    forecast (historical + Prophet), persisted for the next request/worker; on failure sample.
+    Live and history payloads carry "columns"; "forecast" points are left empty when columnar.
+    """
     if getattr(settings, "FORCE_SAMPLE_DATA", False):
         semi = True
-        payload = sample_data_service.build_forecast_response(semi_dynamic=semi)
+        payload = sample_data_service.build_forecast_response(semi_dynamic=semi, horizon=horizon)
         return _enrich(payload, "offline_sample", getattr(settings, "DEMO_MODE_WHEN_OFFLINE", True))
+    if db is not None:
+        try:
+            from app.database import crud
+            row = crud.get_latest_forecast(db)
+            if _forecast_is_fresh(row, date.today(), horizon):
+                from app.utils.stability_cache import update_stability_cache
+                update_stability_cache(row.uptrend_probability, 50.0, row.volatility_pct)
+                return _enrich(_forecast_from_history(row, horizon, columnar), "live", False)
+        except Exception as e:
+            logger.warning("Forecast history lookup failed: %s", e)
     try:
         if data_fetcher and forecaster:
             nifty_df = live_data_service.fetch_live_historical_dataframe("^NSEI", "3mo")
             if nifty_df is not None and not nifty_df.empty and len(nifty_df) >= 30:
-                if not forecaster.is_trained:
+                # Refit (warm-started) when a newer bar arrived, so market_date matches the model
+                if forecaster.needs_training(nifty_df):
                     ok, _ = forecaster.train_model(nifty_df)
                     if not ok:
                         raise ValueError("Forecast model training failed")
-                forecast_df = forecaster.forecast(days=7)
-                summary = forecaster.get_forecast_summary(forecast_df)
-                current_value = float(nifty_df["Close"].iloc[-1])
-                forecast_data = [
-                    {
-                        "date": row["ds"].strftime("%Y-%m-%d"),
-                        "predicted": round(float(row["yhat"]), 2),
-                        "upper": round(float(row["yhat_upper"]), 2),
-                        "lower": round(float(row["yhat_lower"]), 2),
-                        "confidence": round(float(row.get("confidence", 0.75)), 2),
-                    }
-                    for _, row in forecast_df.iterrows()
-                ]
-                from app.utils.stability_cache import update_stability_cache
-                up_prob, down_prob = forecaster.get_uptrend_downtrend_probability(forecast_df)
-                conf_level = forecaster.get_confidence_level()
-                vol = nifty_df["Close"].pct_change().std() * 100 if len(nifty_df) > 1 else None
-                update_stability_cache(up_prob, 50.0, vol)
-                payload = {
-                    "status": "success",
-                    "forecast": forecast_data,
-                    "summary": summary,
-                    "forecast_score": round((up_prob / 100.0) * 100, 2),
-                    "current_value": round(current_value, 2),
-                    "model": "Facebook Prophet",
-                    "note": "Forecast represents market trend, not exact values.",
-                    "uptrend_probability": up_prob,
-                    "downtrend_probability": down_prob,
-                    "confidence_level": conf_level,
-                }
+                payload = build_live_forecast(forecaster, nifty_df, db=db, horizon=horizon, columnar=columnar)
                 return _enrich(payload, "live", False)
     except Exception as e:
         logger.warning("%s (forecast): %s", OFFLINE_MSG, e)
 
     semi = getattr(settings, "SAMPLE_DATA_SEMI_DYNAMIC", False)
-    payload = sample_data_service.build_forecast_response(semi_dynamic=semi)
+    payload = sample_data_service.build_forecast_response(semi_dynamic=semi, horizon=horizon)
     return _enrich(payload, "offline_sample", getattr(settings, "DEMO_MODE_WHEN_OFFLINE", True))
@@ -0,0 +1,215 @@
+"""
+News -> sentiment ingestion as a staged pipeline (see app/utils/pipeline.py):
+fetch -> normalize -> dedup -> clean -> score -> weight -> aggregate.
+Dedup clusters near-identical headlines (app/sentiment/dedup.py); one article
+per story is scored and weighted by its cluster size.
+
+Articles stream through bounded queues and are folded into a running weighted
+aggregate; the dedup index holds at most SENTIMENT_DEDUP_MAX_CLUSTERS recent
+stories, so memory stays flat whether a run sees 20 headlines or thousands.
+Given a DB session, each scored batch is also stored in sentiment_articles.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.database import crud
+from app.sentiment.analyzer import _source_weight
+from app.sentiment.backends import get_backend, scoring_version
+from app.sentiment.batch import clean_text, format_scores
+from app.sentiment.dedup import NearDuplicateIndex, cluster_weight
+from app.sentiment.timestamps import TS_KEY, recency_weights, to_epoch
+from app.utils.log import get_logger
+from app.utils.pipeline import Pipeline, Sink, Stage
+
+logger = get_logger(__name__)
+
+
+class RunningSentimentAggregate:
+    """
+    Incremental SentimentService.get_aggregate_weighted in bounded memory. Each story
+    is folded in as it arrives: its label into running counts, its compound × weight
+    under its cluster id while the dedup index still holds that cluster (near-duplicates
+    only bump the cluster's size there). When the index evicts a cluster, the story is
+    folded into the running sums with weight × (1 + ln size) and dropped, so state is
+    bounded by the index's max_clusters; stories still held are weighted on read.
+    """
+
+    def __init__(self, index: Optional[NearDuplicateIndex] = None):
+        self.index = index
+        self.total = 0
+        self.counts = {"positive": 0, "neutral": 0, "negative": 0}
+        self.weighted_sum = 0.0   # stories already folded in
+        self.total_weight = 0.0
+        self.open: Dict[int, Tuple[float, float]] = {}   # cluster id -> (compound × weight, weight)
+        self._evicted: Dict[int, int] = {}   # cluster id -> final size, evicted before its story arrived
+        self._lock = threading.Lock()        # eviction runs on the dedup stage's thread
+        if index is not None:
+            index.on_evict = self._on_evict
+
+    def _fold(self, cw: float, w: float, size: int) -> None:
+        m = cluster_weight(size)
+        self.weighted_sum += cw * m
+        self.total_weight += w * m
+
+    def _on_evict(self, cluster_id: int, size: int) -> None:
+        with self._lock:
+            story = self.open.pop(cluster_id, None)
+            if story is None:
+                self._evicted[cluster_id] = size
+            else:
+                self._fold(*story, size)
+
+    def add(self, sentiment: Dict, cluster_id: Optional[int] = None) -> None:
+        w = sentiment.get("weight", 1.0)
+        cw = sentiment["compound"] * w
+        with self._lock:
+            self.total += 1
+            self.counts[sentiment["label"]] = self.counts.get(sentiment["label"], 0) + 1
+            if cluster_id is None or self.index is None:
+                self._fold(cw, w, 1)
+            elif cluster_id in self._evicted:
+                self._fold(cw, w, self._evicted.pop(cluster_id))
+            else:
+                self.open[cluster_id] = (cw, w)
+
+    def add_batch(self, articles: List[Dict]) -> None:
+        for a in articles:
+            self.add(a["sentiment"], a.get("cluster_id"))
+
+    def as_dict(self) -> Dict:
+        duplicates = self.index.duplicates if self.index is not None else 0
+        if not self.total:
+            return {
+                "avg_compound": 0.0,
+                "positive_count": 0,
+                "neutral_count": 0,
+                "negative_count": 0,
+                "overall_label": "neutral",
+                "total_articles": 0,
+                "duplicates_collapsed": duplicates,
+            }
+        with self._lock:
+            weighted_sum, total_weight = self.weighted_sum, self.total_weight
+            for cid, (cw, w) in self.open.items():
+                m = cluster_weight(self.index.sizes[cid])
+                weighted_sum += cw * m
+                total_weight += w * m
+        avg = weighted_sum / (total_weight or 1)
+        label = "positive" if avg >= 0.05 else ("negative" if avg <= -0.05 else "neutral")
+        return {
+            "avg_compound": round(avg, 3),
+            "positive_count": self.counts["positive"],
+            "neutral_count": self.counts["neutral"],
+            "negative_count": self.counts["negative"],
+            "overall_label": label,
+            "total_articles": self.total,
+            "duplicates_collapsed": duplicates,
+        }
+
+
+# ---------- Stages ----------
+def _normalize(article: Dict) -> List[Dict]:
+    title = " ".join((article.get("title") or "").split())
+    if not title:
+        return []
+    ts = article.get(TS_KEY)
+    return [{
+        "title": title,
+        "source": article.get("source") or "",
+        "published": article.get("published"),
+        TS_KEY: to_epoch(article.get("published")) if ts is None else ts,
+        "link": article.get("link", "#"),
+    }]
+
+
+def _dedup_stage(index: NearDuplicateIndex):
+    """Near-duplicate filter: only each story's first article continues to scoring."""
+    def dedup(article: Dict) -> List[Dict]:
+        cid, is_new = index.add(article["title"], article["source"])
+        if not is_new:
+            return []
+        article["cluster_id"] = cid
+        return [article]
+    return dedup
+
+
+def _clean(article: Dict) -> List[Dict]:
+    article["text"] = clean_text(article["title"])
+    return [article]
+
+
+def _score(articles: List[Dict]) -> List[Dict]:
+    scores = get_backend().score([a["text"] for a in articles])
+    for a, s in zip(articles, scores):
+        a["sentiment"] = format_scores(s)
+    return articles
+
+
+def _weight(articles: List[Dict]) -> List[Dict]:
+    w_rec = recency_weights(np.array([a[TS_KEY] for a in articles], dtype=float))
+    for a, w in zip(articles, w_rec):
+        a["sentiment"]["weight"] = round(_source_weight(a["source"]) * float(w), 3)
+    return articles
+
+
+def build_news_sentiment_pipeline(
+    data_fetcher,
+    sink: Sink,
+    index: NearDuplicateIndex,
+    max_results: Optional[int] = None,
+) -> Pipeline:
+    max_results = max_results or settings.NEWS_MAX_PER_QUERY
+    batch = settings.NEWS_PIPELINE_BATCH_SIZE
+    return Pipeline(
+        [
+            Stage("fetch", lambda q: data_fetcher.fetch_news_headlines(q, max_results=max_results),
+                  workers=settings.NEWS_PIPELINE_FETCH_WORKERS),
+            Stage("normalize", _normalize),
+            Stage("dedup", _dedup_stage(index)),
+            Stage("clean", _clean),
+            Stage("score", _score, workers=settings.NEWS_PIPELINE_SCORE_WORKERS, batch_size=batch),
+            Stage("weight", _weight, batch_size=batch),
+        ],
+        sink=sink,
+        queue_size=settings.NEWS_PIPELINE_QUEUE_SIZE,
+    )
+
+
+def run_news_sentiment(
+    data_fetcher,
+    queries: Optional[Iterable[str]] = None,
+    max_results: Optional[int] = None,
+    db=None,
+) -> Tuple[Dict, Dict[str, Any]]:
+    """
+    Fetch and score headlines for all queries; returns (aggregate, pipeline stats).
+    aggregate has the same shape as SentimentService.get_aggregate_weighted.
+    With db, scored articles are persisted (crud.create_sentiment_articles) as they arrive.
+    """
+    queries = list(queries or [q.strip() for q in settings.NEWS_QUERIES.split(",") if q.strip()])
+    index = NearDuplicateIndex(
+        threshold=settings.SENTIMENT_DEDUP_THRESHOLD if settings.SENTIMENT_DEDUP_ENABLED else 1.0,
+        max_clusters=settings.SENTIMENT_DEDUP_MAX_CLUSTERS,
+    )
+    agg = RunningSentimentAggregate(index)
+    version = scoring_version()
+
+    def write(articles: List[Dict]) -> None:
+        agg.add_batch(articles)
+        if db is not None:
+            try:
+                crud.create_sentiment_articles(db, articles, analyzer_version=version)
+            except Exception as e:  # keep aggregating; the stored history just misses this batch
+                db.rollback()
+                logger.warning("Storing %d scored articles failed: %s", len(articles), e)
+
+    pipe = build_news_sentiment_pipeline(
+        data_fetcher, Sink("aggregate", write, batch_size=settings.NEWS_PIPELINE_BATCH_SIZE),
+        index, max_results=max_results,
+    )
+    stats = pipe.run(queries)
+    logger.info("News sentiment pipeline: %d articles in %.2fs", agg.total, stats["elapsed_sec"])
+    return agg.as_dict(), stats
@@ -265,15 +265,15 @@ def build_stability_response(semi_dynamic: bool = False) -> Dict[str, Any]:
     }
 
 
-def build_forecast_response(semi_dynamic: bool = False) -> Dict[str, Any]:
+def build_forecast_response(semi_dynamic: bool = False, horizon: int = 7) -> Dict[str, Any]:
     data = get_forecast_sample(semi_dynamic)
-    # Generate dates from today (next 7 days) for up-to-date sample
+    # Generate dates from today (next `horizon` days) for up-to-date sample
     base_value = data.get("current_value", 25850)
     from datetime import timedelta
     today = datetime.now().date()
     forecast = []
     cur = float(base_value)
-    for i in range(1, 8):
+    for i in range(1, horizon + 1):
         d = today + timedelta(days=i)
         delta = cur * 0.002 if data.get("forecast_trend") == "upward" else -cur * 0.001
         cur = cur + delta
@@ -283,7 +283,7 @@ def build_forecast_response(semi_dynamic: bool = False) -> Dict[str, Any]:
             "predicted": pred,
             "upper": round(pred * 1.008, 2),
             "lower": round(pred * 0.992, 2),
-            "confidence": round(0.78 - i * 0.01, 2),
+            "confidence": round(max(0.3, 0.78 - i * 0.01), 2),
         })
     return {
         "status": "success",
@@ -0,0 +1,111 @@
+"""
+What-if evaluation of the stability index over a grid of scenarios.
+
+Each axis given in the request (market_momentum, sentiment_shock,
+volatility_inverse, inflation_rate, liquidity, weights) is a list of values;
+the grid is their Cartesian product in that order (row-major, last axis
+fastest). Factors without an axis keep the baseline: the live inputs behind
+/stability-score, optionally overridden per factor. Axis values are mapped to
+0–100 factor scores once per value, broadcast to an (n, 5) matrix and scored in
+one StabilityScoreService.calculate_batch call. The result is columnar: one
+list per axis (weights as an index into the normalized weight sets) plus
+stability_score, category and risk_level; explanations only when asked.
+Categories use the thresholds of the selected weight profile.
+"""
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.ml.stability import CATEGORIES, FACTORS, RISK_LEVELS, StabilityScoreService
+from app.utils.stability_helpers import inflation_score_0_100
+
+# (request field, factor column it sets)
+AXES = (
+    ("market_momentum", "market_momentum"),
+    ("sentiment_shock", "sentiment"),
+    ("volatility_inverse", "volatility_inverse"),
+    ("inflation_rate", "inflation"),
+    ("liquidity", "liquidity"),
+    ("weights", None),
+)
+
+
+def normalize_weights(weight_sets: Sequence[Dict[str, Optional[float]]], default_weights: np.ndarray) -> np.ndarray:
+    """(k, 5) weight matrix; missing factors take the profile weight, each row rescaled to sum 1."""
+    default = dict(zip(FACTORS, default_weights.tolist()))
+    rows = np.array([[default[f] if ws.get(f) is None else ws[f] for f in FACTORS] for ws in weight_sets], dtype=float)
+    if (rows < 0).any():
+        raise ValueError("weights must be non-negative")
+    totals = rows.sum(axis=1, keepdims=True)
+    if (totals <= 0).any():
+        raise ValueError("each weight set needs a positive total")
+    return rows / totals
+
+
+def evaluate_scenarios(
+    baseline: Dict[str, float],
+    axes: Dict[str, Optional[List]],
+    svc: StabilityScoreService,
+    explain: bool = False,
+    max_rows: Optional[int] = None,
+    profile: Optional[str] = None,
+) -> Dict:
+    """
+    Score the grid spanned by the given (non-None) axes around baseline (0–100 factor inputs)
+    with weight profile `profile` (thresholds, and weights unless a weights axis is given).
+    """
+    p = svc.get_profile(profile)
+    present = [(name, factor) for name, factor in AXES if axes.get(name) is not None]
+    for name, _ in present:
+        if not axes[name]:
+            raise ValueError(f"{name} axis is empty")
+    shape = [len(axes[name]) for name, _ in present]
+    n = math.prod(shape)  # exact int: np.prod would wrap around on int64 overflow
+    if max_rows is not None and n > max_rows:
+        raise ValueError(f"scenario grid has {n} rows; the limit is {max_rows}")
+    index = np.unravel_index(np.arange(n), shape) if shape else ()
+
+    components = np.tile(np.array([baseline[f] for f in FACTORS], dtype=float), (n, 1))
+    weights = None
+    weight_sets = None
+    columns: Dict[str, list] = {}
+    for (name, factor), idx in zip(present, index):
+        values = axes[name]
+        if name == "weights":
+            weight_sets = normalize_weights(values, p.vector(FACTORS))
+            weights = weight_sets[idx]
+            columns[name] = idx.tolist()
+            continue
+        if name == "sentiment_shock":
+            factor_values = baseline["sentiment"] + np.asarray(values, dtype=float)
+        elif name == "inflation_rate":
+            factor_values = np.array([inflation_score_0_100(r) for r in values])
+        else:
+            factor_values = np.asarray(values, dtype=float)
+        components[:, FACTORS.index(factor)] = factor_values[idx]
+        columns[name] = np.asarray(values, dtype=float)[idx].tolist()
+
+    res = svc.calculate_batch(components, weights, profile=p.name)
+    score, level = res["stability_score"], res["level"]
+    columns["stability_score"] = score.tolist()
+    columns["category"] = np.array(CATEGORIES)[level].tolist()
+    columns["risk_level"] = np.array(RISK_LEVELS)[level].tolist()
+    if explain:
+        columns["explanation"] = svc.explain_batch(res["components"], level)
+
+    counts = np.bincount(level, minlength=len(CATEGORIES))
+    return {
+        "count": n,
+        "shape": {name: size for (name, _), size in zip(present, shape)},
+        "baseline": {f: round(float(baseline[f]), 2) for f in FACTORS},
+        "profile": p.name,
+        "weights": None if weight_sets is None else [dict(zip(FACTORS, w)) for w in np.round(weight_sets, 4).tolist()],
+        "columns": columns,
+        "summary": {
+            "min": float(score.min()),
+            "max": float(score.max()),
+            "mean": round(float(score.mean()), 2),
+            "category_counts": {c: int(k) for c, k in zip(CATEGORIES, counts)},
+        },
+    }
@@ -0,0 +1,31 @@
+"""Opaque keyset-pagination cursors: the last row's sort key, base64url-encoded JSON."""
+import base64
+import json
+from datetime import date
+from typing import Any, List, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_date_id_cursor(cursor: str):
+    """(date, id) from a cursor written for a (date, id) keyset; ValueError if malformed."""
+    c_date, c_id = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(str(c_date)), int(c_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
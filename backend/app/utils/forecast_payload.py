@@ -0,0 +1,63 @@
+"""
+Vectorized forecast serialization shared by /forecast (v2) and /forecast/7days (legacy).
+Converts the forecast frame's numpy columns in one pass – no DataFrame.iterrows,
+no per-row float()/round()/strftime.
+"""
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+FORECAST_FORMATS = ("points", "columnar")
+
+
+def forecast_columns(forecast_df: pd.DataFrame, include_confidence: bool = True) -> Dict[str, List[Any]]:
+    """
+    Parallel arrays for charting clients: dates, predicted, upper, lower[, confidence].
+    Missing interval columns default to ±2% of yhat, missing confidence to 0.75.
+    """
+    yhat = forecast_df["yhat"].to_numpy(dtype=float)
+    upper = forecast_df["yhat_upper"].to_numpy(dtype=float) if "yhat_upper" in forecast_df else yhat * 1.02
+    lower = forecast_df["yhat_lower"].to_numpy(dtype=float) if "yhat_lower" in forecast_df else yhat * 0.98
+    cols = {
+        "dates": pd.to_datetime(forecast_df["ds"]).dt.strftime("%Y-%m-%d").tolist(),
+        "predicted": np.round(yhat, 2).tolist(),
+        "upper": np.round(upper, 2).tolist(),
+        "lower": np.round(lower, 2).tolist(),
+    }
+    if include_confidence:
+        conf = (
+            forecast_df["confidence"].to_numpy(dtype=float)
+            if "confidence" in forecast_df
+            else np.full(len(yhat), 0.75)
+        )
+        cols["confidence"] = np.round(conf, 2).tolist()
+    return cols
+
+
+def columns_to_points(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """[{date, predicted, upper, lower[, confidence]}, ...] from parallel arrays."""
+    keys = ["date"] + [k for k in ("predicted", "upper", "lower", "confidence") if k in columns]
+    arrays = [columns["dates"]] + [columns[k] for k in keys[1:]]
+    return [dict(zip(keys, values)) for values in zip(*arrays)]
+
+
+def points_to_columns(points: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Inverse of columns_to_points, e.g. for ForecastHistory rows stored as points."""
+    if not points:
+        return {"dates": [], "predicted": [], "upper": [], "lower": []}
+    cols = {"dates": [p["date"] for p in points]}
+    for key in ("predicted", "upper", "lower", "confidence"):
+        if key in points[0]:
+            cols[key] = [p.get(key) for p in points]
+    return cols
+
+
+def slice_columns(columns: Dict[str, List[Any]], n: int) -> Dict[str, List[Any]]:
+    """First n entries of every array."""
+    return {k: v[:n] for k, v in columns.items()}
+
+
+def forecast_points(forecast_df: pd.DataFrame, include_confidence: bool = True) -> List[Dict[str, Any]]:
+    """ForecastPoint-shaped dicts built from the columnar arrays."""
+    return columns_to_points(forecast_columns(forecast_df, include_confidence))
@@ -0,0 +1,113 @@
+"""
+Incremental index liquidity aggregates, shared by both stacks.
+
+Per session the engine takes (close, volume) and keeps, over the last `window`
+sessions with a traded volume:
+  median_volume  median of the volumes (sorted window, bisect insert/remove)
+  turnover_z     z-score of today's log turnover (close * volume) against the
+                 window's mean/sample std (Welford, oldest value removed as a
+                 new one arrives); log because turnover is heavily right-skewed
+
+Each update() is O(window) at worst (list shift) and O(log window) to search.
+The 0–100 liquidity score maps turnover_z linearly: 50 at the window mean,
+0/100 at -2/+2 std. Values are None until MIN_SESSIONS sessions have been seen.
+Stored daily values live in liquidity_daily (crud.update_liquidity); readers treat
+a row more than LIQUIDITY_MAX_STALE_SESSIONS weekdays old as missing.
+"""
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+MIN_SESSIONS = 5
+Z_CLIP = 2.0
+
+
+def liquidity_window(window: Optional[int] = None) -> int:
+    return max(2, int(window or settings.LIQUIDITY_WINDOW))
+
+
+def liquidity_score_from_z(turnover_z: Optional[float]) -> Optional[float]:
+    """0–100 score from the turnover z-score (None passes through)."""
+    if turnover_z is None:
+        return None
+    z = max(-Z_CLIP, min(Z_CLIP, turnover_z))
+    return round(50 + z / Z_CLIP * 50, 2)
+
+
+def sessions_between(start: date, end: date) -> int:
+    """Weekdays after start up to and including end (0 if end <= start); holidays are not excluded."""
+    days = (end - start).days
+    if days <= 0:
+        return 0
+    weeks, rest = divmod(days, 7)
+    return weeks * 5 + sum((start + timedelta(days=i)).weekday() < 5 for i in range(1, rest + 1))
+
+
+class RollingLiquidity:
+    def __init__(self, window: Optional[int] = None):
+        self.window = liquidity_window(window)
+        self.volumes: deque = deque()
+        self.sorted_volumes: List[float] = []
+        self.turnovers: deque = deque()   # log turnover, same order as volumes
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def n(self) -> int:
+        return len(self.volumes)
+
+    def _add(self, volume: float, x: float) -> None:
+        self.volumes.append(volume)
+        insort(self.sorted_volumes, volume)
+        self.turnovers.append(x)
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def _remove(self) -> None:
+        volume = self.volumes.popleft()
+        del self.sorted_volumes[bisect_left(self.sorted_volumes, volume)]
+        x = self.turnovers.popleft()
+        if not self.turnovers:
+            self.mean = self.m2 = 0.0
+            return
+        d = x - self.mean
+        self.mean -= d / self.n
+        self.m2 -= d * (x - self.mean)
+
+    def update(self, close: float, volume: float) -> Optional[float]:
+        """Fold one session in; sessions without a positive close and volume are skipped."""
+        if close and volume and close > 0 and volume > 0:
+            if self.n == self.window:
+                self._remove()
+            self._add(float(volume), math.log(close * volume))
+        return self.score
+
+    @property
+    def median_volume(self) -> Optional[float]:
+        v, n = self.sorted_volumes, self.n
+        if not n:
+            return None
+        return v[n // 2] if n % 2 else (v[n // 2 - 1] + v[n // 2]) / 2
+
+    @property
+    def turnover_z(self) -> Optional[float]:
+        if self.n < min(MIN_SESSIONS, self.window):
+            return None
+        std = math.sqrt(max(0.0, self.m2 / (self.n - 1)))
+        return (self.turnovers[-1] - self.mean) / std if std > 0 else 0.0
+
+    @property
+    def score(self) -> Optional[float]:
+        return liquidity_score_from_z(self.turnover_z)
+
+
+def liquidity_series(bars: Iterable[Tuple[float, float]],
+                     window: Optional[int] = None) -> List[Optional[float]]:
+    """Liquidity score after each (close, volume) session; same values the incremental store holds."""
+    engine = RollingLiquidity(window)
+    return [engine.update(c, v) for c, v in bars]
@@ -0,0 +1,160 @@
+"""
+Point-in-time macro indicator store (CPI inflation, repo rate, ...) from local files.
+
+Sources (for the same series and day, a later source wins):
+  app/sample_data/macro_history.json  dated history shipped with the app
+  app/sample_data/macro.json          latest snapshot (used only where "as_of" is given)
+  settings.MACRO_DATA_PATHS           comma-separated files or directories (*.json, *.csv)
+
+Dated JSON: {"series": {"repo_rate": [{"date": "2023-02-08", "value": 6.5,
+"published": "2023-02-08"}, ...]}}. CSV: header date,series,value[,published].
+An observation counts from its published date (else its date), so a lookup for
+day d only sees values that were known on d. Snapshot entries ({"inflation":
+{"value": 4.85, "as_of": "2024-11-12"}}) count from their "as_of" date and only
+fill series that have no dated history; entries without "as_of" are skipped, so
+an undated value never becomes the current one or leaks into backfilled dates.
+
+Files are parsed once into sorted ordinal-day arrays and re-read when one
+changes; value() is a bisect and values() one searchsorted over many dates.
+"""
+import csv
+import json
+import threading
+from bisect import bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_data"
+BUILTIN_FILES = (_SAMPLE_DIR / "macro_history.json", _SAMPLE_DIR / "macro.json")
+
+
+def _day(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+class MacroSeries:
+    def __init__(self, name: str, observations: Iterable[Tuple[date, float]]):
+        self.name = name
+        known: Dict[int, float] = {}
+        for d, v in observations:
+            known[d.toordinal()] = float(v)   # same day: the later source wins
+        self.days = np.array(sorted(known), dtype=np.int64)
+        self.vals = np.array([known[d] for d in self.days.tolist()], dtype=float)
+        self._days = self.days.tolist()
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def as_of(self, d: date) -> Optional[float]:
+        i = bisect_right(self._days, d.toordinal())
+        return float(self.vals[i - 1]) if i else None
+
+    def as_of_many(self, days: Iterable[date]) -> np.ndarray:
+        """Values known on each day (NaN before the first observation)."""
+        ords = np.array([d.toordinal() for d in days], dtype=np.int64)
+        i = np.searchsorted(self.days, ords, side="right")
+        out = np.full(len(ords), np.nan)
+        ok = i > 0
+        out[ok] = self.vals[i[ok] - 1]
+        return out
+
+
+class MacroStore:
+    def __init__(self, series: Dict[str, MacroSeries]):
+        self.series = series
+
+    def names(self) -> List[str]:
+        return sorted(self.series)
+
+    def value(self, name: str, as_of: Optional[date] = None) -> Optional[float]:
+        s = self.series.get(name)
+        return s.as_of(as_of or date.today()) if s else None
+
+    def values(self, name: str, days: Iterable[date]) -> np.ndarray:
+        days = list(days)
+        s = self.series.get(name)
+        return s.as_of_many(days) if s else np.full(len(days), np.nan)
+
+
+def _source_files() -> List[Path]:
+    files = [p for p in BUILTIN_FILES if p.exists()]
+    for item in filter(None, (x.strip() for x in (settings.MACRO_DATA_PATHS or "").split(","))):
+        p = Path(item)
+        if p.is_dir():
+            files.extend(sorted(q for q in p.iterdir() if q.suffix.lower() in (".json", ".csv")))
+        elif p.exists():
+            files.append(p)
+        else:
+            logger.warning("Macro data path %s not found", p)
+    return files
+
+
+def _read_file(path: Path) -> Tuple[Dict[str, List[Tuple[date, float]]], Dict[str, Tuple[date, float]]]:
+    """(dated observations, snapshot values) from one file."""
+    dated: Dict[str, List[Tuple[date, float]]] = {}
+    snapshot: Dict[str, Tuple[date, float]] = {}
+    if path.suffix.lower() == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("value") in (None, ""):
+                    continue
+                known = _day(row.get("published") or row["date"])
+                dated.setdefault(row["series"].strip(), []).append((known, float(row["value"])))
+        return dated, snapshot
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "series" in data:
+        for name, points in data["series"].items():
+            dated[name] = [(_day(p.get("published") or p["date"]), float(p["value"]))
+                           for p in points if p.get("value") is not None]
+    else:
+        for name, item in data.items():
+            if isinstance(item, dict) and isinstance(item.get("value"), (int, float)) and item.get("as_of"):
+                snapshot[name] = (_day(item["as_of"]), float(item["value"]))
+    return dated, snapshot
+
+
+def _compile_store(files: List[Path]) -> MacroStore:
+    dated: Dict[str, List[Tuple[date, float]]] = {}
+    snapshot: Dict[str, Tuple[date, float]] = {}
+    for path in files:
+        try:
+            d, s = _read_file(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Unreadable macro data file %s: %s", path, e)
+            continue
+        for name, points in d.items():
+            dated.setdefault(name, []).extend(points)
+        snapshot.update(s)
+    for name, point in snapshot.items():
+        dated.setdefault(name, [point])
+    return MacroStore({name: MacroSeries(name, points) for name, points in dated.items() if points})
+
+
+_store: Optional[MacroStore] = None
+_store_key: Optional[Tuple] = None
+_store_lock = threading.Lock()
+
+
+def get_macro_store() -> MacroStore:
+    """The compiled store; re-read only when a source file is added, removed or modified."""
+    global _store, _store_key
+    files = _source_files()
+    key = tuple((str(p), p.stat().st_mtime) for p in files)
+    with _store_lock:
+        if _store is None or key != _store_key:
+            _store, _store_key = _compile_store(files), key
+        return _store
+
+
+def macro_value(name: str, as_of: Optional[date] = None) -> Optional[float]:
+    """Value of series `name` known on as_of (default today); None if none was known."""
+    return get_macro_store().value(name, as_of)
@@ -0,0 +1,207 @@
+"""
+Staged streaming pipeline: worker threads per stage, connected by bounded queues.
+
+Each Stage maps one item (or, with batch_size, a list of items) to zero or more
+outputs, so the same primitive covers fetch (query -> articles), filters
+(dedup) and 1:1 transforms. A full queue blocks the upstream stage
+(backpressure), so memory is bounded by queue_size × stages regardless of how
+many items flow through. The Sink runs on the calling thread – safe for a
+SQLAlchemy session – and receives batches.
+
+    pipe = Pipeline([Stage("fetch", fetch, workers=4), Stage("score", score, batch_size=200)],
+                    sink=Sink("write", write_batch, batch_size=500))
+    stats = pipe.run(queries)
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_sec: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, n_in: int, n_out: int, busy: float, error: bool = False) -> None:
+        with self._lock:
+            self.items_in += n_in
+            self.items_out += n_out
+            self.busy_sec += busy
+            self.errors += int(error)
+
+    def as_dict(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_sec": round(self.busy_sec, 4),
+            "items_per_sec": round(self.items_in / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+class Stage:
+    """
+    fn(item) -> iterable of outputs (or None to drop); with batch_size,
+    fn(list_of_items) -> iterable of outputs. Stateful stages (dedup) need workers=1.
+    """
+
+    def __init__(self, name: str, fn: Callable, workers: int = 1, batch_size: Optional[int] = None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.stats = StageStats()
+
+
+class Sink:
+    """Terminal consumer on the calling thread: fn(batch) per batch_size items."""
+
+    def __init__(self, name: str, fn: Callable[[List[Any]], Any], batch_size: int = 100):
+        self.name = name
+        self.fn = fn
+        self.batch_size = max(1, batch_size)
+        self.stats = StageStats()
+
+    def consume(self, items: Iterable[Any]) -> None:
+        batch: List[Any] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: List[Any]) -> None:
+        t0 = time.perf_counter()
+        self.fn(batch)  # errors propagate: a failed write must fail the run
+        self.stats.record(len(batch), len(batch), time.perf_counter() - t0)
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], sink: Optional[Sink] = None, queue_size: int = 256):
+        self.stages = stages
+        self.sink = sink
+        self.queue_size = max(1, queue_size)
+        self.elapsed_sec = 0.0
+        self._stop = threading.Event()
+
+    # ---------- Workers ----------
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _call(self, stage: Stage, payload: Any, n_in: int, q_out: queue.Queue) -> None:
+        t0 = time.perf_counter()
+        try:
+            outputs = list(stage.fn(payload) or ())
+        except Exception as e:
+            stage.stats.record(n_in, 0, time.perf_counter() - t0, error=True)
+            logger.warning("Pipeline stage %s failed on %d item(s): %s", stage.name, n_in, e)
+            return
+        stage.stats.record(n_in, len(outputs), time.perf_counter() - t0)
+        for out in outputs:
+            if not self._put(q_out, out):
+                return
+
+    def _worker(self, stage: Stage, q_in: queue.Queue, q_out: queue.Queue, remaining: List[int],
+                lock: threading.Lock) -> None:
+        batch: List[Any] = []
+        while True:
+            item = self._get(q_in)
+            if item is _DONE:
+                self._put(q_in, _DONE)  # let sibling workers see it too
+                break
+            if stage.batch_size:
+                batch.append(item)
+                if len(batch) >= stage.batch_size:
+                    self._call(stage, batch, len(batch), q_out)
+                    batch = []
+            else:
+                self._call(stage, item, 1, q_out)
+        if batch and not self._stop.is_set():
+            self._call(stage, batch, len(batch), q_out)
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(q_out, _DONE)
+
+    def _feed(self, source: Iterable[Any], q: queue.Queue) -> None:
+        try:
+            for item in source:
+                if not self._put(q, item):
+                    return
+        except Exception as e:
+            logger.warning("Pipeline source failed: %s", e)
+        self._put(q, _DONE)
+
+    # ---------- Driver ----------
+    def stream(self, source: Iterable[Any]) -> Iterator[Any]:
+        """Run the stages over source, yielding the last stage's outputs as they arrive."""
+        self._stop.clear()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), daemon=True)]
+        for i, stage in enumerate(self.stages):
+            remaining, lock = [stage.workers], threading.Lock()
+            for k in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._worker, args=(stage, queues[i], queues[i + 1], remaining, lock),
+                    name=f"pipeline-{stage.name}-{k}", daemon=True,
+                ))
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stop.set()  # unblocks every worker if the consumer stopped early or raised
+            for t in threads:
+                t.join(timeout=5)
+            self.elapsed_sec = time.perf_counter() - t0
+
+    def run(self, source: Iterable[Any]) -> Dict[str, Any]:
+        """Drain the pipeline into the sink; returns stats()."""
+        items = self.stream(source)
+        if self.sink is not None:
+            self.sink.consume(items)
+        else:
+            for _ in items:
+                pass
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage throughput counters for the last run."""
+        elapsed = self.elapsed_sec
+        stages = {s.name: dict(s.stats.as_dict(elapsed), workers=s.workers) for s in self.stages}
+        if self.sink is not None:
+            stages[self.sink.name] = self.sink.stats.as_dict(elapsed)
+        return {"elapsed_sec": round(elapsed, 4), "stages": stages}
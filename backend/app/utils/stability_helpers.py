@@ -1,7 +1,9 @@
 """
 Helpers to produce 0–100 inputs for the multi-factor stability formula.
-- Inflation score from inflation_rate (target band 2–6%, optimal ~4%)
-- Liquidity score: proxy from volume or default 50
+- Inflation score from inflation_rate (target band 2–6%, optimal ~4%); callers pass
+  the CPI value known on the scored date (app/utils/macro.py), else 4.5% is assumed
+- Liquidity score: proxy from volume or default 50 (the live index score is the
+  rolling turnover z-score stored in liquidity_daily, app/utils/liquidity.py)
 """
 from typing import Optional
 
@@ -0,0 +1,127 @@
+"""
+Incremental volatility of daily % returns, shared by both stacks.
+
+  rolling  sample std of the last `window` returns; Welford mean/M2 with the
+           oldest return removed as a new one arrives
+  ewma     exponentially weighted mean/variance, span = window
+           (alpha = 2 / (window + 1); 30 ≈ RiskMetrics lambda 0.94)
+
+Each update() takes the next close and is O(1). Values are daily % std (same
+unit as pct_change().std() * 100) and None until MIN_RETURNS returns have been
+seen. Stored daily values live in volatility_daily (crud.update_volatility).
+"""
+import math
+from collections import deque
+from typing import Iterable, List, Optional
+
+from app.config import settings
+
+VOLATILITY_MODES = ("rolling", "ewma")
+MIN_RETURNS = 4
+
+
+def volatility_params(mode: Optional[str] = None, window: Optional[int] = None):
+    """(mode, window) with settings defaults; raises ValueError for an unknown mode."""
+    mode = (mode or settings.VOLATILITY_MODE or "rolling").lower()
+    if mode not in VOLATILITY_MODES:
+        raise ValueError(f"unknown volatility mode {mode!r}")
+    return mode, max(2, int(window or settings.VOLATILITY_WINDOW))
+
+
+class RollingVolatility:
+    mode = "rolling"
+
+    def __init__(self, window: int):
+        self.window = window
+        self.returns: deque = deque()
+        self.last_close: Optional[float] = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def n(self) -> int:
+        return len(self.returns)
+
+    @property
+    def var(self) -> float:
+        return max(0.0, self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def _add(self, r: float) -> None:
+        self.returns.append(r)
+        d = r - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (r - self.mean)
+
+    def _remove(self) -> None:
+        r = self.returns.popleft()
+        if not self.returns:
+            self.mean = self.m2 = 0.0
+            return
+        d = r - self.mean
+        self.mean -= d / self.n
+        self.m2 -= d * (r - self.mean)
+
+    def update(self, close: float) -> Optional[float]:
+        if self.last_close:
+            if self.n == self.window:
+                self._remove()
+            self._add((close - self.last_close) / self.last_close * 100)
+        self.last_close = close
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return math.sqrt(self.var) if self.n >= min(MIN_RETURNS, self.window) else None
+
+
+class EwmaVolatility:
+    mode = "ewma"
+
+    def __init__(self, window: int):
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self.last_close: Optional[float] = None
+        self.n = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def restore(self, last_close: float, n: int, mean: float, var: float) -> "EwmaVolatility":
+        self.last_close, self.n, self.mean, self.var = last_close, n, mean, var
+        return self
+
+    def update(self, close: float) -> Optional[float]:
+        if self.last_close:
+            r = (close - self.last_close) / self.last_close * 100
+            if self.n == 0:
+                self.mean, self.var = r, 0.0
+            else:
+                d = r - self.mean
+                incr = self.alpha * d
+                self.mean += incr
+                self.var = (1 - self.alpha) * (self.var + d * incr)
+            self.n += 1
+        self.last_close = close
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return math.sqrt(self.var) if self.n >= MIN_RETURNS else None
+
+
+def make_volatility(mode: Optional[str] = None, window: Optional[int] = None):
+    """Empty engine for mode/window (defaults: settings.VOLATILITY_MODE / VOLATILITY_WINDOW)."""
+    mode, window = volatility_params(mode, window)
+    return RollingVolatility(window) if mode == "rolling" else EwmaVolatility(window)
+
+
+def warmup_closes(mode: Optional[str] = None, window: Optional[int] = None) -> int:
+    """Closes needed to rebuild the state from scratch (ewma: until old weights are < 1e-4)."""
+    mode, window = volatility_params(mode, window)
+    return window + 1 if mode == "rolling" else int(math.log(1e-4) / math.log(1 - 2.0 / (window + 1))) + 1
+
+
+def volatility_series(closes: Iterable[float], mode: Optional[str] = None,
+                      window: Optional[int] = None) -> List[Optional[float]]:
+    """Volatility after each close (None during warm-up); same values the incremental store holds."""
+    engine = make_volatility(mode, window)
+    return [engine.update(float(c)) for c in closes]
@@ -0,0 +1,65 @@
+"""
+Benchmark: serial vs process-parallel VADER scoring (app/sentiment/batch.py).
+
+Scores a synthetic archive of headlines once in-process and once across the
+worker pool, checks both give identical results in the same order, and reports
+headlines/second.
+
+Run from backend root:
+    python benchmarks/bench_batch_sentiment.py --headlines 100000 --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment.batch import polarity_scores, shutdown_pool  # noqa: E402
+
+WORDS = (
+    "Nifty Sensex rally slump RBI repo rate hike cut inflation eases surges GDP growth "
+    "beats misses estimates rupee weakens strengthens FII outflows inflows record high "
+    "crash fears optimism banks IT stocks gain lose profit loss strong weak outlook"
+).split()
+
+
+def synthetic_headlines(n: int):
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(6, 14, n)
+    picks = rng.integers(0, len(WORDS), lengths.sum())
+    out, i = [], 0
+    for k in lengths:
+        out.append(" ".join(WORDS[j] for j in picks[i:i + k]))
+        i += k
+    return out
+
+
+def run(n: int, workers: int) -> int:
+    texts = synthetic_headlines(n)
+    t0 = time.perf_counter()
+    serial = polarity_scores(texts, workers=1)
+    serial_s = time.perf_counter() - t0
+
+    polarity_scores(texts[: workers * 10], workers=workers, min_parallel=0)  # warm the pool
+    t0 = time.perf_counter()
+    parallel = polarity_scores(texts, workers=workers, min_parallel=0)
+    parallel_s = time.perf_counter() - t0
+    shutdown_pool()
+
+    print(f"headlines={n} workers={workers}")
+    print(f"serial   {serial_s:8.2f} s  {n / serial_s:10.0f} headlines/s")
+    print(f"parallel {parallel_s:8.2f} s  {n / parallel_s:10.0f} headlines/s  ({serial_s / parallel_s:.1f}x)")
+    ok = serial == parallel
+    print("PASS: identical, in order" if ok else "FAIL: parallel results differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headlines", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    sys.exit(run(args.headlines, args.workers))
@@ -0,0 +1,60 @@
+"""
+Benchmark: forecast latency vs interval width for each FORECAST_INTERVAL_MODE.
+
+For every mode, trains a ForecastService on the same synthetic series, then
+times forecast() (the predict call behind /forecast) and reports the mean
+interval width and confidence it produces.
+
+Run from backend root:
+    python benchmarks/bench_interval_modes.py --bars 500 --days 7 --repeats 20
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.forecast import HAS_PROPHET, INTERVAL_MODES, ForecastService  # noqa: E402
+
+logging.getLogger("cmdstanpy").disabled = True
+
+
+def synthetic_series(bars: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    idx = pd.bdate_range("2022-01-03", periods=bars)
+    close = 18000 * np.exp(np.cumsum(rng.normal(0.0003, 0.009, bars)))
+    return pd.DataFrame({"Close": close}, index=idx)
+
+
+def run(bars: int, days: int, repeats: int) -> None:
+    df = synthetic_series(bars)
+    print(f"bars={bars} horizon={days} repeats={repeats}")
+    print(f"{'mode':<10}{'train ms':>10}{'predict p50 ms':>16}{'mean width':>12}{'confidence':>12}")
+    for mode in INTERVAL_MODES:
+        svc = ForecastService(warm_start=False, interval_mode=mode)
+        t0 = time.perf_counter()
+        svc.train_model(df)
+        train_ms = (time.perf_counter() - t0) * 1000
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            out = svc.forecast(days)
+            times.append((time.perf_counter() - t0) * 1000)
+        width = float((out["yhat_upper"] - out["yhat_lower"]).mean())
+        print(f"{mode:<10}{train_ms:>10.1f}{np.median(times):>16.2f}{width:>12.2f}{out['confidence'].mean():>12.4f}")
+
+
+if __name__ == "__main__":
+    if not HAS_PROPHET:
+        sys.exit("Prophet not installed; nothing to benchmark")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run(args.bars, args.days, args.repeats)
@@ -0,0 +1,93 @@
+"""
+Benchmark: linear (hashing + logistic regression) sentiment model vs VADER.
+
+Trains LinearSentimentModel on synthetic finance headlines whose label comes
+from the finance meaning of the phrase ("rate cut", "inflation cools" are
+positive for markets), then scores --n held-out headlines cold (feature
+extraction + matrix product) and again warm (per-headline cache), next to
+serial VADER. PASS if the cold batch takes under a second.
+
+Run from backend root:
+    python benchmarks/bench_linear_sentiment.py --n 10000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment.batch import clean_text, polarity_scores  # noqa: E402
+from app.sentiment.linear_model import LinearSentimentModel, train  # noqa: E402
+
+SUBJECTS = ["RBI", "Sensex", "Nifty", "Rupee", "SBI", "Infosys", "India GDP", "Bank stocks", "FPIs", "Auto sales"]
+PHRASES = {
+    "positive": ["announces rate cut", "as inflation cools", "surges to record high", "beats estimates",
+                 "rallies on strong inflows", "upgraded by Moody's", "growth accelerates", "deficit narrows"],
+    "negative": ["hikes repo rate again", "as inflation spikes", "slumps to year low", "misses estimates",
+                 "hit by heavy outflows", "downgraded on weak outlook", "growth slows", "deficit widens"],
+    "neutral": ["holds policy meeting", "releases monthly data", "to announce results on Friday",
+                "trades flat", "unchanged in early trade", "board meets today"],
+}
+TAILS = ["", " amid global cues", " in Mumbai", " - Economic Times", " - Mint", " this week"]
+
+
+def make(n: int, rng):
+    labels = rng.choice(list(PHRASES), n)
+    texts = [f"{rng.choice(SUBJECTS)} {rng.choice(PHRASES[y])}{rng.choice(TAILS)} {i}"
+             for i, y in enumerate(labels)]
+    return texts, list(labels)
+
+
+def vader_label(s):
+    c = 0.0 if s is None else s[0]
+    return "positive" if c >= 0.05 else ("negative" if c <= -0.05 else "neutral")
+
+
+def run(n: int) -> int:
+    rng = np.random.default_rng(0)
+    train_x, train_y = make(3000, rng)
+    test_x, test_y = make(n, rng)
+    cleaned = [clean_text(t) for t in test_x]
+
+    t0 = time.perf_counter()
+    model = train(train_x, train_y)
+    fit = time.perf_counter() - t0
+    path = os.path.join(tempfile.mkdtemp(), "sentiment_linear.joblib")
+    model.save(path)
+    t0 = time.perf_counter()
+    model = LinearSentimentModel.load(path)
+    load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cold = model.score(cleaned)
+    cold_t = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    warm = model.score(cleaned)
+    warm_t = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vader = polarity_scores(cleaned, clean=False, workers=1)
+    vader_t = time.perf_counter() - t0
+
+    lin_acc = np.mean([vader_label(s) == y for s, y in zip(cold, test_y)])
+    vad_acc = np.mean([vader_label(s) == y for s, y in zip(vader, test_y)])
+    print(f"n={n} train={len(train_x)} fit {fit:.2f}s load {load * 1000:.0f} ms ({model.version})")
+    print(f"linear cold      {cold_t * 1000:8.1f} ms   accuracy {lin_acc:.3f}")
+    print(f"linear cached    {warm_t * 1000:8.1f} ms")
+    print(f"vader (serial)   {vader_t * 1000:8.1f} ms   accuracy {vad_acc:.3f}")
+    for text in ["RBI announces rate cut", "Rupee gains as inflation cools", "RBI hikes repo rate again"]:
+        print(f"  {text!r:36} vader {vader_label(polarity_scores([text])[0]):8} "
+              f"linear {vader_label(model.score([clean_text(text)])[0])}")
+    ok = cold_t < 1.0 and cold == warm
+    print("PASS: 10k-scale batch under 1s, cache consistent" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=10_000)
+    args = parser.parse_args()
+    sys.exit(run(args.n))
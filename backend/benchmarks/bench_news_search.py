@@ -0,0 +1,97 @@
+"""
+Benchmark: headline search, LIKE scan vs FTS5 index.
+
+Fills a temporary SQLite news_data table with --rows synthetic headlines,
+builds the FTS index (services/news_search.setup_news_fts) and times
+search_news for a few queries with and without it. The FTS results for a
+date-sorted query must match the LIKE results word-for-word.
+
+Run from backend root:
+    python benchmarks/bench_news_search.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import Base  # noqa: E402
+from models import NewsData  # noqa: E402,F401
+from services import news_search  # noqa: E402
+
+WORDS = ("sensex nifty rupee inflation gst repo rate rbi bank growth exports crude "
+         "budget deficit fdi markets rally slump policy outlook tax").split()
+SOURCES = ["Mint", "Economic Times", "Business Standard", "Moneycontrol", "Reuters"]
+QUERIES = ["repo rate", "gst", "inflation outlook", "rupee slump"]
+
+
+def fill(engine, rows: int, rng) -> None:
+    """Six-word headlines: mostly filler vocabulary, topic words ~2% of tokens (as in real archives)."""
+    start = date(2015, 1, 1)
+    filler = ["".join(rng.choice(list("bdhjqvwxz0123456789"), 7)) for _ in range(20_000)]  # no topic substrings
+    words = np.array(WORDS + filler)
+    with engine.begin() as conn:
+        for lo in range(0, rows, 50_000):
+            n = min(50_000, rows - lo)
+            idx = np.where(rng.random((n, 6)) < 0.02, rng.integers(0, len(WORDS), (n, 6)),
+                           len(WORDS) + rng.integers(0, len(filler), (n, 6)))
+            picks = words[idx]
+            days = rng.integers(0, 3650, n)
+            scores = rng.uniform(-1, 1, n)
+            srcs = rng.integers(0, len(SOURCES), n)
+            conn.execute(
+                text("INSERT INTO news_data (headline, source, date, sentiment_score) VALUES (:h, :s, :d, :c)"),
+                [{"h": " ".join(p), "s": SOURCES[srcs[i]], "d": start + timedelta(days=int(days[i])),
+                  "c": float(scores[i])} for i, p in enumerate(picks)],
+            )
+
+
+def timed(db, q, **kw):
+    t0 = time.perf_counter()
+    hits, _ = news_search.search_news(db, q, **kw)
+    return (time.perf_counter() - t0) * 1000, hits
+
+
+def run(rows: int, limit: int) -> int:
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), "bench_news.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine, tables=[NewsData.__table__])
+    t0 = time.perf_counter()
+    fill(engine, rows, rng)
+    print(f"rows={rows} insert {time.perf_counter() - t0:.1f}s")
+    t0 = time.perf_counter()
+    news_search.setup_news_fts(engine)
+    print(f"fts build            {time.perf_counter() - t0:9.2f} s")
+    db = sessionmaker(bind=engine)()
+
+    ok = True
+    for q in QUERIES:
+        news_search._fts_enabled["sqlite"] = False
+        like_ms, like_hits = timed(db, q, sort="date", limit=limit)
+        news_search._fts_enabled["sqlite"] = True
+        fts_date_ms, fts_hits = timed(db, q, sort="date", limit=limit)
+        fts_rank_ms, _ = timed(db, q, sort="relevance", limit=limit)
+        same = [h["id"] for h in like_hits] == [h["id"] for h in fts_hits]
+        ok &= same
+        print(f"{q!r:20} like {like_ms:8.1f} ms  fts(date) {fts_date_ms:7.1f} ms  "
+              f"fts(rank) {fts_rank_ms:7.1f} ms  {'same' if same else 'DIFFERENT'}")
+    db.close()
+    print("PASS: FTS results match LIKE scan" if ok else "FAIL: results differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(run(args.rows, args.limit))
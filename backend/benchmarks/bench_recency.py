@@ -0,0 +1,72 @@
+"""
+Benchmark: per-article timestamp parsing vs parse-once + vectorized recency weights.
+
+"before" re-parses every RSS `published` string with dateutil for the recency
+weight and again for the date-range filter (the old analyzer path). "after"
+parses once into epoch seconds (as ingest now does) and computes weights and
+the filter mask as array operations.
+
+Run from backend root:
+    python benchmarks/bench_recency.py --articles 20000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment.timestamps import range_mask, recency_weights, to_epoch  # noqa: E402
+
+
+def _old_weight(published: str, now: datetime) -> float:
+    from dateutil import parser
+    dt = parser.parse(published)
+    age_hours = (now - dt.replace(tzinfo=None)).total_seconds() / 3600
+    if age_hours <= 24:
+        return 1.0
+    if age_hours <= 72:
+        return 0.9
+    if age_hours <= 168:
+        return 0.7
+    return 0.5
+
+
+def run(n: int) -> int:
+    now = datetime.utcnow()
+    rng = np.random.default_rng(0)
+    pubs = [(now - timedelta(hours=float(h))).strftime("%a, %d %b %Y %H:%M:%S GMT")
+            for h in rng.uniform(0, 400, n)]
+    date_from = now - timedelta(days=7)
+
+    from dateutil import parser
+    t0 = time.perf_counter()
+    old_w = [_old_weight(p, now) for p in pubs]
+    old_keep = [parser.parse(p).replace(tzinfo=None) >= date_from for p in pubs]
+    before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ts = np.array([to_epoch(p) for p in pubs])  # once, at ingest
+    ingest = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new_w = recency_weights(ts, now=to_epoch(now), mode="step")
+    new_keep = range_mask(ts, date_from=date_from)
+    after = time.perf_counter() - t0
+
+    print(f"articles={n}")
+    print(f"before (dateutil per article, twice) {before * 1000:9.1f} ms")
+    print(f"after  parse once at ingest          {ingest * 1000:9.1f} ms")
+    print(f"after  weights + filter per request  {after * 1000:9.2f} ms")
+    ok = np.allclose(old_w, new_w) and list(new_keep) == old_keep
+    print("PASS: identical weights and filter" if ok else "FAIL: results differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20_000)
+    args = parser.parse_args()
+    sys.exit(run(args.articles))
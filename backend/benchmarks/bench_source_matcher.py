@@ -0,0 +1,80 @@
+"""
+Benchmark: source-credibility lookup, linear substring scan vs compiled matcher.
+
+Builds a synthetic outlet table of --outlets names, then weighs --lookups
+source strings with the original loop (substring test per outlet) and with
+SourceWeightMatcher (Aho-Corasick, uncached and cached), checking all agree.
+
+Run from backend root:
+    python benchmarks/bench_source_matcher.py --outlets 5000 --lookups 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment.source_matcher import DEFAULT_SOURCE_WEIGHT, SourceWeightMatcher  # noqa: E402
+
+SYLLABLES = "ka ra ma na ta pa sa la va da ga ha ja ba ya ti ri ni mi si".split()
+SUFFIXES = ["times", "news", "daily", "post", "herald", "express", "chronicle", "today", "live", "wire"]
+
+
+def outlet_table(n: int, rng) -> dict:
+    table = {}
+    while len(table) < n:
+        stem = "".join(rng.choice(SYLLABLES, rng.integers(2, 5)))
+        table[f"{stem} {rng.choice(SUFFIXES)}"] = round(float(rng.uniform(0.3, 1.0)), 2)
+    return table
+
+
+def linear(source: str, table: dict) -> float:
+    s = source.lower()
+    for key, w in table.items():
+        if key in s:
+            return w
+    return DEFAULT_SOURCE_WEIGHT
+
+
+def run(outlets: int, lookups: int, distinct: int) -> int:
+    rng = np.random.default_rng(0)
+    table = outlet_table(outlets, rng)
+    names = list(table)
+    pool = [f"The {names[i].title()}" if i % 3 else f"{names[i]} online" for i in rng.integers(0, outlets, distinct)]
+    pool += ["Unknown Blog", "Google News", ""]
+    sources = [pool[i] for i in rng.integers(0, len(pool), lookups)]
+
+    t0 = time.perf_counter()
+    matcher = SourceWeightMatcher(list(table.items()))
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected = [linear(s, table) for s in sources]
+    lin = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    uncached = [matcher._weight(s) for s in sources]
+    ac = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cached = [matcher.weight(s) for s in sources]
+    hit = time.perf_counter() - t0
+
+    print(f"outlets={outlets} lookups={lookups} distinct sources={len(pool)}")
+    print(f"build automaton       {build * 1000:9.1f} ms")
+    print(f"linear scan           {lin * 1000:9.1f} ms")
+    print(f"aho-corasick          {ac * 1000:9.1f} ms")
+    print(f"aho-corasick + cache  {hit * 1000:9.1f} ms")
+    ok = expected == uncached == cached
+    print("PASS: identical weights" if ok else "FAIL: weights differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--outlets", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+    sys.exit(run(args.outlets, args.lookups, args.distinct))
@@ -0,0 +1,109 @@
+"""
+Benchmark: vectorized stability backfill vs per-date compute_and_store.
+
+Fills a temporary SQLite database with --years of NIFTY closes (weekdays) and
+~--news-per-day scored headlines, rebuilds stability_score and
+stability_history for the whole range with services/stability_backfill, then
+runs compute_and_store on --sample dates (timed, extrapolated to the full
+range, reading the volatility_daily series services/market_service builds) and
+checks every component matches. PASS if the full backfill takes
+under 10 s, all sampled dates agree and the shipped macro history supplies a
+current CPI inflation value (macro_value("inflation") is not None).
+
+Run from backend root:
+    python benchmarks/bench_stability_backfill.py --years 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database.base import Base as V2Base  # noqa: E402
+from app.database.models import StabilityHistory, VolatilityDaily  # noqa: E402
+from app.utils.macro import macro_value  # noqa: E402
+from database import Base  # noqa: E402
+from models import StabilityScore  # noqa: E402
+from services.market_service import store_volatility  # noqa: E402
+from services.stability_backfill import backfill_stability  # noqa: E402
+from services.stability_service import compute_and_store  # noqa: E402
+
+
+def fill(engine, years: int, news_per_day: int, rng) -> date:
+    start = date.today() - timedelta(days=365 * years)
+    days = [start + timedelta(days=i) for i in range(365 * years)]
+    trading = [d for d in days if d.weekday() < 5]
+    closes = 8000 * np.exp(np.cumsum(rng.normal(0.0003, 0.011, len(trading))))
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO market_data (date, nifty_close) VALUES (:d, :c)"),
+                     [{"d": d, "c": float(c)} for d, c in zip(trading, closes)])
+        counts = rng.poisson(news_per_day, len(days))
+        news = [{"h": f"headline {i} {j}", "d": d, "c": float(np.clip(rng.normal(0.05, 0.4), -1, 1))}
+                for i, (d, n) in enumerate(zip(days, counts)) for j in range(n)]
+        for lo in range(0, len(news), 50_000):
+            conn.execute(text("INSERT INTO news_data (headline, date, sentiment_score) VALUES (:h, :d, :c)"),
+                         news[lo:lo + 50_000])
+    return start
+
+
+def run(years: int, news_per_day: int, sample: int) -> int:
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), "bench_backfill.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    V2Base.metadata.create_all(bind=engine, tables=[StabilityHistory.__table__, VolatilityDaily.__table__])
+    Session = sessionmaker(bind=engine)
+    start = fill(engine, years, news_per_day, rng)
+    with Session() as db:
+        store_volatility(db)
+
+    db, history = Session(), Session()
+    t0 = time.perf_counter()
+    stats = backfill_stability(db, start, date.today(), history_db=history, overwrite=True)
+    backfill_t = time.perf_counter() - t0
+    stored = {r.date: r for r in db.query(StabilityScore)}
+    db.expunge_all()
+
+    dates = sorted(stored)
+    picks = [dates[int(i)] for i in rng.choice(len(dates), min(sample, len(dates)), replace=False)]
+    picks += dates[:40]  # short-history edge cases
+    mismatches = 0
+    t0 = time.perf_counter()
+    for d in picks:
+        res = compute_and_store(db, d)
+        b = stored[d]
+        if (res["market_score"], res["sentiment_score"], res["volatility_score"], res["score"], res["category"]) != \
+                (b.market_score, b.sentiment_score, b.volatility_score, b.final_score, b.category):
+            mismatches += 1
+            print(f"  mismatch {d}: loop {res} backfill {b.final_score}")
+    loop_t = (time.perf_counter() - t0) / len(picks) * len(dates)
+
+    print(f"{stats['dates']} dates, {stats['history_rows']} history rows "
+          f"(load {stats['load_sec']}s, compute {stats['compute_sec']}s, write {stats['write_sec']}s)")
+    print(f"backfill            {backfill_t:8.2f} s")
+    print(f"per-date loop (est) {loop_t:8.2f} s   ({len(picks)} dates sampled)")
+    print(f"mismatches: {mismatches}")
+    cpi = macro_value("inflation")
+    print(f"current CPI inflation: {cpi}")
+    ok = backfill_t < 10 and mismatches == 0 and cpi is not None
+    print("PASS: full history in seconds, matches compute_and_store" if ok else "FAIL")
+    db.close()
+    history.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--news-per-day", type=int, default=20)
+    parser.add_argument("--sample", type=int, default=300)
+    args = parser.parse_args()
+    sys.exit(run(args.years, args.news_per_day, args.sample))
@@ -0,0 +1,71 @@
+"""
+Benchmark: stability scenario grid, per-scenario calculate() vs evaluate_scenarios.
+
+Builds a --rows what-if grid (momentum x sentiment shock x volatility x
+inflation x two weightings), scores it once with a Python loop over
+StabilityScoreService.calculate (explanation built every time) and once with
+the vectorized scenario service, with and without explanations. PASS if the
+vectorized grid is at least 3x faster and every score/category matches.
+
+Run from backend root:
+    python benchmarks/bench_stability_scenarios.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.stability import FACTORS, StabilityScoreService  # noqa: E402
+from app.services.scenario_service import evaluate_scenarios  # noqa: E402
+from app.utils.stability_helpers import inflation_score_0_100  # noqa: E402
+
+
+def run(rows: int) -> int:
+    side = max(2, int(round((rows / 2) ** 0.25)))
+    axes = {
+        "market_momentum": np.linspace(0, 100, side).round(2).tolist(),
+        "sentiment_shock": np.linspace(-30, 30, side).round(2).tolist(),
+        "volatility_inverse": np.linspace(0, 100, side).round(2).tolist(),
+        "inflation_rate": np.linspace(1, 9, side).round(2).tolist(),
+        "weights": [{}, {"sentiment": 0.5, "liquidity": 0.0}],
+    }
+    svc = StabilityScoreService()
+    baseline = dict(zip(FACTORS, [50.0, 55.0, 50.0, 87.5, 50.0]))
+
+    t0 = time.perf_counter()
+    res = evaluate_scenarios(baseline, axes, svc)
+    vec_t = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    evaluate_scenarios(baseline, axes, svc, explain=True)
+    vec_ex_t = time.perf_counter() - t0
+
+    # Loop baseline: default weighting only (calculate() has fixed weights); time scaled to the full grid
+    cols = res["columns"]
+    default_rows = [i for i, w in enumerate(cols["weights"]) if w == 0]
+    t0 = time.perf_counter()
+    loop = [svc.calculate(cols["market_momentum"][i], baseline["sentiment"] + cols["sentiment_shock"][i],
+                          cols["volatility_inverse"][i], inflation_score_0_100(cols["inflation_rate"][i]),
+                          baseline["liquidity"]) for i in default_rows]
+    loop_t = (time.perf_counter() - t0) * res["count"] / len(default_rows)
+    mismatches = sum(o["stability_score"] != cols["stability_score"][i] or o["category"] != cols["category"][i]
+                     for o, i in zip(loop, default_rows))
+
+    print(f"grid {res['shape']} = {res['count']} scenarios")
+    print(f"calculate() loop (est) {loop_t * 1000:8.1f} ms")
+    print(f"vectorized             {vec_t * 1000:8.1f} ms")
+    print(f"vectorized + explain   {vec_ex_t * 1000:8.1f} ms")
+    print(f"mismatches: {mismatches}")
+    ok = mismatches == 0 and loop_t / vec_t >= 3
+    print(f"PASS: {loop_t / vec_t:.1f}x faster, identical scores" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    sys.exit(run(args.rows))
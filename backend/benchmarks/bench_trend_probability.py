@@ -0,0 +1,58 @@
+"""
+Benchmark: Monte-Carlo trend probability engine latency and calibration.
+
+Checks the hot-path budget (default 10k paths × 30 days < 50 ms) and, on a
+driftless random walk, that the uptrend probability sits near 50%.
+
+Run from backend root:
+    python benchmarks/bench_trend_probability.py --paths 10000 --horizon 30
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.trend_probability import (  # noqa: E402
+    DEFAULT_BUDGET_MS,
+    TrendProbabilityEngine,
+    log_return_residuals,
+)
+
+
+def run(paths: int, horizon: int, repeats: int, budget_ms: float) -> int:
+    rng = np.random.default_rng(0)
+    closes = 20000 * np.exp(np.cumsum(rng.normal(0, 0.01, 750)))
+    residuals = log_return_residuals(closes)
+    flat_yhat = np.full(horizon, closes[-1])
+
+    # budget_ms=inf: measure the requested path count without adaptive halving
+    engine = TrendProbabilityEngine(n_paths=paths, budget_ms=float("inf"), seed=1)
+    engine.simulate(closes[-1], flat_yhat, residuals)  # warm-up
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = engine.simulate(closes[-1], flat_yhat, residuals)
+        times.append((time.perf_counter() - t0) * 1000)
+
+    p50, p95 = np.percentile(times, [50, 95])
+    print(f"paths={paths} horizon={horizon} repeats={repeats}")
+    print(f"latency p50 {p50:7.2f} ms   p95 {p95:7.2f} ms   budget {budget_ms:.0f} ms")
+    print(f"driftless uptrend probability: {out['uptrend_probability']}% (expect ~50%)")
+    print(f"drawdown >= {out['drawdown_threshold']:.0%} probability: {out['drawdown_probability']}%")
+    ok = p50 < budget_ms
+    print("PASS" if ok else "FAIL: over budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+    sys.exit(run(args.paths, args.horizon, args.repeats, args.budget_ms))
@@ -0,0 +1,84 @@
+"""
+Benchmark: cold-start vs warm-start Prophet refits.
+
+Simulates nightly retraining: the series grows by one bar per "day" and the
+forecaster is refit each time. Cold = fresh ForecastService per day;
+warm = one ForecastService reused, so each fit starts from the previous optimum.
+
+Run from backend root:
+    python benchmarks/bench_warm_start.py --bars 500 --days 10 --assets 3
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.forecast import ForecastService, HAS_PROPHET, warm_start_params  # noqa: E402
+
+logging.getLogger("cmdstanpy").disabled = True
+logging.getLogger("prophet").setLevel(logging.WARNING)
+
+
+def synthetic_series(bars: int, seed: int) -> pd.DataFrame:
+    """Random-walk close prices on business days (NIFTY-like level)."""
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2022-01-03", periods=bars)
+    close = 18000 * np.exp(np.cumsum(rng.normal(0.0003, 0.009, bars)))
+    return pd.DataFrame({"Close": close}, index=idx)
+
+
+def param_diff(a: dict, b: dict) -> float:
+    """Max absolute difference across k, m, sigma_obs, delta, beta."""
+    diffs = []
+    for key in ("k", "m", "sigma_obs", "delta", "beta"):
+        diffs.append(float(np.max(np.abs(np.asarray(a[key]) - np.asarray(b[key])))))
+    return max(diffs)
+
+
+def run(bars: int, days: int, assets: int) -> None:
+    cold_times, warm_times, diffs, yhat_diffs = [], [], [], []
+    for asset in range(assets):
+        df = synthetic_series(bars + days, seed=asset)
+        warm = ForecastService(warm_start=True)
+        warm.train_model(df.iloc[:bars])  # initial cold fit, not timed
+        for day in range(1, days + 1):
+            window = df.iloc[: bars + day]
+
+            cold = ForecastService(warm_start=False)
+            t0 = time.perf_counter()
+            cold.train_model(window)
+            cold_times.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            warm.train_model(window)
+            warm_times.append(time.perf_counter() - t0)
+
+            diffs.append(param_diff(warm_start_params(cold.model), warm_start_params(warm.model)))
+            yhat_diffs.append(
+                float(np.max(np.abs(cold.forecast(7)["yhat"].values - warm.forecast(7)["yhat"].values)))
+            )
+
+    cold_total, warm_total = sum(cold_times), sum(warm_times)
+    print(f"assets={assets} bars={bars} refits/asset={days}")
+    print(f"cold  total {cold_total:8.3f}s  mean {np.mean(cold_times) * 1000:8.1f} ms/fit")
+    print(f"warm  total {warm_total:8.3f}s  mean {np.mean(warm_times) * 1000:8.1f} ms/fit")
+    print(f"speedup     {cold_total / max(warm_total, 1e-9):8.2f}x")
+    print(f"max |param diff| (scaled space): {max(diffs):.6f}")
+    print(f"max |yhat diff| over 7-day forecast: {max(yhat_diffs):.4f}")
+
+
+if __name__ == "__main__":
+    if not HAS_PROPHET:
+        sys.exit("Prophet not installed; nothing to benchmark")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--assets", type=int, default=3)
+    args = parser.parse_args()
+    run(args.bars, args.days, args.assets)
@@ -32,5 +32,24 @@ def get_db():
 
 
 def init_db():
-    from models import MarketData, NewsData, StabilityScore
+    from models import MarketData, NewsData, NewsDailyAggregate, StabilityScore
+    from app.database.models import LiquidityDaily, VolatilityDaily
     Base.metadata.create_all(bind=engine)
+    VolatilityDaily.__table__.create(bind=engine, checkfirst=True)
+    LiquidityDaily.__table__.create(bind=engine, checkfirst=True)
+    # create_all skips indexes on tables that already exist
+    for index in NewsData.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    from app.database.base import add_missing_columns
+    add_missing_columns(engine, NewsData.__table__)
+    add_missing_columns(engine, MarketData.__table__)
+    from services.news_search import setup_news_fts
+    setup_news_fts(engine)
+    # Fold closes/volumes stored before volatility_daily/liquidity_daily existed into the incremental series
+    from services.market_service import store_liquidity, store_volatility
+    db = SessionLocal()
+    try:
+        store_volatility(db)
+        store_liquidity(db)
+    finally:
+        db.close()
@@ -4,6 +4,8 @@ FastAPI with CORS, clean endpoints.
 """
 import logging
 from contextlib import asynccontextmanager
+from datetime import date
+from typing import Dict, Optional
 
 from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
@@ -20,10 +22,13 @@ from schemas import (
     ForecastPoint,
 )
 from services.market_service import fetch_and_store_market_data, get_latest_market
-from services.news_service import fetch_and_store_news, get_news
+from services.news_service import fetch_and_store_news, get_news_page
+from services.news_search import SEARCH_SORTS, search_news
 from services.sentiment_service import get_sentiment_today
-from services.stability_service import compute_and_store, get_latest
+from services.stability_service import apply_profile, compute_and_store, get_latest
 from services.forecast_service import get_7day_forecast
+from app.sentiment.backends import get_backend
+from app.utils.forecast_payload import FORECAST_FORMATS
 from sqlalchemy.orm import Session
 
 logging.basicConfig(level=logging.INFO)
@@ -74,6 +79,7 @@ def root():
             "GET /stability/latest",
             "GET /forecast/7days",
             "GET /news?filter=positive|negative|all",
+            "GET /news?q=repo+rate&sort=relevance|date&cursor=",
             "POST /refresh",
             "GET /health",
         ],
@@ -122,14 +128,28 @@ def sentiment_today(db: Session = Depends(get_db)):
     )
 
 
-@app.get("/stability/latest", response_model=StabilityLatestResponse)
-def stability_latest(db: Session = Depends(get_db)):
+def _latest_stability(db: Session, profile: Optional[str]) -> Dict:
+    """Latest stored stability (computed if none), re-scored when another weight profile is asked for."""
     data = get_latest(db)
     if not data:
         compute_and_store(db)
         data = get_latest(db)
     if not data:
         raise HTTPException(status_code=503, detail="No stability data")
+    if profile:
+        try:
+            data = apply_profile(data, profile)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return data
+
+
+@app.get("/stability/latest", response_model=StabilityLatestResponse)
+def stability_latest(
+    profile: Optional[str] = Query(None, description="Weight profile to score with (default: legacy)"),
+    db: Session = Depends(get_db),
+):
+    data = _latest_stability(db, profile)
     return StabilityLatestResponse(
         status="success",
         score=data["score"],
@@ -138,15 +158,23 @@ def stability_latest(db: Session = Depends(get_db)):
         sentiment_score=data["sentiment_score"],
         volatility_score=data["volatility_score"],
         date=data["date"],
+        profile=data.get("profile"),
     )
 
 
 @app.get("/forecast/7days", response_model=Forecast7DaysResponse)
-def forecast_7days(db: Session = Depends(get_db)):
-    result = get_7day_forecast(db)
+def forecast_7days(
+    format: str = Query("points", description="points | columnar (parallel arrays for charts)"),
+    db: Session = Depends(get_db),
+):
+    if format not in FORECAST_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(FORECAST_FORMATS)}")
+    columnar = format == "columnar"
+    result = get_7day_forecast(db, columnar=columnar)
     return Forecast7DaysResponse(
         status="success",
-        forecast=[ForecastPoint(**p) for p in result["forecast"]],
+        forecast=[] if columnar else [ForecastPoint(**p) for p in result["forecast"]],
+        columns=result.get("columns") if columnar else None,
         current_value=result["current_value"],
         mae=result.get("mae"),
         rmse=result.get("rmse"),
@@ -154,15 +182,57 @@ def forecast_7days(db: Session = Depends(get_db)):
     )
 
 
+def _label(score: Optional[float]) -> str:
+    s = score or 0
+    return "positive" if s > 0.05 else ("negative" if s < -0.05 else "neutral")
+
+
 @app.get("/news", response_model=NewsListResponse)
 def news_list(
     filter: str = Query("all", description="positive|negative|neutral|all"),
+    q: Optional[str] = Query(None, description="Full-text search, e.g. 'repo rate' or 'GST'"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    source: Optional[str] = Query(None),
+    sort: str = Query("relevance", description="relevance|date (search only)"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (default 20 for search, 50 otherwise)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    rows = get_news(db, filter_sentiment=None if filter == "all" else filter)
-    if not rows:
-        fetch_and_store_news(db)
-        rows = get_news(db, filter_sentiment=None if filter == "all" else filter)
+    sentiment = None if filter == "all" else filter
+    if q:
+        limit = limit or 20
+        if sort not in SEARCH_SORTS:
+            raise HTTPException(status_code=400, detail=f"sort must be one of {list(SEARCH_SORTS)}")
+        try:
+            hits, next_cursor = search_news(
+                db, q, sentiment=sentiment, date_from=date_from, date_to=date_to,
+                source=source, sort=sort, limit=limit, cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        items = [
+            NewsItem(
+                id=h["id"],
+                headline=h["headline"],
+                source=h["source"],
+                date=h["date"].isoformat(),
+                sentiment_score=h["sentiment_score"],
+                sentiment_label=_label(h["sentiment_score"]),
+                link=h["link"],
+                rank=h["rank"],
+            )
+            for h in hits
+        ]
+        return NewsListResponse(status="success", news=items, filter=filter, query=q, next_cursor=next_cursor)
+
+    try:
+        rows, next_cursor = get_news_page(db, filter_sentiment=sentiment, limit=limit or 50, cursor=cursor)
+        if not rows and not cursor:
+            fetch_and_store_news(db)
+            rows, next_cursor = get_news_page(db, filter_sentiment=sentiment, limit=limit or 50)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     items = [
         NewsItem(
             id=r.id,
@@ -170,11 +240,11 @@ def news_list(
             source=r.source,
             date=r.date.isoformat(),
             sentiment_score=r.sentiment_score,
-            sentiment_label="positive" if (r.sentiment_score or 0) > 0.05 else ("negative" if (r.sentiment_score or 0) < -0.05 else "neutral"),
+            sentiment_label=_label(r.sentiment_score),
         )
         for r in rows
     ]
-    return NewsListResponse(status="success", news=items, filter=filter)
+    return NewsListResponse(status="success", news=items, filter=filter, next_cursor=next_cursor)
 
 
 @app.post("/refresh")
@@ -249,14 +319,21 @@ def forecast_legacy(db: Session = Depends(get_db)):
 
 
 @app.get("/sentiment")
-def sentiment_legacy(db: Session = Depends(get_db)):
+def sentiment_legacy(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
     agg = get_sentiment_today(db)
-    if agg["total_articles"] == 0:
+    if agg["total_articles"] == 0 and not cursor:
         fetch_and_store_news(db)
         agg = get_sentiment_today(db)
-    rows = get_news(db, filter_sentiment=None, limit=50)
+    try:
+        rows, next_cursor = get_news_page(db, filter_sentiment=None, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     articles = [
-        {"title": r.headline, "source": r.source, "link": r.link, "sentiment": {"compound": r.sentiment_score or 0, "label": "positive" if (r.sentiment_score or 0) > 0.05 else ("negative" if (r.sentiment_score or 0) < -0.05 else "neutral")}}
+        {"title": r.headline, "source": r.source, "link": r.link, "sentiment": {"compound": r.sentiment_score or 0, "label": _label(r.sentiment_score)}}
         for r in rows
     ]
     return {
@@ -264,18 +341,17 @@ def sentiment_legacy(db: Session = Depends(get_db)):
         "sentiment_score": round((agg["average_score"] + 1) / 2 * 100, 2),
         "aggregate": agg,
         "articles": articles,
-        "analyzer": "VADER",
+        "next_cursor": next_cursor,
+        "analyzer": get_backend().name,
     }
 
 
 @app.get("/stability-score")
-def stability_legacy(db: Session = Depends(get_db)):
-    data = get_latest(db)
-    if not data:
-        compute_and_store(db)
-        data = get_latest(db)
-    if not data:
-        raise HTTPException(status_code=503, detail="No stability data")
+def stability_legacy(
+    profile: Optional[str] = Query(None, description="Weight profile to score with (default: legacy)"),
+    db: Session = Depends(get_db),
+):
+    data = _latest_stability(db, profile)
     ms, ss, vs = data["market_score"], data["sentiment_score"], data["volatility_score"]
     interp = f"{data['category']}: Market strength {ms:.0f}%, sentiment {ss:.0f}%, volatility {vs:.0f}%."
     return {
@@ -284,6 +360,7 @@ def stability_legacy(db: Session = Depends(get_db)):
         "category": data["category"],
         "interpretation": interp,
         "components": {"market_trend": round(ms, 1), "sentiment": round(ss, 1), "economic_indicators": round(vs, 1)},
+        "profile": data.get("profile"),
     }
 
 
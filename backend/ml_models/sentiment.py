@@ -7,6 +7,8 @@ from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import re
 from typing import List, Dict
 
+from app.sentiment.batch import analyze_texts
+
 
 class SentimentAnalyzer:
     """
@@ -67,8 +69,9 @@ class SentimentAnalyzer:
     def analyze_batch(self, texts: List[str]) -> List[Dict]:
         """
         Analyze sentiment for multiple headlines
+        (large batches are split across a process pool, order preserved)
         """
-        return [self.analyze_single(text) for text in texts]
+        return analyze_texts(texts)
 
     # --------------------------------------------------
     # Aggregate Sentiment
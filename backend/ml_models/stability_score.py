@@ -3,22 +3,24 @@ Economic Stability Score Calculator
 Combines market trends, sentiment, and economic indicators
 """
 
+from datetime import date
 from typing import Dict, Optional
 
+from app.ml.stability_profiles import CATEGORIES, get_profile
+
 
 class StabilityScoreCalculator:
     """
     Calculates Economic Stability Score (0–100)
+    Weights and thresholds: the "classic" profile (app/ml/stability_profiles.py)
     """
 
-    STABLE_THRESHOLD = 71
-    MODERATE_THRESHOLD = 41
-
-    def __init__(self):
+    def __init__(self, profile: str = "classic"):
+        self.profile = get_profile(profile)
         self.weights = {
-            "market_trend": 0.40,
-            "sentiment": 0.30,
-            "economic_indicators": 0.30,
+            "market_trend": self.profile.weight("market_momentum"),
+            "sentiment": self.profile.weight("sentiment"),
+            "economic_indicators": self.profile.weight("economic_indicators"),
         }
 
     # --------------------------------------------------
@@ -42,14 +44,12 @@ class StabilityScoreCalculator:
         sentiment_score = self._clamp(sentiment_score)
         economic_indicators_score = self._clamp(economic_indicators_score)
 
-        final_score = (
-            market_trend_score * self.weights["market_trend"]
-            + sentiment_score * self.weights["sentiment"]
-            + economic_indicators_score * self.weights["economic_indicators"]
-        )
-
-        stability_score = round(final_score * 100, 2)
-        category = self._get_category(stability_score)
+        stability_score, level = self.profile.evaluate({
+            "market_momentum": market_trend_score * 100,
+            "sentiment": sentiment_score * 100,
+            "economic_indicators": economic_indicators_score * 100,
+        })
+        category = CATEGORIES[level]
 
         return {
             "stability_score": stability_score,
@@ -83,14 +83,6 @@ class StabilityScoreCalculator:
     def _clamp(self, value: float) -> float:
         return max(0.0, min(1.0, value))
 
-    def _get_category(self, score: float) -> str:
-        if score >= self.STABLE_THRESHOLD:
-            return "Stable"
-        elif score >= self.MODERATE_THRESHOLD:
-            return "Moderate"
-        else:
-            return "Unstable"
-
     def _get_interpretation(self, category: str) -> str:
         interpretations = {
             "Stable": "Economic indicators suggest a stable environment with positive market trends.",
@@ -107,10 +99,18 @@ class StabilityScoreCalculator:
 def get_economic_indicators_score(
     inflation_rate: Optional[float] = None,
     repo_rate: Optional[float] = None,
+    as_of: Optional[date] = None,
 ) -> float:
     """
-    Normalize inflation & repo rate into a 0–1 score
+    Normalize inflation & repo rate into a 0–1 score.
+    Missing rates come from the macro store as known on as_of (default today).
     """
+    from app.utils.macro import get_macro_store
+    store = get_macro_store()
+    if inflation_rate is None:
+        inflation_rate = store.value("inflation", as_of)
+    if repo_rate is None:
+        repo_rate = store.value("repo_rate", as_of)
     inflation_rate = inflation_rate if inflation_rate is not None else 4.5
     repo_rate = repo_rate if repo_rate is not None else 6.5
 
@@ -1,6 +1,6 @@
 """
 SQLAlchemy ORM models.
-Tables: market_data, news_data, stability_score.
+Tables: market_data, news_data, news_daily_aggregate, stability_score.
 PostgreSQL-ready (SQLite for now).
 """
 from datetime import date, datetime
@@ -14,10 +14,12 @@ class MarketData(Base):
     __tablename__ = "market_data"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     nifty_close = Column(Float, nullable=True)
     sensex_close = Column(Float, nullable=True)
-    volume = Column(Float, nullable=True)
+    volume = Column(Float, nullable=True)         # NIFTY + SENSEX
+    nifty_volume = Column(Float, nullable=True)
+    sensex_volume = Column(Float, nullable=True)
     nifty_open = Column(Float, nullable=True)
     nifty_high = Column(Float, nullable=True)
     nifty_low = Column(Float, nullable=True)
@@ -36,18 +38,35 @@ class NewsData(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     headline = Column(Text, nullable=False)
     source = Column(String(255), nullable=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     sentiment_score = Column(Float, nullable=True)
     link = Column(Text, nullable=True)
+    analyzer_version = Column(String(64), nullable=True)  # sentiment backend version that scored it
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Keyset pagination order (date DESC, id DESC); also serves plain date lookups
+    __table_args__ = (Index("ix_news_data_date_id", "date", "id"),)
+
+
+class NewsDailyAggregate(Base):
+    """Per-day sentiment running totals, incremented as NewsData rows are inserted."""
+    __tablename__ = "news_daily_aggregate"
+
+    date = Column(Date, primary_key=True)
+    weighted_sum = Column(Float, nullable=False, default=0.0)
+    weight_total = Column(Float, nullable=False, default=0.0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 class StabilityScore(Base):
     """Daily stability score components and final."""
     __tablename__ = "stability_score"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     market_score = Column(Float, nullable=False)
     sentiment_score = Column(Float, nullable=False)
     volatility_score = Column(Float, nullable=False)
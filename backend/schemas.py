@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response.
 """
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,12 +31,16 @@ class NewsItem(BaseModel):
     date: str
     sentiment_score: Optional[float] = None
     sentiment_label: Optional[str] = None
+    link: Optional[str] = None
+    rank: Optional[float] = None  # full-text relevance, only for /news?q=
 
 
 class NewsListResponse(BaseModel):
     status: str = "success"
     news: List[NewsItem]
     filter: Optional[str] = None
+    query: Optional[str] = None
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page
 
 
 # ---------- Sentiment ----------
@@ -59,6 +63,7 @@ class StabilityLatestResponse(BaseModel):
     sentiment_score: float
     volatility_score: float
     date: str
+    profile: Optional[str] = None  # weight profile the score was computed with
 
 
 # ---------- Forecast ----------
@@ -72,6 +77,7 @@ class ForecastPoint(BaseModel):
 class Forecast7DaysResponse(BaseModel):
     status: str = "success"
     forecast: List[ForecastPoint]
+    columns: Optional[Dict[str, list]] = None  # format=columnar: dates/predicted/lower/upper
     current_value: float
     mae: Optional[float] = None
     rmse: Optional[float] = None
@@ -12,6 +12,8 @@ from urllib.parse import quote_plus
 from typing import Dict, List
 import concurrent.futures
 import threading
+import calendar
+import time
 
 
 class DataFetcher:
@@ -325,10 +327,13 @@ class DataFetcher:
 
             articles = []
             for entry in feed.entries[:max_results]:
+                # Parsed once here (UTC epoch); consumers never re-parse "published"
+                parsed = entry.get("published_parsed")
                 articles.append({
                     "title": entry.get("title", ""),
                     "link": entry.get("link", ""),
                     "published": entry.get("published", ""),
+                    "published_ts": float(calendar.timegm(parsed)) if parsed else None,
                     "source": entry.get("source", {}).get("title", "Google News"),
                 })
 
@@ -346,6 +351,7 @@ class DataFetcher:
                 "title": "RBI reviews monetary policy amid inflation concerns",
                 "link": "#",
                 "published": datetime.now().isoformat(),
+                "published_ts": time.time(),
                 "source": "Sample News",
             }
         ]
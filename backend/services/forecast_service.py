@@ -9,6 +9,9 @@ import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
+from app.ml.forecast import fill_intervals, interval_prophet_kwargs, residual_sigma
+from app.ml.tuning import resolve_config
+from app.utils.forecast_payload import columns_to_points, forecast_columns
 from services.market_service import get_historical_dataframe
 
 logger = logging.getLogger(__name__)
@@ -43,12 +46,8 @@ def _train_and_forecast(
     n = len(prophet_df)
     test_size = max(1, int(n * TEST_RATIO))
     train = prophet_df.iloc[:-test_size]
-    model = Prophet(
-        daily_seasonality=True,
-        weekly_seasonality=True,
-        yearly_seasonality=False,
-        changepoint_prior_scale=0.05,
-    )
+    # Best config from the nightly search (app/ml/tuning.py), as the v2 ForecastService uses
+    model = Prophet(**resolve_config("^NSEI"), **interval_prophet_kwargs())
     model.fit(train)
 
     future = pd.DataFrame({"ds": prophet_df["ds"].iloc[-test_size:].values})
@@ -58,9 +57,8 @@ def _train_and_forecast(
     mae = float(np.mean(np.abs(y_true - y_pred)))
     rmse = float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
 
-    future_7 = model.make_future_dataframe(periods=7)
-    forecast = model.predict(future_7)
-    out = forecast.tail(7)
+    future_7 = model.make_future_dataframe(periods=7, include_history=False)
+    out = fill_intervals(model.predict(future_7), sigma=residual_sigma(model))
     return out, mae, rmse, model
 
 
@@ -78,10 +76,10 @@ def _fallback_forecast(prophet_df: pd.DataFrame) -> pd.DataFrame:
     })
 
 
-def get_7day_forecast(db: Session) -> Dict:
+def get_7day_forecast(db: Session, columnar: bool = False) -> Dict:
     """
     Get 7-day forecast.
-    Returns: forecast list, current_value, mae, rmse.
+    Returns: forecast points (empty when columnar), columns, current_value, mae, rmse.
     """
     from services.market_service import fetch_and_store_market_data
     hist = get_historical_dataframe(db, "^NSEI", days=730)
@@ -94,28 +92,18 @@ def get_7day_forecast(db: Session) -> Dict:
     if forecast_df is None or forecast_df.empty:
         return {
             "forecast": [],
+            "columns": {"dates": [], "predicted": [], "upper": [], "lower": []},
             "current_value": current,
             "mae": None,
             "rmse": None,
             "model": "Prophet" if HAS_PROPHET else "Fallback",
         }
 
-    forecast_list = []
-    for _, row in forecast_df.iterrows():
-        d = row["ds"]
-        if hasattr(d, "strftime"):
-            dstr = d.strftime("%Y-%m-%d")
-        else:
-            dstr = pd.Timestamp(d).strftime("%Y-%m-%d")
-        forecast_list.append({
-            "date": dstr,
-            "predicted": round(float(row["yhat"]), 2),
-            "lower": round(float(row.get("yhat_lower", row["yhat"] * 0.98)), 2),
-            "upper": round(float(row.get("yhat_upper", row["yhat"] * 1.02)), 2),
-        })
+    columns = forecast_columns(forecast_df, include_confidence=False)
 
     return {
-        "forecast": forecast_list,
+        "forecast": [] if columnar else columns_to_points(columns),
+        "columns": columns,
         "current_value": round(current, 2),
         "mae": round(mae, 4),
         "rmse": round(rmse, 4),
@@ -34,7 +34,9 @@ def fetch_and_store_market_data(db: Session) -> Dict:
             d = idx.date() if hasattr(idx, "date") else pd.Timestamp(idx).date()
             n_row = nifty_df.loc[idx]
             s_row = sensex_df.loc[idx]
-            vol = float(getattr(n_row, "Volume", 0) or 0) + float(getattr(s_row, "Volume", 0) or 0)
+            n_vol = float(getattr(n_row, "Volume", 0) or 0)
+            s_vol = float(getattr(s_row, "Volume", 0) or 0)
+            vol = n_vol + s_vol
             existing = db.query(MarketData).filter(MarketData.date == d).first()
             if existing:
                 existing.nifty_close = float(n_row["Close"])
@@ -46,6 +48,8 @@ def fetch_and_store_market_data(db: Session) -> Dict:
                 existing.sensex_high = float(s_row["High"])
                 existing.sensex_low = float(s_row["Low"])
                 existing.volume = vol
+                existing.nifty_volume = n_vol
+                existing.sensex_volume = s_vol
             else:
                 row = MarketData(
                     date=d,
@@ -58,10 +62,14 @@ def fetch_and_store_market_data(db: Session) -> Dict:
                     sensex_high=float(s_row["High"]),
                     sensex_low=float(s_row["Low"]),
                     volume=vol,
+                    nifty_volume=n_vol,
+                    sensex_volume=s_vol,
                 )
                 db.add(row)
             result["stored"] = result.get("stored", 0) + 1
         db.commit()
+        store_volatility(db)
+        store_liquidity(db)
 
         # Latest
         latest = db.query(MarketData).order_by(MarketData.date.desc()).first()
@@ -83,6 +91,41 @@ def fetch_and_store_market_data(db: Session) -> Dict:
     return result
 
 
+def store_volatility(db: Session) -> Dict[str, Optional[float]]:
+    """
+    Bring volatility_daily up to date with the stored NIFTY/SENSEX closes; only
+    closes not yet folded in (or changed) update the incremental series.
+    """
+    from app.database import crud
+    rows = db.query(MarketData.date, MarketData.nifty_close, MarketData.sensex_close).order_by(MarketData.date).all()
+    latest = {}
+    for ticker, col in ((NIFTY_TICKER, 1), (SENSEX_TICKER, 2)):
+        try:
+            latest[ticker] = crud.update_volatility(db, ticker, [(r[0], r[col]) for r in rows])
+        except Exception as e:
+            db.rollback()
+            logger.warning("volatility update failed for %s: %s", ticker, e)
+    return latest
+
+
+def store_liquidity(db: Session) -> Dict[str, Optional[float]]:
+    """
+    Bring liquidity_daily up to date with the stored per-index volumes; only sessions
+    not yet folded in (or changed) update the rolling aggregates.
+    """
+    from app.database import crud
+    rows = db.query(MarketData.date, MarketData.nifty_close, MarketData.nifty_volume,
+                    MarketData.sensex_close, MarketData.sensex_volume).order_by(MarketData.date).all()
+    latest = {}
+    for ticker, close_col, vol_col in ((NIFTY_TICKER, 1, 2), (SENSEX_TICKER, 3, 4)):
+        try:
+            latest[ticker] = crud.update_liquidity(db, ticker, [(r[0], r[close_col], r[vol_col]) for r in rows])
+        except Exception as e:
+            db.rollback()
+            logger.warning("liquidity update failed for %s: %s", ticker, e)
+    return latest
+
+
 def get_latest_market(db: Session) -> Optional[Dict]:
     """Get latest market record from DB."""
     row = db.query(MarketData).order_by(MarketData.date.desc()).first()
@@ -0,0 +1,182 @@
+"""
+Full-text search over stored headlines (news_data).
+
+SQLite: FTS5 external-content table news_fts (headline, source; porter
+stemming) kept in sync by AFTER INSERT/UPDATE/DELETE triggers, ranked by bm25.
+PostgreSQL: generated tsvector column news_data.search_vector with a GIN
+index, ranked by ts_rank_cd. setup_news_fts() is idempotent and runs from
+init_db(); an existing archive is indexed on first setup.
+
+Results page by keyset (rank, id) or (date, id) – no OFFSET – with an opaque cursor.
+"""
+import logging
+import re
+from datetime import date
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.utils.cursor import decode_cursor, decode_date_id_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SORTS = ("relevance", "date")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+        headline, source, content='news_data', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news_data BEGIN
+        INSERT INTO news_fts(rowid, headline, source) VALUES (new.id, new.headline, new.source);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news_data BEGIN
+        INSERT INTO news_fts(news_fts, rowid, headline, source) VALUES ('delete', old.id, old.headline, old.source);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE OF headline, source ON news_data BEGIN
+        INSERT INTO news_fts(news_fts, rowid, headline, source) VALUES ('delete', old.id, old.headline, old.source);
+        INSERT INTO news_fts(rowid, headline, source) VALUES (new.id, new.headline, new.source);
+    END""",
+]
+
+_POSTGRES_DDL = [
+    """ALTER TABLE news_data ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(headline, '') || ' ' || coalesce(source, ''))) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_news_data_search ON news_data USING GIN (search_vector)",
+]
+
+_fts_enabled = {}  # dialect name -> bool
+
+
+def setup_news_fts(engine: Engine) -> bool:
+    """Create the FTS index (and sync triggers) if missing. Returns False if unsupported."""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                existed = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='news_fts'"
+                )).first() is not None
+                for ddl in _SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if not existed:
+                    conn.execute(text("INSERT INTO news_fts(news_fts) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for ddl in _POSTGRES_DDL:
+                    conn.execute(text(ddl))
+            else:
+                _fts_enabled[dialect] = False
+                return False
+        _fts_enabled[dialect] = True
+    except Exception as e:
+        logger.warning("Full-text index unavailable (%s): %s", dialect, e)
+        _fts_enabled[dialect] = False
+    return _fts_enabled[dialect]
+
+
+def fts_query(q: str) -> str:
+    """User text -> FTS5 MATCH expression: every word required, quoted (no query syntax injection)."""
+    return " ".join(f'"{t}"' for t in _TOKEN_RE.findall(q or ""))
+
+
+def _sentiment_clause(sentiment: Optional[str]) -> str:
+    if sentiment == "positive":
+        return " AND n.sentiment_score > 0.05"
+    if sentiment == "negative":
+        return " AND n.sentiment_score < -0.05"
+    if sentiment == "neutral":
+        return " AND n.sentiment_score BETWEEN -0.05 AND 0.05"
+    return ""
+
+
+def search_news(
+    db: Session,
+    q: str,
+    sentiment: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    source: Optional[str] = None,
+    sort: str = "relevance",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Ranked headline search. Returns (hits, next_cursor); hits are dicts with id, headline,
+    source, date, sentiment_score, link and rank (lower = better on SQLite bm25,
+    higher = better on Postgres ts_rank_cd, so clients should only compare within a backend).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _fts_enabled:
+        setup_news_fts(db.get_bind())
+    params = {"limit": limit + 1}
+    where = _sentiment_clause(sentiment)
+    if date_from:
+        where += " AND n.date >= :date_from"
+        params["date_from"] = date_from
+    if date_to:
+        where += " AND n.date <= :date_to"
+        params["date_to"] = date_to
+    if source:
+        where += " AND lower(n.source) = lower(:source)"
+        params["source"] = source
+
+    cols = "n.id, n.headline, n.source, n.date, n.sentiment_score, n.link"
+    if _fts_enabled.get(dialect) and dialect == "sqlite":
+        params["match"] = fts_query(q)
+        if not params["match"]:
+            return [], None
+        rank = "bm25(news_fts)"
+        base = f"SELECT {cols}, {rank} AS rank FROM news_fts JOIN news_data n ON n.id = news_fts.rowid " \
+               f"WHERE news_fts MATCH :match{where}"
+        rank_asc = True
+    elif _fts_enabled.get(dialect) and dialect == "postgresql":
+        params["q"] = q
+        rank = "ts_rank_cd(n.search_vector, plainto_tsquery('english', :q))"
+        base = f"SELECT {cols}, {rank} AS rank FROM news_data n " \
+               f"WHERE n.search_vector @@ plainto_tsquery('english', :q){where}"
+        rank_asc = False
+    else:  # no FTS: every word as a LIKE filter, newest first
+        terms = _TOKEN_RE.findall(q or "")
+        if not terms:
+            return [], None
+        for i, t in enumerate(terms):
+            where += f" AND lower(n.headline) LIKE :t{i}"
+            params[f"t{i}"] = f"%{t.lower()}%"
+        rank = "0.0"
+        base = f"SELECT {cols}, 0.0 AS rank FROM news_data n WHERE 1=1{where}"
+        rank_asc, sort = True, "date"
+
+    if sort == "date":
+        if cursor:
+            c_date, c_id = decode_date_id_cursor(cursor)
+            base += " AND (n.date < :c_date OR (n.date = :c_date AND n.id < :c_id))"
+            params.update(c_date=c_date, c_id=c_id)
+        order = "n.date DESC, n.id DESC"
+    else:
+        op, direction = (">", "ASC") if rank_asc else ("<", "DESC")
+        if cursor:
+            c_rank, c_id = decode_cursor(cursor)
+            try:
+                params.update(c_rank=float(c_rank), c_id=int(c_id))
+            except (TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+            base += f" AND ({rank} {op} :c_rank OR ({rank} = :c_rank AND n.id > :c_id))"
+        order = f"rank {direction}, n.id ASC"
+
+    rows = [_hit(r) for r in db.execute(text(f"{base} ORDER BY {order} LIMIT :limit"), params)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last["date"], last["id"]] if sort == "date" else [last["rank"], last["id"]])
+    return rows, next_cursor
+
+
+def _hit(row) -> dict:
+    hit = dict(row._mapping)
+    if isinstance(hit["date"], str):  # raw SQLite rows carry ISO strings
+        hit["date"] = date.fromisoformat(hit["date"][:10])
+    hit["rank"] = float(hit["rank"]) if hit["rank"] is not None else None
+    return hit
@@ -3,16 +3,23 @@ News service - fetch India economy, Nifty, RBI headlines.
 Uses Google News RSS; optional NewsAPI/GNews via env.
 """
 import logging
-from datetime import date, datetime
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
 from urllib.parse import quote_plus
 
 import feedparser
 import requests
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.sentiment.backends import get_backend
+from app.sentiment.dedup import NearDuplicateIndex
+from app.sentiment.timestamps import entry_timestamp, to_epoch
+from app.utils.cursor import decode_date_id_cursor, encode_cursor
+from app.utils.pipeline import Pipeline, Sink, Stage
 from models import NewsData
-from services.sentiment_service import analyze_headline
+from services.sentiment_service import analyze_headlines, update_daily_aggregate
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +27,13 @@ QUERIES = ["India economy", "Nifty", "RBI"]
 MAX_PER_QUERY = 10
 
 
+def _ts_date(ts: float) -> date:
+    """UTC calendar date of an epoch timestamp (today when unknown)."""
+    if ts != ts:  # NaN
+        return date.today()
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date()
+
+
 def _fetch_google_news(query: str, max_results: int = 10) -> List[dict]:
     try:
         encoded = quote_plus(query)
@@ -27,17 +41,12 @@ def _fetch_google_news(query: str, max_results: int = 10) -> List[dict]:
         feed = feedparser.parse(url)
         articles = []
         for entry in feed.entries[:max_results]:
-            pub = entry.get("published", "")
-            try:
-                from dateutil import parser as date_parser
-                dt = date_parser.parse(pub)
-                d = dt.date()
-            except Exception:
-                d = date.today()
+            ts = entry_timestamp(entry)
             articles.append({
                 "headline": entry.get("title", ""),
                 "source": entry.get("source", {}).get("title", "Google News"),
-                "date": d,
+                "date": _ts_date(ts),
+                "published_ts": ts,
                 "link": entry.get("link", ""),
             })
         return articles
@@ -64,17 +73,12 @@ def _fetch_gnews(query: str, max_results: int = 10) -> List[dict]:
         data = r.json()
         articles = []
         for a in data.get("articles", []):
-            pub = a.get("publishedAt", "")
-            try:
-                from dateutil import parser as date_parser
-                dt = date_parser.parse(pub)
-                d = dt.date()
-            except Exception:
-                d = date.today()
+            ts = to_epoch(a.get("publishedAt"))
             articles.append({
                 "headline": a.get("title", ""),
                 "source": a.get("source", {}).get("name", "GNews"),
-                "date": d,
+                "date": _ts_date(ts),
+                "published_ts": ts,
                 "link": a.get("url", ""),
             })
         return articles
@@ -83,39 +87,84 @@ def _fetch_gnews(query: str, max_results: int = 10) -> List[dict]:
         return []
 
 
+def _fetch_query(query: str) -> List[dict]:
+    return _fetch_gnews(query, MAX_PER_QUERY) or _fetch_google_news(query, MAX_PER_QUERY)
+
+
+def _normalize(a: dict) -> List[dict]:
+    headline = (a.get("headline") or "").strip()
+    if not headline:
+        return []
+    return [dict(a, headline=headline, date=a.get("date") or date.today())]
+
+
+def _dedup_stage():
+    """Keep the first article of each near-duplicate story per date (MinHash/LSH clusters)."""
+    threshold = settings.SENTIMENT_DEDUP_THRESHOLD if settings.SENTIMENT_DEDUP_ENABLED else 1.0
+    indexes = {}
+
+    def dedup(a: dict) -> List[dict]:
+        index = indexes.get(a["date"])
+        if index is None:
+            index = indexes[a["date"]] = NearDuplicateIndex(threshold, max_clusters=settings.SENTIMENT_DEDUP_MAX_CLUSTERS)
+        _cid, is_new = index.add(a["headline"], a.get("source"))
+        return [a] if is_new else []
+    return dedup
+
+
+def _clean(a: dict) -> List[dict]:
+    a["text"] = " ".join(a["headline"].split())
+    return [a]
+
+
+def _score(batch: List[dict]) -> List[dict]:
+    for a, (score, _label) in zip(batch, analyze_headlines([a["text"] for a in batch])):
+        a["sentiment_score"] = score
+    return batch
+
+
 def fetch_and_store_news(db: Session) -> int:
-    """Fetch news, run sentiment, store in NewsData. Return count stored."""
-    seen = set()
-    stored = 0
-    for q in QUERIES:
-        articles = _fetch_gnews(q, MAX_PER_QUERY)
-        if not articles:
-            articles = _fetch_google_news(q, MAX_PER_QUERY)
-        for a in articles:
-            key = (a["headline"][:100], a["date"].isoformat())
-            if key in seen:
-                continue
-            seen.add(key)
-            score, label = analyze_headline(a["headline"])
-            row = NewsData(
+    """
+    Fetch news, run sentiment, store in NewsData. Return count stored.
+    Staged pipeline: fetch -> normalize -> dedup -> clean -> score -> batch write.
+    """
+    stored = [0]
+    version = get_backend().version
+
+    def write(batch: List[dict]) -> None:
+        update_daily_aggregate(db, [(a["date"], a["sentiment_score"]) for a in batch])
+        db.add_all([
+            NewsData(
                 headline=a["headline"],
                 source=a["source"],
                 date=a["date"],
-                sentiment_score=score,
+                sentiment_score=a["sentiment_score"],
                 link=a.get("link"),
+                analyzer_version=version,
             )
-            db.add(row)
-            stored += 1
-    db.commit()
-    return stored
+            for a in batch
+        ])
+        db.commit()
+        stored[0] += len(batch)
 
+    pipe = Pipeline(
+        [
+            Stage("fetch", _fetch_query, workers=settings.NEWS_PIPELINE_FETCH_WORKERS),
+            Stage("normalize", _normalize),
+            Stage("dedup", _dedup_stage()),
+            Stage("clean", _clean),
+            Stage("score", _score, workers=settings.NEWS_PIPELINE_SCORE_WORKERS,
+                  batch_size=settings.NEWS_PIPELINE_BATCH_SIZE),
+        ],
+        sink=Sink("write", write, batch_size=settings.NEWS_PIPELINE_BATCH_SIZE),
+        queue_size=settings.NEWS_PIPELINE_QUEUE_SIZE,
+    )
+    stats = pipe.run(QUERIES)
+    logger.info("News ingest: stored %d in %.2fs %s", stored[0], stats["elapsed_sec"], stats["stages"])
+    return stored[0]
 
-def get_news(
-    db: Session,
-    filter_sentiment: Optional[str] = None,
-    limit: int = 50,
-) -> List[NewsData]:
-    """Get news, optional filter: positive|negative|all."""
+
+def _news_query(db: Session, filter_sentiment: Optional[str] = None):
     q = db.query(NewsData).order_by(NewsData.date.desc(), NewsData.id.desc())
     if filter_sentiment == "positive":
         q = q.filter(NewsData.sentiment_score > 0.05)
@@ -126,4 +175,35 @@ def get_news(
             NewsData.sentiment_score >= -0.05,
             NewsData.sentiment_score <= 0.05,
         )
-    return q.limit(limit).all()
+    return q
+
+
+def get_news(
+    db: Session,
+    filter_sentiment: Optional[str] = None,
+    limit: int = 50,
+) -> List[NewsData]:
+    """Get news, optional filter: positive|negative|all."""
+    return _news_query(db, filter_sentiment).limit(limit).all()
+
+
+def get_news_page(
+    db: Session,
+    filter_sentiment: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[NewsData], Optional[str]]:
+    """
+    One page of get_news, newest first, keyset-paginated on (date, id) via
+    ix_news_data_date_id: every page is an index seek, however deep. Returns
+    (rows, next_cursor); next_cursor is None on the last page. Raises ValueError
+    on a malformed cursor.
+    """
+    q = _news_query(db, filter_sentiment)
+    if cursor:
+        q = q.filter(tuple_(NewsData.date, NewsData.id) < decode_date_id_cursor(cursor))
+    rows = q.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1].date, rows[-1].id])
@@ -0,0 +1,78 @@
+"""
+Rescore stored legacy headlines (news_data) after the sentiment analyzer changes.
+
+Uses the chunked, checkpointed loop from app/sentiment/rescore.py: rows whose
+analyzer_version differs from the current backend are rescored in chunks and
+updated by primary key, one short transaction per chunk. Afterwards the
+news_daily_aggregate rows and stored stability scores of the touched dates are
+rebuilt.
+
+Run from backend root:
+    python -m services.rescore_service --chunk-size 5000
+"""
+import argparse
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.sentiment.backends import get_backend
+from app.sentiment.rescore import DEFAULT_CHUNK_SIZE, rescore_table
+from models import NewsData, StabilityScore
+from services.sentiment_service import analyze_headlines, rebuild_daily_aggregate
+
+logger = logging.getLogger(__name__)
+
+
+def _score_news(rows: Sequence) -> Tuple[List[Dict], Iterable[date]]:
+    scored = analyze_headlines([" ".join((r.headline or "").split()) for r in rows])
+    updates = [{"id": r.id, "sentiment_score": score} for r, (score, _label) in zip(rows, scored)]
+    return updates, {r.date for r in rows}
+
+
+def _rebuild_aggregates(db: Session, dates: List[date], deltas: Optional[Dict] = None) -> None:
+    # news_daily_aggregate is a plain sum over news_data, so it is recomputed; deltas are unused
+    from services.stability_service import compute_and_store
+    for d in dates:
+        rebuild_daily_aggregate(db, d)
+        db.commit()
+    stored = {d for (d,) in db.query(StabilityScore.date).filter(StabilityScore.date.in_(dates))}
+    for d in sorted(stored):
+        compute_and_store(db, d)
+
+
+def rescore_news(
+    db: Session,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> Dict:
+    return rescore_table(
+        db, NewsData,
+        [NewsData.id, NewsData.headline, NewsData.date, NewsData.analyzer_version],
+        job="news_data",
+        version=get_backend().version,
+        score_rows=_score_news,
+        finalize=_rebuild_aggregates,
+        chunk_size=chunk_size,
+        restart=restart,
+        max_chunks=max_chunks,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore stored news_data headlines with the current analyzer.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true")
+    parser.add_argument("--max-chunks", type=int, default=None)
+    args = parser.parse_args()
+
+    from database import SessionLocal, init_db
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    session = SessionLocal()
+    try:
+        logger.info("Rescore finished: %s", rescore_news(session, args.chunk_size, args.restart, args.max_chunks))
+    finally:
+        session.close()
@@ -1,31 +1,23 @@
 """
-Sentiment service - VADER.
+Sentiment service - VADER (or the model set by SENTIMENT_ANALYZER, see app/sentiment/backends.py).
 > 0.05 Positive, < -0.05 Negative, else Neutral.
 Returns: average daily score, % positive, % negative.
 """
 import logging
-from datetime import date
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Sequence, Tuple
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    ANALYZER = SentimentIntensityAnalyzer()
-except ImportError:
-    ANALYZER = None
-
-from models import NewsData
+from app.database.base import dialect_insert
+from app.sentiment.backends import get_backend
+from models import NewsDailyAggregate, NewsData
 
 logger = logging.getLogger(__name__)
 
 
-def analyze_headline(text: str) -> Tuple[float, str]:
-    """Return (compound_score, label)."""
-    if not text or not ANALYZER:
-        return 0.0, "neutral"
-    scores = ANALYZER.polarity_scores(text)
-    c = scores["compound"]
+def _label(c: float) -> Tuple[float, str]:
     if c > 0.05:
         return round(c, 4), "positive"
     if c < -0.05:
@@ -33,14 +25,105 @@ def analyze_headline(text: str) -> Tuple[float, str]:
     return round(c, 4), "neutral"
 
 
+def analyze_headline(text: str) -> Tuple[float, str]:
+    """Return (compound_score, label)."""
+    if not text:
+        return 0.0, "neutral"
+    return analyze_headlines([text])[0]
+
+
+def analyze_headlines(texts: Sequence[str]) -> List[Tuple[float, str]]:
+    """analyze_headline for many texts, in order, in one backend call (VADER: large batches use a process pool)."""
+    return [(0.0, "neutral") if s is None else _label(s[0])
+            for s in get_backend().score(texts)]
+
+
+def _bucket(score: float) -> str:
+    if score > 0.05:
+        return "positive_count"
+    if score < -0.05:
+        return "negative_count"
+    return "neutral_count"
+
+
+def update_daily_aggregate(db: Session, items: Iterable[Tuple[date, float]], weight: float = 1.0) -> None:
+    """
+    Fold (date, sentiment_score) pairs into NewsDailyAggregate: one atomic
+    increment per date touched. Call before adding the NewsData rows, in the same
+    transaction, so a first-of-day rebuild does not count them twice.
+    """
+    deltas: Dict[date, Dict[str, float]] = {}
+    for d, score in items:
+        if score is None:
+            continue
+        delta = deltas.setdefault(d, {"weighted_sum": 0.0, "weight_total": 0.0, "positive_count": 0,
+                                      "neutral_count": 0, "negative_count": 0})
+        delta["weighted_sum"] += score * weight
+        delta["weight_total"] += weight
+        delta[_bucket(score)] += 1
+    for d, delta in deltas.items():
+        updated = (
+            db.query(NewsDailyAggregate)
+            .filter(NewsDailyAggregate.date == d)
+            .update({getattr(NewsDailyAggregate, k): getattr(NewsDailyAggregate, k) + v
+                     for k, v in delta.items()}, synchronize_session=False)
+        )
+        if not updated:
+            # First write for the day: fold in any rows stored before this table existed. A
+            # concurrent first writer may insert the row meanwhile; then only add this delta.
+            values = _aggregate_from_news(db, d)
+            for k, v in delta.items():
+                values[k] += v
+            stmt = dialect_insert(db.get_bind(), NewsDailyAggregate.__table__).values(date=d, **values)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["date"],
+                set_={**{k: getattr(NewsDailyAggregate, k) + v for k, v in delta.items()},
+                      "updated_at": datetime.utcnow()},
+            ))
+
+
+def _aggregate_from_news(db: Session, d: date) -> Dict[str, float]:
+    """One day's aggregate values computed from NewsData in a single SQL aggregate query."""
+    scored = NewsData.sentiment_score
+    total, n, pos, neg = db.query(
+        func.coalesce(func.sum(scored), 0.0),
+        func.count(scored),
+        func.coalesce(func.sum(case((scored > 0.05, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((scored < -0.05, 1), else_=0)), 0),
+    ).filter(NewsData.date == d).one()
+    return {
+        "weighted_sum": float(total),
+        "weight_total": float(n),
+        "positive_count": int(pos),
+        "neutral_count": int(n) - int(pos) - int(neg),
+        "negative_count": int(neg),
+    }
+
+
+def rebuild_daily_aggregate(db: Session, d: date) -> NewsDailyAggregate:
+    """Recompute one day's aggregate from NewsData (write side: rescoring)."""
+    agg = db.get(NewsDailyAggregate, d)
+    if agg is None:
+        agg = NewsDailyAggregate(date=d)
+        db.add(agg)
+    for k, v in _aggregate_from_news(db, d).items():
+        setattr(agg, k, v)
+    return agg
+
+
 def get_sentiment_today(db: Session, target_date: date = None) -> Dict:
     """
-    Aggregate sentiment for target date from NewsData.
+    Aggregate sentiment for target date: a single-row read of NewsDailyAggregate
+    (computed from NewsData, without writing, if the day predates the aggregate table).
     Returns: average_score, pct_positive, pct_negative, pct_neutral, total_articles.
     """
     d = target_date or date.today()
-    rows = db.query(NewsData).filter(NewsData.date == d).all()
-    if not rows:
+    agg = db.get(NewsDailyAggregate, d)
+    agg = _aggregate_from_news(db, d) if agg is None else {
+        k: getattr(agg, k) for k in ("weighted_sum", "weight_total", "positive_count", "neutral_count", "negative_count")
+    }
+    n = agg["positive_count"] + agg["neutral_count"] + agg["negative_count"]
+    if not n:
         return {
             "average_score": 0.0,
             "pct_positive": 0.0,
@@ -49,19 +132,11 @@ def get_sentiment_today(db: Session, target_date: date = None) -> Dict:
             "total_articles": 0,
             "date": d.isoformat(),
         }
-    scores = [r.sentiment_score for r in rows if r.sentiment_score is not None]
-    if not scores:
-        scores = [0.0]
-    avg = sum(scores) / len(scores)
-    pos = sum(1 for s in scores if s > 0.05)
-    neg = sum(1 for s in scores if s < -0.05)
-    neu = len(scores) - pos - neg
-    n = len(scores)
     return {
-        "average_score": round(avg, 4),
-        "pct_positive": round(100.0 * pos / n, 2),
-        "pct_negative": round(100.0 * neg / n, 2),
-        "pct_neutral": round(100.0 * neu / n, 2),
+        "average_score": round(agg["weighted_sum"] / (agg["weight_total"] or 1), 4),
+        "pct_positive": round(100.0 * agg["positive_count"] / n, 2),
+        "pct_negative": round(100.0 * agg["negative_count"] / n, 2),
+        "pct_neutral": round(100.0 * agg["neutral_count"] / n, 2),
         "total_articles": n,
         "date": d.isoformat(),
     }
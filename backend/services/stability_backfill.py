@@ -0,0 +1,245 @@
+"""
+Vectorized stability backfill.
+
+compute_and_store() issues several queries per date (8-row momentum window,
+the day's sentiment, the stored volatility). The backfill loads the NIFTY
+close series and the daily sentiment averages once, computes every component
+for every date with numpy (searchsorted for the as-of market row; volatility
+from one pass of the incremental engine over the closes, the values
+volatility_daily holds), and writes all rows in one transaction:
+  - stability_score (legacy formula, one row per date, replaced)
+  - stability_history (v2 formula via StabilityScoreService weights) when a v2
+    session is given – only for dates without a stored refresh row unless
+    overwrite=True
+
+Scores equal compute_and_store() date for date.
+
+Run from backend root:
+    python -m services.stability_backfill --start 2015-01-01 --history
+"""
+import argparse
+import logging
+import time
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from models import MarketData, NewsDailyAggregate, NewsData, StabilityScore
+from app.utils.liquidity import liquidity_series
+from app.utils.volatility import volatility_series
+from app.config import settings
+from app.ml.stability_profiles import CATEGORIES, get_profile
+from services.stability_service import LEGACY_FACTORS, volatility_score_0_100
+
+logger = logging.getLogger(__name__)
+
+MOMENTUM_WINDOW = 8     # rows: latest close vs the close 7 rows earlier
+
+
+def _load_closes(db: Session, end: date) -> pd.Series:
+    rows = db.query(MarketData.date, MarketData.nifty_close).filter(
+        MarketData.date <= end,
+        MarketData.nifty_close.isnot(None),
+    ).order_by(MarketData.date).all()
+    return pd.Series([r[1] for r in rows], index=pd.to_datetime([r[0] for r in rows]), dtype=float)
+
+
+def _load_volumes(db: Session, end: date) -> pd.Series:
+    """NIFTY volume per stored close (same rows as _load_closes; NaN where not stored)."""
+    rows = db.query(MarketData.date, MarketData.nifty_volume).filter(
+        MarketData.date <= end,
+        MarketData.nifty_close.isnot(None),
+    ).order_by(MarketData.date).all()
+    return pd.Series([r[1] for r in rows], index=pd.to_datetime([r[0] for r in rows]), dtype=float)
+
+
+def _load_daily_sentiment(db: Session, start: date, end: date) -> pd.Series:
+    """Average compound per date: news_daily_aggregate where present, else grouped news_data."""
+    avg = {}
+    for d, total, n in db.query(NewsData.date, func.sum(NewsData.sentiment_score), func.count(NewsData.sentiment_score)) \
+            .filter(NewsData.date >= start, NewsData.date <= end).group_by(NewsData.date):
+        if n:
+            avg[d] = float(total) / n
+    for a in db.query(NewsDailyAggregate).filter(NewsDailyAggregate.date >= start, NewsDailyAggregate.date <= end):
+        n = a.positive_count + a.neutral_count + a.negative_count
+        if n:
+            avg[a.date] = a.weighted_sum / (a.weight_total or 1)
+        else:
+            avg.pop(a.date, None)
+    return pd.Series(avg, dtype=float)
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Python's round() per element: np.round rounds ties differently, and scores are stored at 2 dp."""
+    return np.array([round(x, ndigits) for x in values.tolist()], dtype=float)
+
+
+def compute_components(closes: pd.Series, sentiment: pd.Series, dates: pd.DatetimeIndex,
+                       volumes: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    market/sentiment/volatility/inflation/final/category per date, as compute_and_store,
+    plus the v2 liquidity score as of each date (neutral 50 without volumes).
+    """
+    c = closes.to_numpy()
+    # Row count with market date <= d, i.e. compute_and_store's window end
+    count = np.searchsorted(closes.index.values, dates.values, side="right")
+    idx = count - 1
+
+    latest = c[np.clip(idx, 0, None)] if len(c) else np.zeros(len(dates))
+    week_ago = c[np.clip(idx - (MOMENTUM_WINDOW - 1), 0, None)] if len(c) else np.zeros(len(dates))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = (latest - week_ago) / week_ago * 100
+    market = _round(np.clip(50 + pct * 10, 0, 100), 2)
+    market = np.where((count >= 2) & (week_ago > 0), market, 50.0)
+
+    avg = sentiment.reindex(dates.date).to_numpy(dtype=float)
+    avg = _round(np.nan_to_num(avg, nan=0.0), 4)
+    sent = _round(np.clip((avg + 1) / 2 * 100, 0, 100), 2)
+
+    vol_by_row = np.array([volatility_score_0_100(v) for v in volatility_series(c)])
+    vol = np.where(count >= 1, vol_by_row[np.clip(idx, 0, None)], 50.0) if len(c) else np.full(len(dates), 50.0)
+
+    liq = np.full(len(dates), 50.0)
+    if volumes is not None and len(c):
+        v = volumes.reindex(closes.index).to_numpy(dtype=float)
+        by_row = np.array([np.nan if x is None else x for x in liquidity_series(zip(c.tolist(), v.tolist()))])
+        liq = np.where(count >= 1, by_row[np.clip(idx, 0, None)], np.nan)
+        liq = np.where(np.isnan(liq), 50.0, liq)
+
+    infl = np.full(len(dates), 50.0)
+    profile = get_profile(settings.LEGACY_STABILITY_PROFILE).for_factors(LEGACY_FACTORS)
+    final = profile.score_batch(np.column_stack([market, sent, infl, vol]), LEGACY_FACTORS)
+    category = np.array(CATEGORIES)[profile.level(final)]
+    return pd.DataFrame({
+        "market_score": market,
+        "sentiment_score": sent,
+        "volatility_score": vol,
+        "inflation_score": infl,
+        "liquidity_score": liq,
+        "final_score": final,
+        "category": category,
+    }, index=dates)
+
+
+def _history_rows(frame: pd.DataFrame) -> list:
+    """stability_history mappings with the v2 multi-factor formula (settings.STABILITY_PROFILE)."""
+    from app.ml.stability import FACTORS, RISK_LEVELS, StabilityScoreService
+    from app.utils.macro import get_macro_store
+    from app.utils.stability_helpers import inflation_score_0_100
+
+    svc = StabilityScoreService()
+    # CPI inflation known on each date (point-in-time), 4.5% before the first observation
+    cpi = get_macro_store().values("inflation", frame.index.date)
+    inputs = {
+        "market_momentum": frame["market_score"].to_numpy(),
+        "sentiment": frame["sentiment_score"].to_numpy(),
+        "volatility_inverse": frame["volatility_score"].to_numpy(),
+        "inflation": np.array([inflation_score_0_100(None if np.isnan(r) else r) for r in cpi.tolist()]),
+        "liquidity": frame["liquidity_score"].to_numpy(),
+    }
+    res = svc.calculate_batch(np.column_stack([inputs[f] for f in FACTORS]))
+    explanations = svc.explain_batch(res["components"], res["level"])
+    rows = []
+    for d, score, level, comps, explanation in zip(frame.index.date, res["stability_score"].tolist(),
+                                                   res["level"].tolist(), res["components"].tolist(), explanations):
+        rows.append({
+            "record_date": d,
+            "stability_score": score,
+            "category": CATEGORIES[level],
+            "risk_level": RISK_LEVELS[level],
+            "components": {f: round(c, 2) for f, c in zip(FACTORS, comps)},
+            "explanation": explanation,
+        })
+    return rows
+
+
+def backfill_stability(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    history_db: Optional[Session] = None,
+    overwrite: bool = False,
+) -> Dict:
+    """
+    Compute and bulk-write stability for every date in [start, end] that has market
+    or news data (start defaults to the first market date, end to today).
+    """
+    t0 = time.perf_counter()
+    end = end or date.today()
+    closes = _load_closes(db, end)
+    if start is None:
+        start = closes.index[0].date() if len(closes) else end
+    sentiment = _load_daily_sentiment(db, start, end)
+    dates = closes.index[closes.index >= pd.Timestamp(start)].union(pd.to_datetime(list(sentiment.index)))
+    t_load = time.perf_counter()
+
+    frame = compute_components(closes, sentiment, dates, _load_volumes(db, end))
+    t_compute = time.perf_counter()
+
+    date_list = list(frame.index.date)
+    db.execute(delete(StabilityScore).where(StabilityScore.date >= start, StabilityScore.date <= end))
+    if date_list:
+        db.execute(insert(StabilityScore), [
+            {"date": d, "market_score": float(r.market_score), "sentiment_score": float(r.sentiment_score),
+             "volatility_score": float(r.volatility_score), "final_score": float(r.final_score),
+             "category": str(r.category)}
+            for d, r in zip(date_list, frame.itertuples())
+        ])
+    db.commit()
+
+    history_written = 0
+    if history_db is not None and date_list:
+        from app.database.models import StabilityHistory
+        rows = _history_rows(frame)
+        if overwrite:
+            history_db.execute(delete(StabilityHistory).where(
+                StabilityHistory.record_date >= start, StabilityHistory.record_date <= end))
+        else:
+            have = {d for (d,) in history_db.query(StabilityHistory.record_date).filter(
+                StabilityHistory.record_date >= start, StabilityHistory.record_date <= end)}
+            rows = [r for r in rows if r["record_date"] not in have]
+        if rows:
+            history_db.execute(insert(StabilityHistory), rows)
+        history_db.commit()
+        history_written = len(rows)
+
+    stats = {
+        "dates": len(date_list),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "history_rows": history_written,
+        "load_sec": round(t_load - t0, 3),
+        "compute_sec": round(t_compute - t_load, 3),
+        "write_sec": round(time.perf_counter() - t_compute, 3),
+    }
+    logger.info("Stability backfill: %s", stats)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute stored stability scores for a date range.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    parser.add_argument("--history", action="store_true", help="Also write v2 stability_history")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing stability_history rows")
+    args = parser.parse_args()
+
+    from database import SessionLocal, init_db
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    session = SessionLocal()
+    history = None
+    if args.history:
+        from app.database import SessionLocal as HistorySession, init_db as init_history_db
+        init_history_db()
+        history = HistorySession()
+    try:
+        backfill_stability(session, args.start, args.end, history, args.overwrite)
+    finally:
+        session.close()
+        if history is not None:
+            history.close()
@@ -2,22 +2,27 @@
 Stability score service.
 Final = 0.4*Market + 0.3*Sentiment + 0.2*InflationProxy + 0.1*Volatility
 Categories: 0-40 Unstable, 40-70 Moderate, 70-100 Stable.
+Weights and thresholds are the "legacy" profile (app/ml/stability_profiles.py,
+settings.LEGACY_STABILITY_PROFILE); reads can re-score with another profile.
 """
 import logging
 from datetime import date, datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import crud
+from app.ml.stability_profiles import CATEGORIES, get_profile
+from app.utils.volatility import volatility_series, warmup_closes
 from models import MarketData, NewsData, StabilityScore
+from services.market_service import NIFTY_TICKER
 from services.sentiment_service import get_sentiment_today
 
 logger = logging.getLogger(__name__)
 
-W_MARKET = 0.4
-W_SENTIMENT = 0.3
-W_INFLATION = 0.2
-W_VOLATILITY = 0.1
+# Column order of the legacy components when scored in bulk (services/stability_backfill.py)
+LEGACY_FACTORS = ("market_momentum", "sentiment", "inflation", "volatility_inverse")
 
 
 def _market_strength_0_100(db: Session, d: date) -> float:
@@ -48,25 +53,43 @@ def _sentiment_0_100(db: Session, d: date) -> float:
 
 
 def _volatility_0_100(db: Session, d: date) -> float:
-    """Rolling std of returns -> inverse (lower vol = higher score)."""
-    rows = db.query(MarketData).filter(
+    """Stored NIFTY volatility as of d (rolling/EWMA, see app/utils/volatility.py) -> inverse score."""
+    row = crud.get_volatility(db, NIFTY_TICKER, as_of=d)
+    std = row.volatility_pct if row else _volatility_from_closes(db, d)
+    return volatility_score_0_100(std)
+
+
+def _volatility_from_closes(db: Session, d: date) -> Optional[float]:
+    """Volatility from the latest closes up to d when volatility_daily has no row yet."""
+    rows = db.query(MarketData.nifty_close).filter(
         MarketData.date <= d,
         MarketData.nifty_close.isnot(None),
-    ).order_by(MarketData.date.asc()).limit(30).all()
-    if len(rows) < 5:
+    ).order_by(MarketData.date.desc()).limit(warmup_closes()).all()
+    series = volatility_series(r[0] for r in reversed(rows))
+    return series[-1] if series else None
+
+
+def volatility_score_0_100(std: Optional[float]) -> float:
+    """0% daily vol -> 100, 3% -> 0; 50 while the window is warming up."""
+    if std is None:
         return 50.0
-    closes = [r.nifty_close for r in rows]
-    returns = [(closes[i] - closes[i - 1]) / closes[i - 1] * 100 for i in range(1, len(closes))]
-    import math
-    std = math.sqrt(sum((r - sum(returns) / len(returns)) ** 2 for r in returns) / len(returns))
-    # 0% vol -> 100, 3% vol -> 0
     score = 100 - min(100, std * 33)
     return round(max(0, score), 2)
 
 
+NEUTRAL_INFLATION_SCORE = 50.0
+
+
 def _inflation_proxy_0_100(db: Session, d: date) -> float:
     """Market trend stability as inflation proxy - 7d trend consistency."""
-    return 50.0
+    return NEUTRAL_INFLATION_SCORE
+
+
+def score_components(m: float, s: float, v: float, infl: float, profile: Optional[str] = None) -> Tuple[float, str]:
+    """Final score and category under a weight profile (default settings.LEGACY_STABILITY_PROFILE)."""
+    p = get_profile(profile or settings.LEGACY_STABILITY_PROFILE).for_factors(LEGACY_FACTORS)
+    final, level = p.evaluate(dict(zip(LEGACY_FACTORS, (m, s, infl, v))))
+    return final, CATEGORIES[level]
 
 
 def compute_and_store(db: Session, target_date: date = None) -> Optional[Dict]:
@@ -77,11 +100,7 @@ def compute_and_store(db: Session, target_date: date = None) -> Optional[Dict]:
         s = _sentiment_0_100(db, d)
         v = _volatility_0_100(db, d)
         infl = _inflation_proxy_0_100(db, d)
-        final = round(
-            W_MARKET * m + W_SENTIMENT * s + W_INFLATION * infl + W_VOLATILITY * v,
-            2,
-        )
-        category = "Stable" if final >= 70 else ("Moderate" if final >= 40 else "Unstable")
+        final, category = score_components(m, s, v, infl)
 
         existing = db.query(StabilityScore).filter(StabilityScore.date == d).first()
         if existing:
@@ -127,4 +146,19 @@ def get_latest(db: Session) -> Optional[Dict]:
         "sentiment_score": row.sentiment_score,
         "volatility_score": row.volatility_score,
         "date": row.date.isoformat(),
+        "profile": settings.LEGACY_STABILITY_PROFILE,
     }
+
+
+def apply_profile(data: Dict, profile: str) -> Dict:
+    """
+    A get_latest() result re-scored from its stored components under another profile.
+    stability_scores keeps no inflation component, so the neutral one is used unless given.
+    """
+    inflation = data.get("inflation_score")
+    score, category = score_components(
+        data["market_score"], data["sentiment_score"], data["volatility_score"],
+        NEUTRAL_INFLATION_SCORE if inflation is None else inflation,
+        profile=profile,
+    )
+    return dict(data, score=score, category=category, profile=profile)